@@ -0,0 +1,437 @@
+"""
+Tabelas Compiladas de Campeões
+
+Compila as databases de campeões, sinergias e counters (dicts JSON com
+chaves em string) em IDs inteiros e matrizes NumPy densas. Sinergias de
+um draft e matchups 5x5 viram somas com fancy indexing em vez de montar
+chaves f"{a}_{b}" dentro de loops.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+DEFAULT_SYNERGY = 5.0
+DEFAULT_ADVANTAGE = 0.0
+DEFAULT_STRENGTH = 5.0
+DEFAULT_PHASE = 5.0
+
+PHASES = ("early", "mid", "late")
+
+PICK_IDS_CACHE_SIZE = 1024  # drafts distintos com IDs já resolvidos
+SMALL_DRAFT_SIZE = 10       # até aqui os scores usam lookups escalares
+
+# Pesos do score combinado dos lotes (os do overall_score sem flexibilidade)
+BATCH_SCORE_WEIGHTS = {"meta": 0.25, "synergy": 0.30, "counters": 0.25}
+
+
+@lru_cache(maxsize=4096)
+def normalize_champion_name(name: str) -> str:
+    """Nome canônico usado como chave nas databases ("Kai'Sa" -> "kaisa")"""
+    return name.lower().replace(" ", "").replace("'", "")
+
+
+@dataclass
+class EncodedDrafts:
+    """N drafts como matrizes (N, K) de IDs, completadas com padding"""
+    ids: "np.ndarray"        # ID do campeão
+    columns: "np.ndarray"    # coluna de posição nas tabelas
+    positions: "np.ndarray"  # código da posição para parear com o inimigo (-1 = padding)
+    mask: "np.ndarray"       # pick real (False = padding)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+@dataclass
+class DraftBatchScores:
+    """Scores de N drafts (arrays paralelos de tamanho N)"""
+    synergy: "np.ndarray"   # média das sinergias dos pares (0-10)
+    counters: "np.ndarray"  # vantagem de matchups por posição (0-10)
+    meta: "np.ndarray"      # força individual no patch (0-10)
+    early: "np.ndarray"
+    mid: "np.ndarray"
+    late: "np.ndarray"
+
+    @property
+    def scaling(self) -> "np.ndarray":
+        """Força de late game menos a de early game"""
+        return self.late - self.early
+
+    def composite(self, weights: Optional[Dict[str, float]] = None) -> "np.ndarray":
+        """Score combinado (0-10) com pesos por componente"""
+        weights = weights or BATCH_SCORE_WEIGHTS
+        total = sum(weights.values())
+        return sum(getattr(self, name) * weight for name, weight in weights.items()) / total
+
+    def row(self, index: int) -> Dict[str, float]:
+        return {
+            "synergy": round(float(self.synergy[index]), 2),
+            "counters": round(float(self.counters[index]), 2),
+            "meta": round(float(self.meta[index]), 2),
+            "scaling": round(float(self.scaling[index]), 2),
+            "early": round(float(self.early[index]), 2),
+            "mid": round(float(self.mid[index]), 2),
+            "late": round(float(self.late[index]), 2),
+        }
+
+    def __len__(self) -> int:
+        return len(self.synergy)
+
+
+class ChampionTables:
+    """
+    Databases de composição compiladas em arrays
+
+    - Cada campeão recebe um ID inteiro; o último ID é o campeão
+      desconhecido, com valores neutros em todas as tabelas
+    - synergy[i, j]: maior sinergia entre "i_j" e "j_i" (simétrica)
+    - advantage[i, j]: vantagem de i contra j ("i_vs_j", -1 a +1)
+    - position_multiplier[i, p]: multiplicador do campeão na posição p
+    """
+
+    def __init__(
+        self,
+        champions_db: Dict[str, Any],
+        synergies_db: Dict[str, Any],
+        counters_db: Dict[str, Any]
+    ):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy não está instalado")
+
+        synergy_pairs = self._split_keys(synergies_db, "_")
+        counter_pairs = self._split_keys(counters_db, "_vs_")
+
+        names = list(champions_db)
+        known = set(names)
+        for first, second, _ in synergy_pairs + counter_pairs:
+            for name in (first, second):
+                if name not in known:
+                    known.add(name)
+                    names.append(name)
+
+        self.names: List[str] = names
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(names)}
+        self.unknown_id = len(names)
+        size = len(names) + 1
+
+        positions = sorted({
+            position
+            for data in champions_db.values()
+            for position in data.get("positions", {})
+        })
+        self.position_ids: Dict[str, int] = {position: i for i, position in enumerate(positions)}
+        self.unknown_position = len(positions)
+
+        # Atributos individuais (linhas sem dados ficam neutras)
+        self.base_strength = np.full(size, DEFAULT_STRENGTH)
+        self.phase_strength = np.full((size, len(PHASES)), DEFAULT_PHASE)
+        self.position_multiplier = np.ones((size, len(positions) + 1))
+        self.plays_position = np.zeros((size, len(positions) + 1), dtype=bool)
+        self.types: List[str] = ["unknown"] * size
+        self.champion_count = len(champions_db)  # IDs 0..N-1 têm dados completos
+
+        for name, data in champions_db.items():
+            i = self.ids[name]
+            self.base_strength[i] = data.get("base_strength", DEFAULT_STRENGTH)
+            self.phase_strength[i] = [data.get(f"{phase}_game", DEFAULT_PHASE) for phase in PHASES]
+            self.types[i] = data.get("type", "unknown")
+            for position, multiplier in data.get("positions", {}).items():
+                self.position_multiplier[i, self.position_ids[position]] = multiplier
+                self.plays_position[i, self.position_ids[position]] = True
+
+        # Força final por (campeão, posição) já limitada a 1-10
+        self.strength = np.clip(self.base_strength[:, None] * self.position_multiplier, 1.0, 10.0)
+
+        raw_synergy = np.full((size, size), DEFAULT_SYNERGY)
+        for first, second, data in synergy_pairs:
+            raw_synergy[self.ids[first], self.ids[second]] = data.get("synergy_score", DEFAULT_SYNERGY)
+        self.synergy = np.maximum(raw_synergy, raw_synergy.T)
+
+        self.advantage = np.full((size, size), DEFAULT_ADVANTAGE)
+        for first, second, data in counter_pairs:
+            self.advantage[self.ids[first], self.ids[second]] = data.get("advantage", DEFAULT_ADVANTAGE)
+
+        # Mesmas matrizes como listas Python (lookups escalares baratos)
+        self._strength_rows = self.strength.tolist()
+        self._synergy_rows = self.synergy.tolist()
+        self._advantage_rows = self.advantage.tolist()
+        self._phase_rows = self.phase_strength.tolist()
+
+        self._id_cache: Dict[str, int] = {}
+        self._picks_cache: Dict[Tuple[str, ...], Tuple[int, ...]] = {}
+        self._positions_cache: Dict[Tuple[str, ...], Tuple[int, ...]] = {}
+        self._position_codes: Dict[str, int] = {}
+
+    @staticmethod
+    def _split_keys(database: Dict[str, Any], separator: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Pares (campeão, campeão, dados) das chaves válidas; metadados "_..." são ignorados"""
+        pairs = []
+        for key, data in database.items():
+            if key.startswith("_") or not isinstance(data, dict):
+                continue
+            parts = key.split(separator)
+            if len(parts) == 2 and all(parts):
+                pairs.append((parts[0], parts[1], data))
+        return pairs
+
+    @property
+    def size(self) -> int:
+        return len(self.names) + 1
+
+    def champion_id(self, champion: str) -> int:
+        """ID do campeão pelo nome bruto do pick (normalizado uma única vez)"""
+        champion_id = self._id_cache.get(champion)
+        if champion_id is None:
+            champion_id = self._id_cache[champion] = self.ids.get(
+                normalize_champion_name(champion), self.unknown_id
+            )
+        return champion_id
+
+    def position_id(self, position: str) -> int:
+        return self.position_ids.get(position.lower(), self.unknown_position)
+
+    def _cached(self, cache: Dict[Tuple[str, ...], Tuple[int, ...]],
+                key: Tuple[str, ...], resolve) -> Tuple[int, ...]:
+        ids = cache.get(key)
+        if ids is None:
+            if len(cache) >= PICK_IDS_CACHE_SIZE:
+                cache.clear()
+            ids = cache[key] = tuple(resolve(name) for name in key)
+        return ids
+
+    def pick_ids(self, picks: Sequence[Dict[str, Any]]) -> Tuple[int, ...]:
+        """IDs dos campeões do draft (o mesmo draft é resolvido uma única vez)"""
+        return self._cached(self._picks_cache, tuple([pick["champion"] for pick in picks]), self.champion_id)
+
+    def pick_positions(self, picks: Sequence[Dict[str, Any]]) -> Tuple[int, ...]:
+        return self._cached(
+            self._positions_cache, tuple([pick.get("position", "") for pick in picks]), self.position_id
+        )
+
+    def pair_by_position(
+        self,
+        picks: Sequence[Dict[str, Any]],
+        enemy_picks: Sequence[Dict[str, Any]]
+    ) -> Tuple[List[int], List[int]]:
+        """IDs (aliado, inimigo) de cada pick contra o primeiro inimigo da mesma posição"""
+        enemy_by_position: Dict[str, int] = {}
+        for enemy, enemy_id in zip(enemy_picks, self.pick_ids(enemy_picks)):
+            enemy_by_position.setdefault(enemy.get("position", "").lower(), enemy_id)
+
+        ids, enemy_ids = [], []
+        for pick, champion_id in zip(picks, self.pick_ids(picks)):
+            enemy_id = enemy_by_position.get(pick.get("position", "").lower())
+            if enemy_id is not None:
+                ids.append(champion_id)
+                enemy_ids.append(enemy_id)
+        return ids, enemy_ids
+
+    # Drafts pequenos usam as linhas das matrizes como listas: com 5 picks o
+    # overhead de cada chamada NumPy supera o trabalho; acima disso (e nos
+    # lotes) as somas são feitas com fancy indexing.
+
+    def individual_strength(self, ids: Sequence[int], positions: Sequence[int]) -> float:
+        """Média da força base x multiplicador de posição, limitada a 1-10"""
+        if len(ids) == 0:
+            return DEFAULT_STRENGTH
+        if len(ids) <= SMALL_DRAFT_SIZE:
+            rows = self._strength_rows
+            total = 0.0
+            for i, p in zip(ids, positions):
+                total += rows[i][p]
+            return total / len(ids)
+        return float(self.strength[np.asarray(ids), np.asarray(positions)].sum()) / len(ids)
+
+    def team_synergy(self, ids: Sequence[int]) -> float:
+        """Média das sinergias de todos os pares do draft"""
+        count = len(ids)
+        if count < 2:
+            return DEFAULT_SYNERGY
+        if count <= SMALL_DRAFT_SIZE:
+            rows = self._synergy_rows
+            total = sum(rows[ids[i]][ids[j]] for i in range(count) for j in range(i + 1, count))
+            return total / (count * (count - 1) // 2)
+        # Bloco simétrico: cada par aparece duas vezes fora da diagonal
+        ids = np.asarray(ids)
+        pairs_total = self.synergy[ids[:, None], ids].sum() - self.synergy[ids, ids].sum()
+        return float(pairs_total) / (count * (count - 1))
+
+    def matchup_score(self, ids: Sequence[int], enemy_ids: Sequence[int]) -> float:
+        """Média das vantagens (escala 0-10) dos confrontos já pareados por posição"""
+        if len(ids) == 0:
+            return DEFAULT_SYNERGY
+        if len(ids) <= SMALL_DRAFT_SIZE:
+            rows = self._advantage_rows
+            total = sum(rows[i][j] for i, j in zip(ids, enemy_ids))
+        else:
+            total = float(self.advantage[np.asarray(ids), np.asarray(enemy_ids)].sum())
+        return 5.0 + total / len(ids) * 5.0
+
+    def phase_strength_of(self, ids: Sequence[int]) -> Dict[str, float]:
+        if len(ids) == 0:
+            return {phase: 0.0 for phase in PHASES}
+        if len(ids) <= SMALL_DRAFT_SIZE:
+            rows = self._phase_rows
+            totals = [0.0] * len(PHASES)
+            for i in ids:
+                for phase, value in enumerate(rows[i]):
+                    totals[phase] += value
+        else:
+            totals = self.phase_strength[np.asarray(ids)].sum(axis=0).tolist()
+        return {phase: round(total / len(ids), 2) for phase, total in zip(PHASES, totals)}
+
+
+    # Lotes: N drafts pontuados em uma única passada vetorizada
+
+    def position_code(self, position: str) -> int:
+        """Código estável da posição (mesma string em minúsculas = mesmo código)"""
+        position = position.lower()
+        code = self._position_codes.get(position)
+        if code is None:
+            code = self._position_codes[position] = len(self._position_codes)
+        return code
+
+    def encode_drafts(self, drafts: Sequence[Sequence[Dict[str, Any]]]) -> EncodedDrafts:
+        """Converte listas de picks em matrizes (N, K); K é o maior draft do lote"""
+        width = max((len(draft) for draft in drafts), default=0)
+        champion_id, position_id, position_code = self.champion_id, self.position_id, self.position_code
+
+        # Linhas montadas em listas Python e convertidas de uma vez
+        ids, columns, positions, sizes = [], [], [], []
+        for draft in drafts:
+            padding = width - len(draft)
+            ids.append([champion_id(pick["champion"]) for pick in draft] + [self.unknown_id] * padding)
+            draft_positions = [pick.get("position", "") for pick in draft]
+            columns.append([position_id(position) for position in draft_positions]
+                           + [self.unknown_position] * padding)
+            positions.append([position_code(position) for position in draft_positions] + [-1] * padding)
+            sizes.append(len(draft))
+
+        shape = (len(drafts), width)
+        return EncodedDrafts(
+            ids=np.array(ids, dtype=np.intp).reshape(shape),
+            columns=np.array(columns, dtype=np.intp).reshape(shape),
+            positions=np.array(positions, dtype=np.intp).reshape(shape),
+            mask=np.arange(width) < np.array(sizes, dtype=np.intp).reshape(-1, 1),
+        )
+
+    def adjustment_vector(self, adjustments: Optional[Dict[str, float]]) -> Optional["np.ndarray"]:
+        """Ajustes de força por campeão (ex.: mudanças do patch) indexados por ID"""
+        if not adjustments:
+            return None
+        vector = np.zeros(self.size)
+        for champion, delta in adjustments.items():
+            champion_id = self.champion_id(champion)
+            if champion_id != self.unknown_id:
+                vector[champion_id] = delta
+        return vector
+
+    def score_encoded(
+        self,
+        team: EncodedDrafts,
+        enemy: Optional[EncodedDrafts] = None,
+        strength_adjustment: Optional["np.ndarray"] = None
+    ) -> DraftBatchScores:
+        """
+        Pontua N drafts de uma vez
+
+        Mesma semântica dos scores escalares: sinergia média dos pares,
+        matchup contra o primeiro inimigo da mesma posição, força
+        individual limitada a 1-10 e médias por fase. `enemy` pode ter N
+        linhas ou uma só (aplicada a todos os drafts).
+        """
+        ids, mask = team.ids, team.mask
+        count = len(team)
+        picks = mask.sum(axis=1)
+        divisor = np.maximum(picks, 1)
+
+        # Sinergia: bloco (N, K, K) mascarado ao triângulo superior
+        width = ids.shape[1]
+        pair_mask = mask[:, :, None] & mask[:, None, :] & np.triu(np.ones((width, width), dtype=bool), 1)
+        pair_total = np.where(pair_mask, self.synergy[ids[:, :, None], ids[:, None, :]], 0.0).sum(axis=(1, 2))
+        pairs = picks * (picks - 1) // 2
+        synergy = np.where(pairs > 0, pair_total / np.maximum(pairs, 1), DEFAULT_SYNERGY)
+
+        # Força individual (meta): tabela pré-limitada ou recalculada com ajustes do patch
+        if strength_adjustment is None:
+            strength = self.strength[ids, team.columns]
+        else:
+            strength = np.clip(
+                self.base_strength[ids] * self.position_multiplier[ids, team.columns] + strength_adjustment[ids],
+                1.0, 10.0
+            )
+        meta = np.where(picks > 0, np.where(mask, strength, 0.0).sum(axis=1) / divisor, DEFAULT_STRENGTH)
+
+        phases = np.where(mask[:, :, None], self.phase_strength[ids], 0.0).sum(axis=1) / divisor[:, None]
+
+        counters = np.full(count, DEFAULT_SYNERGY)
+        if enemy is not None and enemy.ids.size:
+            enemy_ids = np.broadcast_to(enemy.ids, (count, enemy.ids.shape[1]))
+            enemy_positions = np.broadcast_to(enemy.positions, enemy_ids.shape)
+            enemy_mask = np.broadcast_to(enemy.mask, enemy_ids.shape)
+
+            same_position = (
+                (team.positions[:, :, None] == enemy_positions[:, None, :])
+                & mask[:, :, None] & enemy_mask[:, None, :]
+            )
+            paired = same_position.any(axis=2)
+            opponent = np.take_along_axis(enemy_ids, same_position.argmax(axis=2), axis=1)
+            advantage = np.where(paired, self.advantage[ids, opponent], 0.0).sum(axis=1)
+            matchups = paired.sum(axis=1)
+            counters = np.where(matchups > 0, 5.0 + advantage / np.maximum(matchups, 1) * 5.0, DEFAULT_SYNERGY)
+
+        return DraftBatchScores(
+            synergy=synergy,
+            counters=counters,
+            meta=meta,
+            early=phases[:, 0],
+            mid=phases[:, 1],
+            late=phases[:, 2],
+        )
+
+    def candidate_ids(self, position: Optional[str] = None, exclude: Sequence[int] = ()) -> "np.ndarray":
+        """Campeões com dados completos, opcionalmente só os que jogam na posição"""
+        available = np.ones(self.champion_count, dtype=bool)
+        if position:
+            column = self.position_id(position)
+            if column != self.unknown_position:
+                available &= self.plays_position[:self.champion_count, column]
+        excluded = [i for i in exclude if i < self.champion_count]
+        available[excluded] = False
+        return np.flatnonzero(available)
+
+    def with_candidates(self, team: EncodedDrafts, candidates: "np.ndarray", position: str) -> EncodedDrafts:
+        """Um draft por candidato: o draft base (1 linha) + candidato na posição aberta"""
+        count = len(candidates)
+
+        def extend(base: "np.ndarray", value) -> "np.ndarray":
+            column = np.asarray(value, dtype=base.dtype)
+            column = np.broadcast_to(column[:, None] if column.ndim else column, (count, 1))
+            return np.hstack([np.broadcast_to(base, (count, base.shape[1])), column])
+
+        return EncodedDrafts(
+            ids=extend(team.ids, candidates),
+            columns=extend(team.columns, self.position_id(position)),
+            positions=extend(team.positions, self.position_code(position)),
+            mask=extend(team.mask, True),
+        )
+
+
+def compile_champion_tables(
+    champions_db: Dict[str, Any],
+    synergies_db: Dict[str, Any],
+    counters_db: Dict[str, Any]
+) -> Optional[ChampionTables]:
+    """Compila as tabelas (None sem NumPy: o analisador usa os dicts)"""
+    if not NUMPY_AVAILABLE:
+        return None
+    return ChampionTables(champions_db, synergies_db, counters_db)
@@ -6,15 +6,45 @@ matchups por posição e força geral das composições.
 """
 
 from __future__ import annotations
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional, Sequence
 import json
+import os
+import time
+import pickle
 import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
 from pathlib import Path
 
 from ..utils.logger_config import get_logger
+from .champion_tables import NUMPY_AVAILABLE, np
+from .champion_tables import (
+    ChampionTables, DraftBatchScores, compile_champion_tables, normalize_champion_name
+)
 
 logger = get_logger(__name__)
 
+DEFAULT_DATA_DIR = "bot/data"
+DATABASE_FILES = ("champions_database.json", "champion_synergies.json", "champion_counters.json")
+
+# Snapshot binário das databases + tabelas compiladas (incrementar ao mudar o formato)
+SNAPSHOT_FILENAME = "composition_tables.pkl"
+SNAPSHOT_VERSION = 2
+
+COMPOSITION_MEMO_SIZE = 2048  # análises memorizadas (draft + inimigo + patch)
+
+DraftKey = Tuple[Tuple[str, str], ...]
+MemoKey = Tuple[DraftKey, DraftKey, str]
+
+
+def canonical_draft(picks: List[Dict[str, Any]]) -> DraftKey:
+    """Draft como tupla ordenada de (posição, campeão normalizado)"""
+    return tuple(sorted(
+        (pick.get("position", "").lower(), normalize_champion_name(pick["champion"]))
+        for pick in picks
+    ))
+
 class CompositionAnalyzer:
     """
     Analisador principal de composições de times
@@ -27,69 +57,204 @@ class CompositionAnalyzer:
     - Força por fase do jogo (early/mid/late)
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        data_dir: str = DEFAULT_DATA_DIR,
+        snapshot_path: Optional[str] = None,
+        memo_size: int = COMPOSITION_MEMO_SIZE
+    ):
+        self.data_dir = Path(data_dir)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else self.data_dir / SNAPSHOT_FILENAME
+        
         self.champions_db: Dict[str, Any] = {}
         self.synergies_db: Dict[str, Any] = {}
         self.counters_db: Dict[str, Any] = {}
         
-        # Carrega databases
-        asyncio.create_task(self._initialize_databases())
+        # Tabelas compiladas (IDs inteiros + matrizes NumPy); None usa os dicts
+        self.tables: Optional[ChampionTables] = None
+        
+        # Databases são carregadas sob demanda por ensure_loaded()/load_databases()
+        self.loaded = False
+        self._load_lock = threading.Lock()
+        
+        # Memo LRU de análises; esvaziado quando o patch muda
+        self.memo_size = memo_size
+        self.memo_patch: Optional[str] = None
+        self._memo: "OrderedDict[MemoKey, Dict[str, Any]]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self.memo_stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0
+        }
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Locks não são serializáveis e o memo não precisa ir para outro processo
+        state = self.__dict__.copy()
+        state.pop("_load_lock", None)
+        state.pop("_memo_lock", None)
+        state["_memo"] = OrderedDict()
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._load_lock = threading.Lock()
+        self._memo_lock = threading.Lock()
+    
+    async def ensure_loaded(self) -> None:
+        """Garante databases carregadas (idempotente; I/O fora do event loop)"""
+        if not self.loaded:
+            await asyncio.to_thread(self.load_databases)
     
     async def _initialize_databases(self) -> None:
-        """Inicializa todas as databases necessárias"""
+        """Inicializa todas as databases necessárias (compatibilidade)"""
+        await self.ensure_loaded()
+    
+    def load_databases(self, force: bool = False) -> None:
+        """
+        Carrega databases e tabelas compiladas (idempotente e thread-safe)
+        
+        Usa o snapshot binário quando os JSONs de origem não mudaram
+        (mtime/tamanho); caso contrário faz o parse, compila e regrava o
+        snapshot.
+        """
+        with self._load_lock:
+            if self.loaded and not force:
+                return
+            
+            if not force and self._load_snapshot():
+                logger.info("✅ Databases de composição carregadas do snapshot")
+            else:
+                self._load_json_databases()
+                self._compile_tables()
+                self._save_snapshot()
+            
+            self.loaded = True
+        self.invalidate_memo()
+    
+    def _load_json_databases(self) -> None:
         try:
-            await asyncio.gather(
-                self._load_champions_database(),
-                self._load_synergies_database(),
-                self._load_counters_database()
-            )
+            self._load_champions_database()
+            self._load_synergies_database()
+            self._load_counters_database()
             logger.info("✅ Databases de composição carregadas com sucesso")
         except Exception as e:
             logger.error(f"❌ Erro ao carregar databases: {e}")
             # Cria databases vazias para funcionamento básico
-            await self._create_default_databases()
+            self._create_default_databases()
+    
+    def _compile_tables(self) -> None:
+        """Compila as databases carregadas em IDs inteiros e matrizes densas"""
+        try:
+            self.tables = compile_champion_tables(self.champions_db, self.synergies_db, self.counters_db)
+        except Exception as e:
+            logger.warning(f"Tabelas compiladas indisponíveis, usando lookups em dict: {e}")
+            self.tables = None
     
-    async def _load_champions_database(self) -> None:
+    def _source_stamps(self) -> Optional[Dict[str, Tuple[int, int]]]:
+        """(mtime_ns, tamanho) de cada JSON de origem; None se algum não existe"""
+        stamps = {}
+        for filename in DATABASE_FILES:
+            try:
+                stat = (self.data_dir / filename).stat()
+            except OSError:
+                return None
+            stamps[filename] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+    
+    def _load_snapshot(self) -> bool:
+        """Carrega o snapshot se ainda corresponde aos JSONs de origem"""
+        stamps = self._source_stamps()
+        if stamps is None or not self.snapshot_path.exists():
+            return False
+        
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Snapshot de composição ilegível, recompilando: {e}")
+            return False
+        
+        if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("sources") != stamps:
+            return False
+        
+        self.champions_db = snapshot["champions_db"]
+        self.synergies_db = snapshot["synergies_db"]
+        self.counters_db = snapshot["counters_db"]
+        self.tables = snapshot["tables"]
+        return True
+    
+    def _save_snapshot(self) -> None:
+        """Grava o snapshot binário (escrita atômica; falha não é fatal)"""
+        stamps = self._source_stamps()
+        if stamps is None:
+            return
+        
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "sources": stamps,
+            "champions_db": self.champions_db,
+            "synergies_db": self.synergies_db,
+            "counters_db": self.counters_db,
+            "tables": self.tables,
+        }
+        temp_path = self.snapshot_path.with_suffix(".tmp")
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o snapshot de composição: {e}")
+    
+    def _load_champions_database(self) -> None:
         """Carrega database de campeões"""
-        db_path = Path("bot/data/champions_database.json")
+        db_path = self.data_dir / "champions_database.json"
         
         if db_path.exists():
             with open(db_path, 'r', encoding='utf-8') as f:
                 self.champions_db = json.load(f)
         else:
             logger.warning("Database de campeões não encontrada, criando uma básica")
-            await self._create_champions_database()
+            self._create_champions_database()
     
-    async def _load_synergies_database(self) -> None:
+    def _load_synergies_database(self) -> None:
         """Carrega database de sinergias"""
-        db_path = Path("bot/data/champion_synergies.json")
+        db_path = self.data_dir / "champion_synergies.json"
         
         if db_path.exists():
             with open(db_path, 'r', encoding='utf-8') as f:
                 self.synergies_db = json.load(f)
         else:
             logger.warning("Database de sinergias não encontrada, criando uma básica")
-            await self._create_synergies_database()
+            self._create_synergies_database()
     
-    async def _load_counters_database(self) -> None:
+    def _load_counters_database(self) -> None:
         """Carrega database de counters"""
-        db_path = Path("bot/data/champion_counters.json")
+        db_path = self.data_dir / "champion_counters.json"
         
         if db_path.exists():
             with open(db_path, 'r', encoding='utf-8') as f:
                 self.counters_db = json.load(f)
         else:
             logger.warning("Database de counters não encontrada, criando uma básica")
-            await self._create_counters_database()
+            self._create_counters_database()
     
-    async def analyze_team_composition(
+    def analyze_composition(
         self, 
         team_picks: List[Dict[str, Any]], 
         enemy_picks: List[Dict[str, Any]],
         patch_version: str = "14.10"
     ) -> Dict[str, Any]:
         """
-        Analisa força completa da composição de um time
+        Analisa força completa da composição de um time (núcleo síncrono)
+        
+        Só faz cálculo sobre as databases em memória: pode rodar direto no
+        event loop, em thread ou em processo (a instância é serializável).
+        O resultado é memorizado por draft canônico, draft inimigo e patch;
+        o dict devolvido é compartilhado entre chamadas e não deve ser
+        modificado.
         
         Args:
             team_picks: Lista de picks do time [{"champion": "Azir", "position": "mid", "pick_order": 1}]
@@ -99,59 +264,192 @@ class CompositionAnalyzer:
         Returns:
             Dict com análise completa da composição
         """
-        logger.info(f"🎮 Analisando composição: {[pick['champion'] for pick in team_picks]}")
+        if not self.loaded:
+            self.load_databases()
+        
+        key = self._memo_key(team_picks, enemy_picks, patch_version)
+        result = self._memo_get(key)
+        if result is not None:
+            return result
         
         try:
-            # 1. Análise individual dos campeões
-            individual_strength = await self._calculate_individual_strength(team_picks, patch_version)
-            
-            # 2. Análise de sinergias internas
-            team_synergies = await self._calculate_team_synergies(team_picks)
-            
-            # 3. Análise de matchups contra inimigos
-            matchup_advantages = await self._calculate_matchup_advantages(team_picks, enemy_picks)
-            
-            # 4. Flexibilidade estratégica
-            strategic_flexibility = await self._calculate_strategic_flexibility(team_picks)
-            
-            # 5. Força por fase do jogo
-            game_phase_strength = await self._calculate_game_phase_strength(team_picks)
-            
-            # Pontuação final (0-10)
-            overall_score = (
-                individual_strength * 0.25 +       # 25% peso
-                team_synergies * 0.30 +            # 30% peso  
-                matchup_advantages * 0.25 +        # 25% peso
-                strategic_flexibility * 0.20       # 20% peso
-            )
+            result = self._compute_composition(team_picks, enemy_picks, patch_version)
+        except Exception as e:
+            logger.error(f"❌ Erro na análise de composição: {e}")
+            return self._get_fallback_analysis()
+        
+        self._memo_set(key, result)
+        return result
+    
+    def _memo_key(
+        self,
+        team_picks: List[Dict[str, Any]],
+        enemy_picks: List[Dict[str, Any]],
+        patch_version: str
+    ) -> Optional[MemoKey]:
+        """Chave do memo (None para picks malformados, que não são memorizados)"""
+        try:
+            return canonical_draft(team_picks), canonical_draft(enemy_picks), str(patch_version)
+        except (KeyError, TypeError, AttributeError):
+            return None
+    
+    def _memo_get(self, key: Optional[MemoKey]) -> Optional[Dict[str, Any]]:
+        if key is None or self.memo_size <= 0:
+            return None
+        
+        with self._memo_lock:
+            patch_version = key[2]
+            if patch_version != self.memo_patch:
+                # Patch novo: análises anteriores usam balanceamento antigo
+                if self._memo:
+                    self._memo.clear()
+                    self.memo_stats["invalidations"] += 1
+                self.memo_patch = patch_version
             
-            result = {
-                "overall_score": round(overall_score, 2),
-                "individual_strength": round(individual_strength, 2),
-                "team_synergies": round(team_synergies, 2),
-                "matchup_advantages": round(matchup_advantages, 2),
-                "strategic_flexibility": round(strategic_flexibility, 2),
-                "game_phase_strength": game_phase_strength,
-                "detailed_analysis": await self._generate_detailed_analysis(team_picks),
-                "composition_summary": self._generate_composition_summary(overall_score, team_picks)
-            }
+            result = self._memo.get(key)
+            if result is None:
+                self.memo_stats["misses"] += 1
+                return None
             
-            logger.info(f"✅ Análise concluída - Score: {overall_score:.2f}/10")
+            self._memo.move_to_end(key)
+            self.memo_stats["hits"] += 1
             return result
-            
+    
+    def _memo_set(self, key: Optional[MemoKey], result: Dict[str, Any]) -> None:
+        if key is None or self.memo_size <= 0:
+            return
+        
+        with self._memo_lock:
+            if key[2] != self.memo_patch:
+                return  # patch mudou enquanto a análise rodava
+            self._memo[key] = result
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+                self.memo_stats["evictions"] += 1
+    
+    def invalidate_memo(self) -> None:
+        """Descarta todas as análises memorizadas (ex.: databases recarregadas)"""
+        with self._memo_lock:
+            if self._memo:
+                self._memo.clear()
+                self.memo_stats["invalidations"] += 1
+    
+    def get_memo_stats(self) -> Dict[str, Any]:
+        """Hits, misses, evictions e invalidações do memo de análises"""
+        lookups = self.memo_stats["hits"] + self.memo_stats["misses"]
+        return {
+            **self.memo_stats,
+            "hit_rate": round(self.memo_stats["hits"] / max(lookups, 1) * 100, 2),
+            "entries": len(self._memo),
+            "max_entries": self.memo_size,
+            "patch": self.memo_patch
+        }
+    
+    def _compute_composition(
+        self,
+        team_picks: List[Dict[str, Any]],
+        enemy_picks: List[Dict[str, Any]],
+        patch_version: str
+    ) -> Dict[str, Any]:
+        """Análise completa sem memo (exceções sobem para o chamador)"""
+        logger.debug(f"🎮 Analisando composição: {[pick['champion'] for pick in team_picks]}")
+        
+        # 1. Análise individual dos campeões
+        individual_strength = self.calculate_individual_strength(team_picks, patch_version)
+        
+        # 2. Análise de sinergias internas
+        team_synergies = self.calculate_team_synergies(team_picks)
+        
+        # 3. Análise de matchups contra inimigos
+        matchup_advantages = self.calculate_matchup_advantages(team_picks, enemy_picks)
+        
+        # 4. Flexibilidade estratégica
+        strategic_flexibility = self.calculate_strategic_flexibility(team_picks)
+        
+        # 5. Força por fase do jogo
+        game_phase_strength = self.calculate_game_phase_strength(team_picks)
+        
+        # Pontuação final (0-10)
+        overall_score = (
+            individual_strength * 0.25 +       # 25% peso
+            team_synergies * 0.30 +            # 30% peso  
+            matchup_advantages * 0.25 +        # 25% peso
+            strategic_flexibility * 0.20       # 20% peso
+        )
+        
+        result = {
+            "overall_score": round(overall_score, 2),
+            "individual_strength": round(individual_strength, 2),
+            "team_synergies": round(team_synergies, 2),
+            "matchup_advantages": round(matchup_advantages, 2),
+            "strategic_flexibility": round(strategic_flexibility, 2),
+            "game_phase_strength": game_phase_strength,
+            "detailed_analysis": self.generate_detailed_analysis(team_picks),
+            "composition_summary": self._generate_composition_summary(overall_score, team_picks)
+        }
+        
+        logger.debug(f"✅ Análise concluída - Score: {overall_score:.2f}/10")
+        return result
+    
+    async def analyze_team_composition(
+        self, 
+        team_picks: List[Dict[str, Any]], 
+        enemy_picks: List[Dict[str, Any]],
+        patch_version: str = "14.10"
+    ) -> Dict[str, Any]:
+        """Versão async de analyze_composition (compatibilidade)"""
+        await self.ensure_loaded()
+        return self.analyze_composition(team_picks, enemy_picks, patch_version)
+    
+    async def analyze_team_composition_in_executor(
+        self,
+        team_picks: List[Dict[str, Any]],
+        enemy_picks: List[Dict[str, Any]],
+        patch_version: str = "14.10",
+        executor: Optional[Executor] = None
+    ) -> Dict[str, Any]:
+        """
+        Executa analyze_composition fora do event loop
+        
+        Args:
+            executor: ThreadPoolExecutor/ProcessPoolExecutor (None usa o
+                executor padrão do loop). Em processos a instância é
+                serializada a cada chamada junto com as databases.
+        """
+        await self.ensure_loaded()
+        
+        # Memo consultado aqui: o worker (em outro processo) tem cópia própria
+        key = self._memo_key(team_picks, enemy_picks, patch_version)
+        result = self._memo_get(key)
+        if result is not None:
+            return result
+        
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                executor, self._compute_composition, team_picks, enemy_picks, patch_version
+            )
         except Exception as e:
             logger.error(f"❌ Erro na análise de composição: {e}")
             return self._get_fallback_analysis()
+        
+        self._memo_set(key, result)
+        return result
     
-    async def _calculate_individual_strength(self, picks: List[Dict], patch: str) -> float:
+    def calculate_individual_strength(self, picks: List[Dict], patch: str) -> float:
         """Calcula força individual média dos campeões"""
         if not picks:
             return 5.0
         
+        if self.tables is not None:
+            return self.tables.individual_strength(
+                self.tables.pick_ids(picks), self.tables.pick_positions(picks)
+            )
+        
         total_strength = 0.0
         
         for pick in picks:
-            champion = pick["champion"].lower().replace(" ", "").replace("'", "")
+            champion = normalize_champion_name(pick["champion"])
             position = pick.get("position", "").lower()
             
             # Força base do campeão
@@ -173,19 +471,22 @@ class CompositionAnalyzer:
         
         return total_strength / len(picks)
     
-    async def _calculate_team_synergies(self, picks: List[Dict]) -> float:
+    def calculate_team_synergies(self, picks: List[Dict]) -> float:
         """Calcula sinergias internas do time"""
         if len(picks) < 2:
             return 5.0
         
+        if self.tables is not None:
+            return self.tables.team_synergy(self.tables.pick_ids(picks))
+        
         synergy_score = 0.0
         combinations_checked = 0
         
         # Analisa todas as combinações 2x2
         for i, pick1 in enumerate(picks):
             for j, pick2 in enumerate(picks[i+1:], i+1):
-                champ1 = pick1["champion"].lower().replace(" ", "").replace("'", "")
-                champ2 = pick2["champion"].lower().replace(" ", "").replace("'", "")
+                champ1 = normalize_champion_name(pick1["champion"])
+                champ2 = normalize_champion_name(pick2["champion"])
                 
                 # Procura sinergia em ambas direções
                 synergy_key1 = f"{champ1}_{champ2}"
@@ -201,18 +502,22 @@ class CompositionAnalyzer:
         
         return synergy_score / combinations_checked if combinations_checked > 0 else 5.0
     
-    async def _calculate_matchup_advantages(self, team_picks: List[Dict], enemy_picks: List[Dict]) -> float:
+    def calculate_matchup_advantages(self, team_picks: List[Dict], enemy_picks: List[Dict]) -> float:
         """Calcula vantagens de matchup contra time inimigo"""
         if not enemy_picks:
             return 5.0
         
+        if self.tables is not None:
+            ids, enemy_ids = self.tables.pair_by_position(team_picks, enemy_picks)
+            return self.tables.matchup_score(ids, enemy_ids) if ids else 5.0
+        
         matchup_score = 0.0
         matchups_checked = 0
         
         # Analisa matchups por posição
         for pick in team_picks:
             position = pick.get("position", "").lower()
-            champion = pick["champion"].lower().replace(" ", "").replace("'", "")
+            champion = normalize_champion_name(pick["champion"])
             
             # Encontra oponente na mesma posição
             enemy_in_position = next(
@@ -221,7 +526,7 @@ class CompositionAnalyzer:
             )
             
             if enemy_in_position:
-                enemy_champion = enemy_in_position["champion"].lower().replace(" ", "").replace("'", "")
+                enemy_champion = normalize_champion_name(enemy_in_position["champion"])
                 matchup_key = f"{champion}_vs_{enemy_champion}"
                 
                 # Procura dados de matchup
@@ -234,30 +539,33 @@ class CompositionAnalyzer:
         
         return matchup_score / matchups_checked if matchups_checked > 0 else 5.0
     
-    async def _calculate_strategic_flexibility(self, picks: List[Dict]) -> float:
+    def calculate_strategic_flexibility(self, picks: List[Dict]) -> float:
         """Calcula flexibilidade estratégica da composição"""
         flexibility_factors = []
         
         # 1. Variedade de win conditions
-        win_conditions = await self._identify_win_conditions(picks)
+        win_conditions = self.identify_win_conditions(picks)
         flexibility_factors.append(min(10.0, len(win_conditions) * 2.0))
         
         # 2. Adaptabilidade de estratégias
-        strategy_options = await self._calculate_strategy_options(picks)
+        strategy_options = self._strategy_options(picks)
         flexibility_factors.append(strategy_options)
         
         # 3. Versatilidade de builds
-        build_flexibility = await self._calculate_build_flexibility(picks)
+        build_flexibility = self._build_flexibility(picks)
         flexibility_factors.append(build_flexibility)
         
         return sum(flexibility_factors) / len(flexibility_factors) if flexibility_factors else 5.0
     
-    async def _calculate_game_phase_strength(self, picks: List[Dict]) -> Dict[str, float]:
+    def calculate_game_phase_strength(self, picks: List[Dict]) -> Dict[str, float]:
         """Calcula força por fase do jogo"""
+        if self.tables is not None:
+            return self.tables.phase_strength_of(self.tables.pick_ids(picks))
+        
         phases = {"early": 0.0, "mid": 0.0, "late": 0.0}
         
         for pick in picks:
-            champion = pick["champion"].lower().replace(" ", "").replace("'", "")
+            champion = normalize_champion_name(pick["champion"])
             champion_data = self.champions_db.get(champion, {})
             
             phases["early"] += champion_data.get("early_game", 5.0)
@@ -271,7 +579,7 @@ class CompositionAnalyzer:
         
         return phases
     
-    async def _identify_win_conditions(self, picks: List[Dict]) -> List[str]:
+    def identify_win_conditions(self, picks: List[Dict]) -> List[str]:
         """Identifica as win conditions da composição"""
         win_conditions = []
         
@@ -281,7 +589,7 @@ class CompositionAnalyzer:
         utility_champions = 0
         
         for pick in picks:
-            champion = pick["champion"].lower().replace(" ", "").replace("'", "")
+            champion = normalize_champion_name(pick["champion"])
             champion_data = self.champions_db.get(champion, {})
             champion_type = champion_data.get("type", "unknown")
             
@@ -310,32 +618,32 @@ class CompositionAnalyzer:
         
         return win_conditions or ["standard"]
     
-    async def _calculate_strategy_options(self, picks: List[Dict]) -> float:
+    def _strategy_options(self, picks: List[Dict]) -> float:
         """Calcula opções estratégicas disponíveis"""
         # Implementação básica - será expandida
         return 6.0  # Score padrão
     
-    async def _calculate_build_flexibility(self, picks: List[Dict]) -> float:
+    def _build_flexibility(self, picks: List[Dict]) -> float:
         """Calcula flexibilidade de builds"""
         # Implementação básica - será expandida  
         return 6.0  # Score padrão
     
-    async def _generate_detailed_analysis(self, picks: List[Dict]) -> Dict[str, Any]:
+    def generate_detailed_analysis(self, picks: List[Dict]) -> Dict[str, Any]:
         """Gera análise detalhada da composição"""
         return {
-            "composition_type": await self._identify_composition_type(picks),
-            "key_synergies": await self._identify_key_synergies(picks),
-            "power_spikes": await self._identify_power_spikes(picks),
-            "weaknesses": await self._identify_weaknesses(picks),
-            "strengths": await self._identify_strengths(picks)
+            "composition_type": self.identify_composition_type(picks),
+            "key_synergies": self._key_synergies(picks),
+            "power_spikes": self._power_spikes(picks),
+            "weaknesses": self._weaknesses(picks),
+            "strengths": self._strengths(picks)
         }
     
-    async def _identify_composition_type(self, picks: List[Dict]) -> str:
+    def identify_composition_type(self, picks: List[Dict]) -> str:
         """Identifica o tipo da composição"""
         # Análise básica de tipos
         champion_types = []
         for pick in picks:
-            champion = pick["champion"].lower().replace(" ", "").replace("'", "")
+            champion = normalize_champion_name(pick["champion"])
             champion_data = self.champions_db.get(champion, {})
             champion_types.append(champion_data.get("type", "unknown"))
         
@@ -349,12 +657,12 @@ class CompositionAnalyzer:
         else:
             return "balanced_composition"
     
-    async def _identify_key_synergies(self, picks: List[Dict]) -> List[str]:
+    def _key_synergies(self, picks: List[Dict]) -> List[str]:
         """Identifica sinergias chave"""
         # Implementação básica
         return ["team_synergy_1", "team_synergy_2"]
     
-    async def _identify_power_spikes(self, picks: List[Dict]) -> Dict[str, str]:
+    def _power_spikes(self, picks: List[Dict]) -> Dict[str, str]:
         """Identifica power spikes da composição"""
         return {
             "early": "Level 6 ultimates",
@@ -362,14 +670,151 @@ class CompositionAnalyzer:
             "late": "Full builds + scaling"
         }
     
-    async def _identify_weaknesses(self, picks: List[Dict]) -> List[str]:
+    def _weaknesses(self, picks: List[Dict]) -> List[str]:
         """Identifica fraquezas da composição"""
         return ["early_game_vulnerability", "positioning_dependent"]
     
-    async def _identify_strengths(self, picks: List[Dict]) -> List[str]:
+    def _strengths(self, picks: List[Dict]) -> List[str]:
         """Identifica pontos fortes da composição"""
         return ["teamfight_potential", "scaling_power"]
     
+    def _require_tables(self) -> ChampionTables:
+        if not self.loaded:
+            self.load_databases()
+        if self.tables is None:
+            raise RuntimeError("Scoring em lote requer NumPy (tabelas compiladas indisponíveis)")
+        return self.tables
+    
+    def score_drafts(
+        self,
+        drafts: Sequence[Sequence[Dict[str, Any]]],
+        enemy_drafts: Optional[Sequence[Sequence[Dict[str, Any]]]] = None,
+        patch_adjustments: Optional[Dict[str, float]] = None
+    ) -> DraftBatchScores:
+        """
+        Pontua N drafts em uma única passada vetorizada (backtests, what-ifs)
+        
+        Args:
+            drafts: Lista de drafts (cada um no formato de team_picks)
+            enemy_drafts: Drafts inimigos, um por draft ou um só para todos
+            patch_adjustments: Ajuste de força por campeão (ex.: saída de
+                PatchAnalyzer.update_champion_database_with_patch)
+            
+        Returns:
+            DraftBatchScores com sinergia, counters, meta e força por fase
+        """
+        tables = self._require_tables()
+        if enemy_drafts is not None and len(enemy_drafts) not in (1, len(drafts)):
+            raise ValueError("enemy_drafts deve ter um draft ou o mesmo número de drafts")
+        
+        return tables.score_encoded(
+            tables.encode_drafts(drafts),
+            tables.encode_drafts(enemy_drafts) if enemy_drafts else None,
+            tables.adjustment_vector(patch_adjustments)
+        )
+    
+    def best_remaining_picks(
+        self,
+        team_picks: List[Dict[str, Any]],
+        position: str,
+        enemy_picks: Optional[List[Dict[str, Any]]] = None,
+        unavailable: Sequence[str] = (),
+        limit: int = 10,
+        weights: Optional[Dict[str, float]] = None,
+        patch_adjustments: Optional[Dict[str, float]] = None,
+        position_only: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Ranqueia todos os campeões disponíveis para a posição em aberto
+        
+        Cada candidato vira um draft (picks atuais + candidato) e o lote é
+        pontuado de uma vez.
+        
+        Args:
+            team_picks: Picks já feitos pelo time
+            position: Posição em aberto
+            enemy_picks: Picks do inimigo (para counters)
+            unavailable: Campeões banidos/indisponíveis
+            limit: Quantos candidatos retornar
+            weights: Pesos do score combinado (padrão: BATCH_SCORE_WEIGHTS)
+            patch_adjustments: Ajuste de força por campeão no patch
+            position_only: Considera só campeões com a posição na database
+            
+        Returns:
+            Candidatos ordenados pelo score combinado
+        """
+        tables = self._require_tables()
+        enemy_picks = enemy_picks or []
+        
+        taken = [
+            tables.champion_id(champion)
+            for champion in [pick["champion"] for pick in team_picks + enemy_picks] + list(unavailable)
+        ]
+        candidates = tables.candidate_ids(position if position_only else None, exclude=taken)
+        if len(candidates) == 0:
+            return []
+        
+        drafts = tables.with_candidates(tables.encode_drafts([team_picks]), candidates, position)
+        scores = tables.score_encoded(
+            drafts,
+            tables.encode_drafts([enemy_picks]) if enemy_picks else None,
+            tables.adjustment_vector(patch_adjustments)
+        )
+        composite = scores.composite(weights)
+        
+        ranking = []
+        for index in np.argsort(-composite, kind="stable")[:limit]:
+            ranking.append({
+                "champion": tables.names[candidates[index]],
+                "score": round(float(composite[index]), 2),
+                **scores.row(index)
+            })
+        return ranking
+    
+    # Wrappers async dos cálculos (compatibilidade com chamadas antigas)
+    
+    async def _calculate_individual_strength(self, picks: List[Dict], patch: str) -> float:
+        return self.calculate_individual_strength(picks, patch)
+    
+    async def _calculate_team_synergies(self, picks: List[Dict]) -> float:
+        return self.calculate_team_synergies(picks)
+    
+    async def _calculate_matchup_advantages(self, team_picks: List[Dict], enemy_picks: List[Dict]) -> float:
+        return self.calculate_matchup_advantages(team_picks, enemy_picks)
+    
+    async def _calculate_strategic_flexibility(self, picks: List[Dict]) -> float:
+        return self.calculate_strategic_flexibility(picks)
+    
+    async def _calculate_game_phase_strength(self, picks: List[Dict]) -> Dict[str, float]:
+        return self.calculate_game_phase_strength(picks)
+    
+    async def _identify_win_conditions(self, picks: List[Dict]) -> List[str]:
+        return self.identify_win_conditions(picks)
+    
+    async def _generate_detailed_analysis(self, picks: List[Dict]) -> Dict[str, Any]:
+        return self.generate_detailed_analysis(picks)
+    
+    async def _identify_composition_type(self, picks: List[Dict]) -> str:
+        return self.identify_composition_type(picks)
+    
+    async def _calculate_strategy_options(self, picks: List[Dict]) -> float:
+        return self._strategy_options(picks)
+    
+    async def _calculate_build_flexibility(self, picks: List[Dict]) -> float:
+        return self._build_flexibility(picks)
+    
+    async def _identify_key_synergies(self, picks: List[Dict]) -> List[str]:
+        return self._key_synergies(picks)
+    
+    async def _identify_power_spikes(self, picks: List[Dict]) -> Dict[str, str]:
+        return self._power_spikes(picks)
+    
+    async def _identify_weaknesses(self, picks: List[Dict]) -> List[str]:
+        return self._weaknesses(picks)
+    
+    async def _identify_strengths(self, picks: List[Dict]) -> List[str]:
+        return self._strengths(picks)
+    
     def _generate_composition_summary(self, score: float, picks: List[Dict]) -> str:
         """Gera resumo da composição"""
         if score >= 8.0:
@@ -394,15 +839,13 @@ class CompositionAnalyzer:
             "composition_summary": "ANÁLISE INDISPONÍVEL"
         }
     
-    async def _create_default_databases(self) -> None:
+    def _create_default_databases(self) -> None:
         """Cria databases padrão para funcionamento básico"""
-        await asyncio.gather(
-            self._create_champions_database(),
-            self._create_synergies_database(),
-            self._create_counters_database()
-        )
+        self._create_champions_database()
+        self._create_synergies_database()
+        self._create_counters_database()
     
-    async def _create_champions_database(self) -> None:
+    def _create_champions_database(self) -> None:
         """Cria database básica de campeões"""
         # Database mínima para testes
         basic_champions = {
@@ -435,13 +878,14 @@ class CompositionAnalyzer:
         self.champions_db = basic_champions
         
         # Salva no arquivo
-        db_path = Path("bot/data/champions_database.json")
+        db_path = self.data_dir / "champions_database.json"
+        db_path.parent.mkdir(parents=True, exist_ok=True)
         with open(db_path, 'w', encoding='utf-8') as f:
             json.dump(basic_champions, f, indent=2, ensure_ascii=False)
         
         logger.info("✅ Database básica de campeões criada")
     
-    async def _create_synergies_database(self) -> None:
+    def _create_synergies_database(self) -> None:
         """Cria database básica de sinergias"""
         basic_synergies = {
             "azir_graves": {
@@ -459,13 +903,14 @@ class CompositionAnalyzer:
         self.synergies_db = basic_synergies
         
         # Salva no arquivo
-        db_path = Path("bot/data/champion_synergies.json")
+        db_path = self.data_dir / "champion_synergies.json"
+        db_path.parent.mkdir(parents=True, exist_ok=True)
         with open(db_path, 'w', encoding='utf-8') as f:
             json.dump(basic_synergies, f, indent=2, ensure_ascii=False)
         
         logger.info("✅ Database básica de sinergias criada")
     
-    async def _create_counters_database(self) -> None:
+    def _create_counters_database(self) -> None:
         """Cria database básica de counters"""
         basic_counters = {
             "azir_vs_leblanc": {
@@ -483,8 +928,108 @@ class CompositionAnalyzer:
         self.counters_db = basic_counters
         
         # Salva no arquivo  
-        db_path = Path("bot/data/champion_counters.json")
+        db_path = self.data_dir / "champion_counters.json"
+        db_path.parent.mkdir(parents=True, exist_ok=True)
         with open(db_path, 'w', encoding='utf-8') as f:
             json.dump(basic_counters, f, indent=2, ensure_ascii=False)
         
         logger.info("✅ Database básica de counters criada") 
+
+
+async def benchmark_composition_analysis(repeats: int = 500) -> Dict[str, float]:
+    """
+    Compara tabelas compiladas vs lookups em dict para um draft 5x5
+    
+    Returns:
+        Tempo médio (ms) dos scores (força, sinergia, matchups, fases) e da
+        análise completa em cada modo, com os speedups, e de um hit no memo
+    """
+    analyzer = CompositionAnalyzer(memo_size=0)  # mede o cálculo, não o memo
+    await analyzer.ensure_loaded()
+    
+    team_picks = [
+        {"champion": "Azir", "position": "mid", "pick_order": 1},
+        {"champion": "Graves", "position": "jungle", "pick_order": 2},
+        {"champion": "Gnar", "position": "top", "pick_order": 3},
+        {"champion": "Jinx", "position": "adc", "pick_order": 4},
+        {"champion": "Thresh", "position": "support", "pick_order": 5}
+    ]
+    enemy_picks = [
+        {"champion": "LeBlanc", "position": "mid", "pick_order": 1},
+        {"champion": "Kindred", "position": "jungle", "pick_order": 2},
+        {"champion": "Jayce", "position": "top", "pick_order": 3},
+        {"champion": "Aphelios", "position": "adc", "pick_order": 4},
+        {"champion": "Leona", "position": "support", "pick_order": 5}
+    ]
+    
+    def score_only() -> None:
+        analyzer.calculate_individual_strength(team_picks, "14.10")
+        analyzer.calculate_team_synergies(team_picks)
+        analyzer.calculate_matchup_advantages(team_picks, enemy_picks)
+        analyzer.calculate_game_phase_strength(team_picks)
+    
+    def full_analysis() -> None:
+        analyzer.analyze_composition(team_picks, enemy_picks)
+    
+    timings = {}
+    compiled_tables = analyzer.tables
+    for mode, tables in (("dict", None), ("compiled", compiled_tables)):
+        analyzer.tables = tables
+        for name, call in (("scoring", score_only), ("analysis", full_analysis)):
+            started = time.perf_counter()
+            for _ in range(repeats):
+                call()
+            timings[f"{name}_{mode}_ms"] = (time.perf_counter() - started) / repeats * 1000
+    
+    analyzer.tables = compiled_tables
+    analyzer.memo_size = COMPOSITION_MEMO_SIZE
+    full_analysis()
+    started = time.perf_counter()
+    for _ in range(repeats):
+        full_analysis()
+    timings["analysis_memo_hit_ms"] = (time.perf_counter() - started) / repeats * 1000
+    
+    if compiled_tables is not None:
+        for name in ("scoring", "analysis"):
+            timings[f"{name}_speedup"] = timings[f"{name}_dict_ms"] / timings[f"{name}_compiled_ms"]
+    return timings
+
+
+
+def benchmark_batch_scoring(n_drafts: int = 10_000, loop_sample: int = 1000) -> Dict[str, float]:
+    """
+    Compara score_drafts com analyze_composition chamado por draft
+    
+    Returns:
+        Tempo total (ms) do lote, tempo estimado do loop para os mesmos
+        `n_drafts` (medido em `loop_sample` drafts) e o speedup
+    """
+    analyzer = CompositionAnalyzer(memo_size=0)
+    analyzer.load_databases()
+    
+    rng = np.random.default_rng(42)
+    champions = list(analyzer.champions_db)
+    roles = ("top", "jungle", "mid", "adc", "support")
+    drafts = [
+        [{"champion": champions[i], "position": role} for i, role in zip(row, roles)]
+        for row in rng.integers(0, len(champions), (n_drafts, len(roles))).tolist()
+    ]
+    enemy = drafts[0]
+    
+    started = time.perf_counter()
+    analyzer.score_drafts(drafts, [enemy])
+    batch_ms = (time.perf_counter() - started) * 1000
+    
+    sample = drafts[:loop_sample]
+    started = time.perf_counter()
+    for draft in sample:
+        analyzer.analyze_composition(draft, enemy)
+    loop_ms = (time.perf_counter() - started) * 1000 * n_drafts / max(len(sample), 1)
+    
+    return {"batch_ms": batch_ms, "loop_ms": loop_ms, "speedup": loop_ms / batch_ms}
+
+
+if __name__ == "__main__":
+    print(asyncio.run(benchmark_composition_analysis()))
+    if NUMPY_AVAILABLE:
+        print(benchmark_batch_scoring())
@@ -10,6 +10,8 @@ import aiohttp
 from aiohttp import ClientTimeout
 
 from ..utils.logger_config import get_logger
+from .response_cache import ResponseCache
+from .single_flight import SingleFlight
 
 logger = get_logger(__name__)
 
@@ -31,8 +33,9 @@ class LoLEsportsAPIClient:
     
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
-        self.cache: Dict[str, Tuple[Any, float]] = {}
         self.cache_ttl = 300  # 5 minutos
+        self.cache = ResponseCache("lolesports", default_ttl=self.cache_ttl)
+        self.single_flight = SingleFlight("lolesports")
         
         # Headers padrão
         self.headers = {
@@ -76,19 +79,18 @@ class LoLEsportsAPIClient:
 
     def _get_from_cache(self, key: str) -> Optional[Any]:
         """Recupera dados do cache se válidos"""
-        if key in self.cache:
-            data, expires_at = self.cache[key]
-            if time.time() < expires_at:
-                return data
-            else:
-                del self.cache[key]
-        return None
+        return self.cache.get(key)
 
-    def _set_cache(self, key: str, data: Any, ttl: Optional[int] = None) -> None:
+    def _set_cache(
+        self,
+        key: str,
+        data: Any,
+        ttl: Optional[int] = None,
+        endpoint: Optional[str] = None,
+        size: Optional[int] = None
+    ) -> None:
         """Armazena dados no cache"""
-        ttl = ttl or self.cache_ttl
-        expires_at = time.time() + ttl
-        self.cache[key] = (data, expires_at)
+        self.cache.set(key, data, ttl, endpoint=endpoint, size=size)
 
     async def _make_request(
         self,
@@ -105,8 +107,23 @@ class LoLEsportsAPIClient:
         cached_data = self._get_from_cache(cache_key)
         if cached_data is not None:
             logger.debug(f"Cache hit para {endpoint}")
+            self.single_flight.record_cache_hit()
             return cached_data
 
+        # Requisições idênticas em andamento compartilham a mesma resposta
+        return await self.single_flight.do(
+            cache_key,
+            lambda: self._fetch(endpoint, params, cache_key, cache_ttl)
+        )
+
+    async def _fetch(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        cache_key: str,
+        cache_ttl: Optional[int],
+    ) -> Dict[str, Any]:
+        """Executa a requisição HTTP e armazena a resposta no cache"""
         # Constrói URL
         url = f"{self.BASE_URL}{endpoint}"
         
@@ -118,8 +135,9 @@ class LoLEsportsAPIClient:
             async with self.session.get(url, params=params) as response:
                 if response.status == 200:
                     data = await response.json()
-                    # Armazena no cache
-                    self._set_cache(cache_key, data, cache_ttl)
+                    # Armazena no cache (corpo já lido pelo json(): tamanho sem reserializar)
+                    self._set_cache(cache_key, data, cache_ttl, endpoint=endpoint,
+                                    size=len(await response.read()))
                     logger.debug(f"Requisição bem-sucedida: {endpoint}")
                     return data
                 else:
@@ -409,9 +427,10 @@ class LoLEsportsAPIClient:
 
     def cleanup_cache(self) -> None:
         """Remove itens expirados do cache"""
-        now = time.time()
-        expired_keys = [key for key, (_, expires_at) in self.cache.items() if now >= expires_at]
-        for key in expired_keys:
-            del self.cache[key]
-        if expired_keys:
-            logger.debug(f"Removidos {len(expired_keys)} itens expirados do cache")
+        removed = self.cache.cleanup()
+        if removed:
+            logger.debug(f"Removidos {removed} itens expirados do cache")
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hits, misses, evictions e uso de memória do cache"""
+        return self.cache.get_stats()
@@ -15,10 +15,13 @@ from ..utils.constants import (
     MIN_ODDS, 
     MAX_ODDS,
     PANDASCORE_API_KEY,
-    PANDASCORE_BASE_URL
+    PANDASCORE_BASE_URL,
+    PANDASCORE_RATE_LIMITS
 )
 from ..utils.helpers import normalize_team_name, teams_similarity, validate_odds
 from ..utils.logger_config import get_logger
+from .rate_limiter import TokenBucketRateLimiter, parse_retry_after
+from .single_flight import SingleFlight
 
 logger = get_logger(__name__)
 
@@ -32,42 +35,20 @@ class PandaScoreAPIError(Exception):
         self.response_data = response_data
 
 
-class PandaScoreRateLimiter:
+class PandaScoreRateLimiter(TokenBucketRateLimiter):
     """Sistema de rate limiting para PandaScore API"""
 
-    def __init__(self, requests_per_second: int = 10, requests_per_hour: int = 1000):
+    def __init__(
+        self,
+        requests_per_second: int = PANDASCORE_RATE_LIMITS["requests_per_second"],
+        requests_per_hour: int = PANDASCORE_RATE_LIMITS["requests_per_hour"]
+    ):
         self.requests_per_second = requests_per_second
         self.requests_per_hour = requests_per_hour
-        self.second_window: List[float] = []
-        self.hour_window: List[float] = []
-        self._lock = asyncio.Lock()
-
-    async def acquire(self) -> None:
-        """Aguarda até que seja seguro fazer uma requisição"""
-        async with self._lock:
-            now = time.time()
-
-            # Limpa janelas antigas
-            self.second_window = [t for t in self.second_window if now - t < 1.0]
-            self.hour_window = [t for t in self.hour_window if now - t < 3600.0]
-
-            # Verifica se precisa aguardar
-            if len(self.second_window) >= self.requests_per_second:
-                sleep_time = 1.0 - (now - self.second_window[0])
-                if sleep_time > 0:
-                    logger.debug(f"PandaScore rate limit: aguardando {sleep_time:.2f}s")
-                    await asyncio.sleep(sleep_time)
-
-            if len(self.hour_window) >= self.requests_per_hour:
-                sleep_time = 3600.0 - (now - self.hour_window[0])
-                if sleep_time > 0:
-                    logger.warning(f"PandaScore rate limit: aguardando {sleep_time:.2f}s (janela 1h)")
-                    await asyncio.sleep(sleep_time)
-
-            # Registra a requisição
-            now = time.time()
-            self.second_window.append(now)
-            self.hour_window.append(now)
+        super().__init__(
+            [(requests_per_second, 1.0), (requests_per_hour, 3600.0)],
+            name="PandaScore"
+        )
 
 
 class PandaScoreAPIClient:
@@ -82,6 +63,7 @@ class PandaScoreAPIClient:
 
         self.session: Optional[aiohttp.ClientSession] = None
         self.rate_limiter = PandaScoreRateLimiter()
+        self.single_flight = SingleFlight("pandascore")
 
         # Headers padrão
         self.headers = {
@@ -127,6 +109,23 @@ class PandaScoreAPIClient:
         if not self.session:
             await self.start_session()
 
+        if method.upper() == "GET":
+            # GETs idênticos em andamento compartilham a mesma resposta
+            request_key = f"{endpoint}:{json.dumps(params or {}, sort_keys=True, default=str)}"
+            return await self.single_flight.do(
+                request_key,
+                lambda: self._fetch(endpoint, params, method)
+            )
+
+        return await self._fetch(endpoint, params, method)
+
+    async def _fetch(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        method: str
+    ) -> Dict[str, Any]:
+        """Executa a requisição HTTP"""
         # Rate limiting
         await self.rate_limiter.acquire()
 
@@ -159,10 +158,9 @@ class PandaScoreAPIClient:
             return response_data
 
         elif response.status == 429:
-            # Rate limit excedido
-            retry_after = int(response.headers.get("Retry-After", 60))
-            logger.warning(f"PandaScore rate limit excedido. Aguardando {retry_after}s")
-            await asyncio.sleep(retry_after)
+            # Rate limit excedido: pausa o bucket, próximas requisições aguardam no acquire
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self.rate_limiter.pause(retry_after)
             raise PandaScoreAPIError("Rate limit excedido", response.status, response_data)
 
         elif response.status == 401:
@@ -404,6 +402,10 @@ class PandaScoreAPIClient:
             logger.error(f"Erro ao buscar times LoL no PandaScore: {e}")
             return []
 
+    def get_rate_limit_status(self) -> Dict[str, Any]:
+        """Orçamento atual e tempos de espera do rate limiter"""
+        return self.rate_limiter.get_stats()
+
     async def health_check(self) -> bool:
         """Verifica se a API está funcionando"""
         try:
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class RateWindow:
+    """
+    Janela de rate limit no esquema GCRA (Generic Cell Rate Algorithm)
+
+    Token bucket com capacidade `burst` recarregado a cada
+    `period / (limit - burst + 1)` segundos; o estado é um único timestamp
+    (TAT). Com essa recarga nenhum intervalo de `period` segundos admite
+    mais que `limit` requisições (rajada + recargas dentro do intervalo).
+    Rajada padrão: metade do limite.
+    """
+    name: str
+    limit: int
+    period: float
+    burst: Optional[int] = None
+    tat: float = 0.0  # Theoretical Arrival Time
+
+    def __post_init__(self):
+        if self.burst is None:
+            self.burst = max(1, self.limit // 2)
+        if not 1 <= self.burst <= self.limit:
+            raise ValueError(f"Rajada deve estar entre 1 e {self.limit}: {self.burst}")
+
+    @property
+    def emission_interval(self) -> float:
+        return self.period / (self.limit - self.burst + 1)
+
+    @property
+    def tolerance(self) -> float:
+        return (self.burst - 1) * self.emission_interval
+
+    def wait_time(self, now: float) -> float:
+        """Segundos até esta janela liberar mais uma requisição"""
+        return max(0.0, self.tat - self.tolerance - now)
+
+    def reserve(self, now: float) -> None:
+        """Consome um token (O(1))"""
+        self.tat = max(self.tat, now) + self.emission_interval
+
+    def remaining(self, now: float) -> int:
+        """Tokens disponíveis imediatamente"""
+        backlog = max(0.0, self.tat - now)
+        return max(0, min(self.burst, int((self.burst * self.emission_interval - backlog)
+                                          / self.emission_interval + 1e-9)))
+
+
+class TokenBucketRateLimiter:
+    """
+    Rate limiter multi-janela com acquire O(1)
+
+    - Cada janela é um GCRA: nenhuma lista de timestamps é mantida
+    - A vaga é reservada de forma síncrona (sem lock) e a espera acontece
+      fora de qualquer seção crítica, então chamadores que cabem no
+      orçamento nunca ficam atrás de quem está aguardando
+    - `pause()` congela o bucket inteiro (ex.: Retry-After de um 429)
+    """
+
+    def __init__(self, windows: Sequence[Tuple[Any, ...]], name: str = "api"):
+        """
+        Args:
+            windows: Lista de (limite, período em segundos[, rajada])
+            name: Nome usado nos logs e métricas
+        """
+        if not windows:
+            raise ValueError("Pelo menos uma janela de rate limit é obrigatória")
+
+        self.name = name
+        self.windows: List[RateWindow] = [
+            RateWindow(
+                name=self._window_name(spec[1]),
+                limit=int(spec[0]),
+                period=float(spec[1]),
+                burst=int(spec[2]) if len(spec) > 2 else None
+            )
+            for spec in windows
+        ]
+        self.paused_until = 0.0
+
+        self.stats = {
+            "requests": 0,
+            "throttled": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "pauses": 0
+        }
+
+    @staticmethod
+    def _window_name(period: float) -> str:
+        if period >= 3600 and period % 3600 == 0:
+            return f"{int(period // 3600)}h"
+        if period >= 60 and period % 60 == 0:
+            return f"{int(period // 60)}min"
+        return f"{period:g}s"
+
+    @staticmethod
+    def _now() -> float:
+        return time.monotonic()
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """
+        Reserva uma vaga em todas as janelas
+
+        Returns:
+            Segundos que o chamador deve aguardar antes de requisitar
+        """
+        now = self._now() if now is None else now
+        wait = max(
+            max(window.wait_time(now) for window in self.windows),
+            self.paused_until - now,
+            0.0
+        )
+
+        # A vaga é consumida no instante em que será usada
+        start_at = now + wait
+        for window in self.windows:
+            window.reserve(start_at)
+
+        self.stats["requests"] += 1
+        if wait > 0:
+            self.stats["throttled"] += 1
+            self.stats["total_wait_seconds"] += wait
+            self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], wait)
+
+        return wait
+
+    async def acquire(self) -> None:
+        """Aguarda até que seja seguro fazer uma requisição"""
+        wait = self.reserve()
+        if wait > 0:
+            logger.debug(f"{self.name} rate limit: aguardando {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+        # Pausa (Retry-After) recebida enquanto aguardava
+        while True:
+            remaining_pause = self.paused_until - self._now()
+            if remaining_pause <= 0:
+                return
+            self.stats["total_wait_seconds"] += remaining_pause
+            await asyncio.sleep(remaining_pause)
+
+    def pause(self, seconds: float) -> None:
+        """Congela o bucket por `seconds` (ex.: header Retry-After)"""
+        until = self._now() + max(0.0, float(seconds))
+        if until > self.paused_until:
+            self.paused_until = until
+            self.stats["pauses"] += 1
+            logger.warning(f"{self.name} rate limit: bucket pausado por {seconds:.1f}s")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Orçamento atual e métricas de espera"""
+        now = self._now()
+        requests = self.stats["requests"]
+        return {
+            "name": self.name,
+            "budget": {
+                window.name: {
+                    "limit": window.limit,
+                    "burst": window.burst,
+                    "remaining": window.remaining(now)
+                }
+                for window in self.windows
+            },
+            "paused_seconds": round(max(0.0, self.paused_until - now), 2),
+            "next_slot_seconds": round(max(
+                max(window.wait_time(now) for window in self.windows),
+                self.paused_until - now,
+                0.0
+            ), 3),
+            "requests": requests,
+            "throttled": self.stats["throttled"],
+            "pauses": self.stats["pauses"],
+            "avg_wait_seconds": round(self.stats["total_wait_seconds"] / max(requests, 1), 3),
+            "max_wait_seconds": round(self.stats["max_wait_seconds"], 3)
+        }
+
+
+def parse_retry_after(value: Optional[str], default: float = 60.0) -> float:
+    """Converte header Retry-After (segundos) com fallback"""
+    try:
+        return max(0.0, float(value)) if value is not None else default
+    except (TypeError, ValueError):
+        return default
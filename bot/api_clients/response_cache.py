@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import json
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..utils.constants import (
+    API_CACHE_MAX_BYTES,
+    API_CACHE_MAX_ENTRIES,
+    API_CACHE_TTL_CLASSES,
+)
+from ..utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+# Instâncias vivas, para monitoramento agregado
+_instances: "weakref.WeakSet[ResponseCache]" = weakref.WeakSet()
+
+# Trechos de endpoint -> classe de TTL (primeira correspondência vence)
+ENDPOINT_TTL_CLASSES: Tuple[Tuple[str, str], ...] = (
+    ("/window/", "live"),
+    ("/details/", "live"),
+    ("getlive", "live"),
+    ("/live", "live"),
+    ("getschedule", "schedule"),
+    ("geteventdetails", "schedule"),
+    ("getcompletedevents", "schedule"),
+    ("/events", "schedule"),
+    ("/matches", "schedule"),
+    ("/games", "schedule"),
+    ("getleagues", "static"),
+    ("getteams", "static"),
+    ("gettournaments", "static"),
+    ("getstandings", "static"),
+    ("/leagues", "static"),
+    ("/teams", "static"),
+    ("/tournaments", "static"),
+)
+
+
+def classify_endpoint(endpoint: str) -> Optional[str]:
+    """Retorna a classe de TTL do endpoint (live/schedule/static) ou None"""
+    endpoint = endpoint.lower()
+    for fragment, ttl_class in ENDPOINT_TTL_CLASSES:
+        if fragment in endpoint:
+            return ttl_class
+    return None
+
+
+def _estimate_size(data: Any) -> int:
+    """Tamanho aproximado da resposta (JSON serializado) quando o corpo não é conhecido"""
+    try:
+        return len(json.dumps(data, default=str, separators=(',', ':')))
+    except (TypeError, ValueError):
+        return len(repr(data))
+
+
+class ResponseCache:
+    """
+    Cache de respostas com LRU, TTL por classe de endpoint e orçamento em bytes
+
+    - Acesso O(1) (OrderedDict); o item usado vai para o fim da fila LRU
+    - Ao exceder o orçamento de bytes ou de entradas, remove os menos usados
+    - TTL por classe: dados ao vivo nunca ficam mais que o TTL "live" em cache,
+      mesmo que o chamador peça um TTL maior
+    """
+
+    def __init__(
+        self,
+        name: str,
+        default_ttl: int = 300,
+        max_bytes: int = API_CACHE_MAX_BYTES,
+        max_entries: int = API_CACHE_MAX_ENTRIES,
+        ttl_classes: Optional[Dict[str, int]] = None
+    ):
+        self.name = name
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl_classes = dict(ttl_classes or API_CACHE_TTL_CLASSES)
+
+        # key -> (data, expires_at, size)
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self.current_bytes = 0
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "rejected": 0
+        }
+
+        _instances.add(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, record=False) is not None
+
+    def resolve_ttl(self, endpoint: Optional[str], ttl: Optional[int]) -> int:
+        """TTL efetivo: classe do endpoint, TTL pedido ou padrão"""
+        ttl_class = classify_endpoint(endpoint) if endpoint else None
+        class_ttl = self.ttl_classes.get(ttl_class) if ttl_class else None
+
+        if class_ttl is None:
+            return ttl or self.default_ttl
+        if ttl_class == "live":
+            return min(ttl or class_ttl, class_ttl)
+        return ttl or class_ttl
+
+    def get(self, key: str, record: bool = True) -> Optional[Any]:
+        """Recupera item do cache se ainda válido"""
+        entry = self._entries.get(key)
+        if entry is None:
+            if record:
+                self.stats["misses"] += 1
+            return None
+
+        data, expires_at, _ = entry
+        if time.time() >= expires_at:
+            self._remove(key)
+            if record:
+                self.stats["expirations"] += 1
+                self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if record:
+            self.stats["hits"] += 1
+        return data
+
+    def set(
+        self,
+        key: str,
+        data: Any,
+        ttl: Optional[int] = None,
+        endpoint: Optional[str] = None,
+        size: Optional[int] = None
+    ) -> None:
+        """
+        Armazena item no cache com TTL da classe do endpoint
+
+        Args:
+            size: Tamanho do corpo da resposta em bytes; quando informado,
+                evita serializar os dados só para medi-los
+        """
+        if size is None:
+            size = _estimate_size(data)
+        if size > self.max_bytes:
+            self.stats["rejected"] += 1
+            logger.debug(f"Cache {self.name}: resposta de {size} bytes excede o orçamento ({key})")
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        expires_at = time.time() + self.resolve_ttl(endpoint, ttl)
+        self._entries[key] = (data, expires_at, size)
+        self.current_bytes += size
+        self._evict()
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def _evict(self) -> None:
+        """Remove itens LRU até caber no orçamento"""
+        while self._entries and (
+            self.current_bytes > self.max_bytes or len(self._entries) > self.max_entries
+        ):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Limpa todo o cache"""
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def cleanup(self) -> int:
+        """Remove itens expirados do cache"""
+        now = time.time()
+        expired_keys = [key for key, (_, expires_at, _) in self._entries.items() if now >= expires_at]
+        for key in expired_keys:
+            self._remove(key)
+        self.stats["expirations"] += len(expired_keys)
+        return len(expired_keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hits, misses, evictions e uso de memória"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "name": self.name,
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / max(lookups, 1) * 100, 2),
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes
+        }
+
+
+def get_response_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Estatísticas de todos os caches vivos, agregadas por nome"""
+    aggregated: Dict[str, Dict[str, Any]] = {}
+
+    for cache in list(_instances):
+        stats = cache.get_stats()
+        totals = aggregated.get(cache.name)
+        if totals is None:
+            aggregated[cache.name] = stats
+            continue
+        for counter in ("hits", "misses", "evictions", "expirations", "rejected",
+                        "entries", "max_entries", "bytes", "max_bytes"):
+            totals[counter] += stats[counter]
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_rate"] = round(totals["hits"] / max(lookups, 1) * 100, 2)
+
+    return aggregated
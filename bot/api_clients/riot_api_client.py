@@ -21,6 +21,9 @@ from ..utils.constants import (
 )
 from ..utils.helpers import normalize_team_name
 from ..utils.logger_config import get_logger
+from .rate_limiter import TokenBucketRateLimiter, parse_retry_after
+from .response_cache import ResponseCache
+from .single_flight import SingleFlight
 
 logger = get_logger(__name__)
 
@@ -34,77 +37,27 @@ class RiotAPIError(Exception):
         self.response_data = response_data
 
 
-class RateLimiter:
+class RateLimiter(TokenBucketRateLimiter):
     """Sistema de rate limiting para respeitar os limites da API da Riot"""
 
-    def __init__(self, requests_per_second: int = 20, requests_per_two_minutes: int = 100):
+    def __init__(
+        self,
+        requests_per_second: int = RIOT_API_RATE_LIMITS["requests_per_second"],
+        requests_per_two_minutes: int = RIOT_API_RATE_LIMITS["requests_per_two_minutes"]
+    ):
         self.requests_per_second = requests_per_second
         self.requests_per_two_minutes = requests_per_two_minutes
-        self.second_window: List[float] = []
-        self.two_minute_window: List[float] = []
-        self._lock = asyncio.Lock()
-
-    async def acquire(self) -> None:
-        """Aguarda até que seja seguro fazer uma requisição"""
-        async with self._lock:
-            now = time.time()
-
-            # Limpa janelas antigas
-            self.second_window = [t for t in self.second_window if now - t < 1.0]
-            self.two_minute_window = [t for t in self.two_minute_window if now - t < 120.0]
-
-            # Verifica se precisa aguardar
-            if len(self.second_window) >= self.requests_per_second:
-                sleep_time = 1.0 - (now - self.second_window[0])
-                if sleep_time > 0:
-                    logger.debug(f"Rate limit: aguardando {sleep_time:.2f}s")
-                    await asyncio.sleep(sleep_time)
-
-            if len(self.two_minute_window) >= self.requests_per_two_minutes:
-                sleep_time = 120.0 - (now - self.two_minute_window[0])
-                if sleep_time > 0:
-                    logger.debug(f"Rate limit: aguardando {sleep_time:.2f}s (janela 2min)")
-                    await asyncio.sleep(sleep_time)
-
-            # Registra a requisição
-            now = time.time()
-            self.second_window.append(now)
-            self.two_minute_window.append(now)
+        super().__init__(
+            [(requests_per_second, 1.0), (requests_per_two_minutes, 120.0)],
+            name="Riot"
+        )
 
 
-class APICache:
-    """Cache inteligente para dados da API com TTL configurável"""
+class APICache(ResponseCache):
+    """Cache da Riot API: LRU + TTL por classe de endpoint com orçamento de memória"""
 
     def __init__(self, default_ttl: int = 300):  # 5 minutos padrão
-        self.cache: Dict[str, Tuple[Any, float]] = {}
-        self.default_ttl = default_ttl
-
-    def get(self, key: str) -> Optional[Any]:
-        """Recupera item do cache se ainda válido"""
-        if key in self.cache:
-            data, expires_at = self.cache[key]
-            if time.time() < expires_at:
-                return data
-            else:
-                del self.cache[key]
-        return None
-
-    def set(self, key: str, data: Any, ttl: Optional[int] = None) -> None:
-        """Armazena item no cache com TTL"""
-        ttl = ttl or self.default_ttl
-        expires_at = time.time() + ttl
-        self.cache[key] = (data, expires_at)
-
-    def clear(self) -> None:
-        """Limpa todo o cache"""
-        self.cache.clear()
-
-    def cleanup(self) -> None:
-        """Remove itens expirados do cache"""
-        now = time.time()
-        expired_keys = [key for key, (_, expires_at) in self.cache.items() if now >= expires_at]
-        for key in expired_keys:
-            del self.cache[key]
+        super().__init__("riot", default_ttl=default_ttl)
 
 
 class RiotAPIClient:
@@ -125,6 +78,7 @@ class RiotAPIClient:
         self.session: Optional[aiohttp.ClientSession] = None
         self.rate_limiter = RateLimiter()
         self.cache = APICache()
+        self.single_flight = SingleFlight("riot")
 
         # Headers padrão conforme documentação
         self.headers = {
@@ -166,18 +120,44 @@ class RiotAPIClient:
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         cache_ttl: Optional[int] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
-        """Faz requisição HTTP com rate limiting e cache"""
+        """
+        Faz requisição HTTP com rate limiting e cache
+
+        use_cache=False ignora o ResponseCache (nem lê nem grava) para
+        consumidores que precisam da resposta mais recente, como o stream
+        de livestats; requisições idênticas simultâneas ainda são agrupadas.
+        """
         if not self.session:
             await self.start_session()
 
-        # Verifica cache primeiro
         cache_key = f"{base_url}:{endpoint}:{json.dumps(params or {}, sort_keys=True)}"
-        cached_data = self.cache.get(cache_key)
-        if cached_data is not None:
-            logger.debug(f"Cache hit para {endpoint}")
-            return cached_data
 
+        # Verifica cache primeiro
+        if use_cache:
+            cached_data = self.cache.get(cache_key)
+            if cached_data is not None:
+                logger.debug(f"Cache hit para {endpoint}")
+                self.single_flight.record_cache_hit()
+                return cached_data
+
+        # Requisições idênticas em andamento compartilham a mesma resposta
+        return await self.single_flight.do(
+            cache_key,
+            lambda: self._fetch(base_url, endpoint, params, cache_key, cache_ttl, use_cache)
+        )
+
+    async def _fetch(
+        self,
+        base_url: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        cache_key: str,
+        cache_ttl: Optional[int],
+        use_cache: bool = True,
+    ) -> Dict[str, Any]:
+        """Executa a requisição HTTP (rate limiting + cache da resposta)"""
         # Rate limiting
         await self.rate_limiter.acquire()
 
@@ -201,16 +181,18 @@ class RiotAPIClient:
 
                 if response.status == 200:
                     # Armazena no cache
-                    self.cache.set(cache_key, response_data, cache_ttl)
+                    if use_cache:
+                        # Corpo já lido pelo json(): tamanho medido sem reserializar
+                        self.cache.set(cache_key, response_data, cache_ttl, endpoint=endpoint,
+                                       size=len(await response.read()))
                     logger.debug(f"Requisição bem-sucedida: {endpoint}")
                     return response_data
 
                 elif response.status == 429:
-                    # Rate limit excedido
-                    retry_after = int(response.headers.get("Retry-After", 60))
-                    logger.warning(f"Rate limit excedido. Aguardando {retry_after}s")
-                    await asyncio.sleep(retry_after)
-                    return await self._make_request(base_url, endpoint, params, cache_ttl)
+                    # Rate limit excedido: pausa o bucket, o retry aguarda no acquire
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    self.rate_limiter.pause(retry_after)
+                    return await self._fetch(base_url, endpoint, params, cache_key, cache_ttl, use_cache)
 
                 elif response.status == 404:
                     logger.warning(f"Recurso não encontrado: {endpoint}")
@@ -228,12 +210,13 @@ class RiotAPIClient:
             logger.error(f"Erro de conexão: {e}")
             raise RiotAPIError(f"Erro de conexão: {e}")
 
-    async def get_live_matches(self, locale: str = "pt-BR") -> List[Dict[str, Any]]:
+    async def get_live_matches(self, locale: str = "pt-BR", fresh: bool = False) -> List[Dict[str, Any]]:
         """
         Busca partidas ao vivo usando endpoint /getLive
         
         Args:
             locale: Locale para dados (padrão pt-BR)
+            fresh: Ignora o cache de respostas (stream de livestats)
             
         Returns:
             Lista de partidas ao vivo (apenas dados reais)
@@ -246,7 +229,8 @@ class RiotAPIClient:
                 self.ESPORTS_API_BASE,
                 endpoint,
                 params,
-                cache_ttl=180  # Cache 3 minutos
+                cache_ttl=180,  # Cache 3 minutos
+                use_cache=not fresh
             )
             
             # Extrai eventos da resposta
@@ -400,13 +384,19 @@ class RiotAPIClient:
             logger.error(f"Erro ao buscar times {team_slugs}: {e}")
             return []
 
-    async def get_live_match_window(self, game_id: int, starting_time: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    async def get_live_match_window(
+        self,
+        game_id: int,
+        starting_time: Optional[str] = None,
+        fresh: bool = False
+    ) -> Optional[Dict[str, Any]]:
         """
         Busca dados ao vivo de uma partida usando endpoint /window/{gameId}
         
         Args:
             game_id: ID do jogo
             starting_time: Tempo de início (RFC3339)
+            fresh: Ignora o cache de respostas (stream de livestats)
             
         Returns:
             Dados da janela ao vivo ou None
@@ -422,7 +412,8 @@ class RiotAPIClient:
                 self.LIVESTATS_API_BASE,
                 endpoint,
                 params,
-                cache_ttl=30  # Cache 30 segundos para dados ao vivo
+                cache_ttl=30,  # Cache 30 segundos para dados ao vivo
+                use_cache=not fresh
             )
             
             if data:
@@ -615,6 +606,10 @@ class RiotAPIClient:
             logger.error(f"Erro ao buscar dados abrangentes ao vivo: {e}")
             return []
 
+    def get_rate_limit_status(self) -> Dict[str, Any]:
+        """Orçamento atual e tempos de espera do rate limiter"""
+        return self.rate_limiter.get_stats()
+
     async def health_check(self) -> bool:
         """
         Verifica se a API está funcionando (apenas dados reais)
@@ -656,6 +651,10 @@ class RiotAPIClient:
         self.cache.cleanup()
         logger.debug("Cache da Riot API limpo")
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hits, misses, evictions e uso de memória do cache"""
+        return self.cache.get_stats()
+
     async def get_match_timeline(self, region: str, match_id: str) -> Optional[Dict[str, Any]]:
         """Busca timeline detalhada de uma partida"""
         try:
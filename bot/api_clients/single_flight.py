@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Dict
+
+from ..utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+# Instâncias vivas, para o PerformanceMonitor agregar os contadores
+_instances: "weakref.WeakSet[SingleFlight]" = weakref.WeakSet()
+
+
+class SingleFlight:
+    """
+    Coalescência de requisições idênticas em andamento
+
+    A primeira chamada para uma chave dispara a requisição em uma task;
+    chamadas concorrentes com a mesma chave aguardam a mesma task em vez
+    de repetir a requisição. A task roda desacoplada de quem a iniciou,
+    então o cancelamento de um chamador não afeta os demais.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+        self.stats = {
+            "requests": 0,
+            "cache_hits": 0,
+            "fetches": 0,
+            "coalesced": 0,
+            "errors": 0
+        }
+
+        _instances.add(self)
+
+    def record_cache_hit(self) -> None:
+        """Registra requisição atendida pelo cache do cliente"""
+        self.stats["requests"] += 1
+        self.stats["cache_hits"] += 1
+
+    async def do(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa `fetch` uma única vez por chave em andamento
+
+        Args:
+            key: Chave da requisição (endpoint + parâmetros)
+            fetch: Fábrica da coroutine que faz a requisição
+        """
+        self.stats["requests"] += 1
+
+        task = self._in_flight.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self.stats["coalesced"] += 1
+            logger.debug(f"{self.name}: requisição coalescida ({key})")
+            return await asyncio.shield(task)
+
+        self.stats["fetches"] += 1
+        task = asyncio.ensure_future(fetch())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done, key=key: self._on_done(key, done))
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        """Remove a task da tabela e contabiliza falhas"""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["errors"] += 1
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores de cache hit e coalescência"""
+        requests = self.stats["requests"]
+        return {
+            **self.stats,
+            "in_flight": self.in_flight,
+            "saved_requests": self.stats["cache_hits"] + self.stats["coalesced"],
+            "coalesce_rate": round(self.stats["coalesced"] / max(requests, 1) * 100, 2)
+        }
+
+
+def get_single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """Agrega os contadores de todas as instâncias vivas por nome de cliente"""
+    aggregated: Dict[str, Dict[str, Any]] = {}
+
+    for instance in list(_instances):
+        totals = aggregated.setdefault(instance.name, {
+            "requests": 0, "cache_hits": 0, "fetches": 0,
+            "coalesced": 0, "errors": 0, "in_flight": 0
+        })
+        for counter, value in instance.stats.items():
+            totals[counter] += value
+        totals["in_flight"] += instance.in_flight
+
+    for totals in aggregated.values():
+        totals["saved_requests"] = totals["cache_hits"] + totals["coalesced"]
+        totals["coalesce_rate"] = round(totals["coalesced"] / max(totals["requests"], 1) * 100, 2)
+
+    return aggregated
@@ -1177,7 +1177,8 @@ class DynamicPredictionSystem:
             "feature_weights": self.feature_weights,
             "cache_status": {
                 "cached_predictions": len(self.predictions_cache),
-                "cache_hit_rate": "Not implemented"
+                "cache_hit_rate": "Not implemented",
+                "composition_memo": self.composition_analyzer.get_memo_stats()
             }
         }
 
@@ -1225,17 +1226,25 @@ class DynamicPredictionSystem:
                     "confidence": 0.3
                 }
             
+            # Patch real do PatchAnalyzer (MatchData não carrega versão), para que
+            # o memo de composições seja invalidado quando o patch muda
+            patch_version = (
+                getattr(match_data, 'patch_version', None)
+                or self.patch_analyzer.current_patch
+                or "14.10"
+            )
+            
             # Análise detalhada de cada composição
             team1_analysis = await self.composition_analyzer.analyze_team_composition(
                 team_picks=team1_composition,
                 enemy_picks=team2_composition,
-                patch_version=getattr(match_data, 'patch_version', '14.10')
+                patch_version=patch_version
             )
             
             team2_analysis = await self.composition_analyzer.analyze_team_composition(
                 team_picks=team2_composition,
                 enemy_picks=team1_composition,
-                patch_version=getattr(match_data, 'patch_version', '14.10')
+                patch_version=patch_version
             )
             
             # Calcula vantagem relativa (Team1 vs Team2)
@@ -1639,7 +1648,8 @@ class DynamicPredictionSystem:
             "feature_weights": self.feature_weights,
             "cache_status": {
                 "cached_predictions": len(self.predictions_cache),
-                "cache_hit_rate": "Not implemented"
+                "cache_hit_rate": "Not implemented",
+                "composition_memo": self.composition_analyzer.get_memo_stats()
             }
         }
 
@@ -1687,17 +1697,25 @@ class DynamicPredictionSystem:
                     "confidence": 0.3
                 }
             
+            # Patch real do PatchAnalyzer (MatchData não carrega versão), para que
+            # o memo de composições seja invalidado quando o patch muda
+            patch_version = (
+                getattr(match_data, 'patch_version', None)
+                or self.patch_analyzer.current_patch
+                or "14.10"
+            )
+            
             # Análise detalhada de cada composição
             team1_analysis = await self.composition_analyzer.analyze_team_composition(
                 team_picks=team1_composition,
                 enemy_picks=team2_composition,
-                patch_version=getattr(match_data, 'patch_version', '14.10')
+                patch_version=patch_version
             )
             
             team2_analysis = await self.composition_analyzer.analyze_team_composition(
                 team_picks=team2_composition,
                 enemy_picks=team1_composition,
-                patch_version=getattr(match_data, 'patch_version', '14.10')
+                patch_version=patch_version
             )
             
             # Calcula vantagem relativa (Team1 vs Team2)
@@ -6,11 +6,43 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Atributos que alteram a resolução de série/game (invalidam o memo)
+MEMO_SENSITIVE_ATTRIBUTES = frozenset({
+    "match_id", "status", "game_number", "raw_data", "game_time_seconds",
+    "serie", "begin_at", "winner", "name", "number_of_game", "serie_game_number"
+})
+
+
+def _series_state(payload: Any) -> Tuple:
+    """Estado de série lido pelas resoluções (status, games, wins, oponentes)"""
+    if not isinstance(payload, dict):
+        return ()
+    
+    games = payload.get('games')
+    games_state = tuple(
+        (game.get('number', game.get('position')), game.get('status'))
+        for game in games if isinstance(game, dict)
+    ) if isinstance(games, list) else ()
+    wins = tuple(
+        payload[key].get('wins') if isinstance(payload.get(key), dict) else None
+        for key in ('opponent1', 'opponent2')
+    )
+    opponents = payload.get('opponents')
+    return (
+        payload.get('status'),
+        games_state,
+        wins,
+        len(opponents) if isinstance(opponents, list) else 0
+    )
+
 
 @dataclass
 class TeamStats:
@@ -240,12 +272,66 @@ class MatchData:
     has_complete_draft: bool = False
     has_live_stats: bool = False
     
+    # Memo de resoluções derivadas (game na série, map id, jogo ativo)
+    _memo: Dict[str, Tuple[Any, Optional[float]]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _memo_fingerprint: Optional[Tuple] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """Inicializa dados calculados após criação"""
         if self.team1_stats and self.team2_stats:
             self.calculate_differences()
             self.determine_favored_team()
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Invalida o memo quando um atributo que afeta a resolução muda"""
+        object.__setattr__(self, name, value)
+        if name in MEMO_SENSITIVE_ATTRIBUTES and "_memo" in self.__dict__:
+            self._memo.clear()
+    
+    def _raw_payload_fingerprint(self) -> Tuple:
+        """
+        Identidade do payload bruto e do estado da série
+        
+        Além de troca/mutação de chaves do raw_data, cobre mudanças internas
+        de status/games/wins no raw_data e no dict `serie` (mutados in-place
+        entre scans sem passar pelo __setattr__).
+        """
+        raw_data = self.raw_data
+        return (
+            id(raw_data),
+            len(raw_data) if raw_data else 0,
+            _series_state(raw_data),
+            _series_state(getattr(self, 'serie', None))
+        )
+    
+    def memoize(self, key: str, compute: Callable[[], T], ttl: Optional[float] = None) -> T:
+        """
+        Retorna valor derivado calculado uma vez por snapshot da partida
+        
+        Args:
+            key: Nome do valor derivado
+            compute: Função que calcula o valor quando não está em cache
+            ttl: Validade em segundos (resoluções que dependem do relógio)
+            
+        Returns:
+            Valor memorizado ou recém-calculado
+        """
+        fingerprint = self._raw_payload_fingerprint()
+        if fingerprint != self._memo_fingerprint:
+            self._memo.clear()
+            self._memo_fingerprint = fingerprint
+        
+        entry = self._memo.get(key)
+        now = time.monotonic()
+        if entry is None or (entry[1] is not None and now >= entry[1]):
+            entry = self._memo[key] = (compute(), now + ttl if ttl is not None else None)
+        return entry[0]
+    
+    def invalidate_memo(self) -> None:
+        """Descarta valores derivados memorizados"""
+        self._memo.clear()
+        self._memo_fingerprint = None
+    
     def calculate_differences(self) -> None:
         """Calcula diferenças entre os times"""
         if not self.team1_stats or not self.team2_stats:
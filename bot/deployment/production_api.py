@@ -24,6 +24,7 @@ from aiohttp.web import Request, Response, WebSocketResponse
 import aiohttp_cors
 
 from .production_manager import ProductionManager
+from ..api_clients.response_cache import get_response_cache_stats
 from ..utils.logger_config import get_logger
 
 logger = get_logger(__name__)
@@ -153,6 +154,7 @@ class ProductionAPI:
         self.app.router.add_get('/api/report/{days}', self._handle_performance_report)
         self.app.router.add_get('/api/predictions', self._handle_predictions_data)
         self.app.router.add_get('/api/metrics/current', self._handle_current_metrics)
+        self.app.router.add_get('/api/cache', self._handle_cache_stats)
         
         # Dashboard web
         self.app.router.add_get('/dashboard', self._handle_dashboard)
@@ -384,6 +386,22 @@ class ProductionAPI:
                 "error": str(e)
             }, status=500)
 
+    async def _handle_cache_stats(self, request: Request) -> Response:
+        """Endpoint: GET /api/cache - Estatísticas dos caches das APIs"""
+        try:
+            return web.json_response({
+                "success": True,
+                "data": get_response_cache_stats(),
+                "timestamp": datetime.now().isoformat()
+            })
+            
+        except Exception as e:
+            logger.error(f"Erro no endpoint /api/cache: {e}")
+            return web.json_response({
+                "success": False,
+                "error": str(e)
+            }, status=500)
+
     async def _handle_dashboard(self, request: Request) -> Response:
         """Endpoint: GET /dashboard - Dashboard web"""
         try:
@@ -590,6 +608,7 @@ class ProductionAPI:
                 {"method": "GET", "path": "/api/report/{{days}}", "description": "Relatório de performance"},
                 {"method": "GET", "path": "/api/predictions", "description": "Dados das predições"},
                 {"method": "GET", "path": "/api/metrics/current", "description": "Métricas atuais"},
+                {"method": "GET", "path": "/api/cache", "description": "Estatísticas do cache das APIs"},
                 {"method": "POST", "path": "/api/restart/{{component}}", "description": "Reiniciar componente"},
                 {"method": "POST", "path": "/api/emergency-recovery", "description": "Recuperação de emergência"},
                 {"method": "WS", "path": "/ws/metrics", "description": "Métricas em tempo real"}
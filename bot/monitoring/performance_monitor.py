@@ -20,6 +20,7 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from ..api_clients.single_flight import get_single_flight_stats
 from ..utils.logger_config import get_logger
 from ..utils.helpers import get_current_timestamp
 
@@ -796,6 +797,10 @@ class PerformanceMonitor:
         except Exception as e:
             logger.error(f"Erro ao carregar dados históricos: {e}")
 
+    def get_api_request_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Cache hits e requisições coalescidas por cliente de API"""
+        return get_single_flight_stats()
+
     def get_live_dashboard_data(self) -> Dict[str, Any]:
         """Retorna dados para dashboard em tempo real"""
         try:
@@ -865,6 +870,9 @@ class PerformanceMonitor:
                     "avg_processing_time": current_metrics.avg_processing_time_ms
                 },
                 
+                # Requisições às APIs (cache + coalescência)
+                "api_requests": self.get_api_request_stats(),
+                
                 # Trend (últimas métricas)
                 "trend": {
                     "win_rate_trend": [m.win_rate_percentage for m in self.system_metrics[-10:]],
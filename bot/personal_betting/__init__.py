@@ -8,15 +8,22 @@ from .bankroll_manager import PersonalBankrollManager, create_default_manager
 from .value_analyzer import ManualValueAnalyzer, create_default_analyzer  
 from .betting_tracker import BettingTracker, create_default_tracker
 from .pre_game_analyzer import PreGameAnalyzer, create_default_pre_game_analyzer
+from .sqlite_store import PersonalBettingStore, migrate_json_to_sqlite
 
 class PersonalBettingSystem:
     """Sistema integrado de apostas pessoais"""
     
-    def __init__(self, initial_bankroll: float = 1000.0):
-        self.bankroll_manager = create_default_manager(initial_bankroll)
-        self.value_analyzer = create_default_analyzer()
-        self.betting_tracker = create_default_tracker()
-        self.pre_game_analyzer = create_default_pre_game_analyzer()
+    def __init__(self, initial_bankroll: float = 1000.0, db_file: str = None):
+        # db_file: usa SQLite (PersonalBettingStore) no lugar dos arquivos JSON
+        self.store = PersonalBettingStore(db_file) if db_file else None
+        self.bankroll_manager = create_default_manager(initial_bankroll, store=self.store)
+        self.value_analyzer = create_default_analyzer(store=self.store)
+        self.betting_tracker = create_default_tracker(
+            bankroll_manager=self.bankroll_manager,
+            value_analyzer=self.value_analyzer,
+            store=self.store
+        )
+        self.pre_game_analyzer = create_default_pre_game_analyzer(store=self.store)
         self.version = "1.4.0"
     
     def get_status(self):
@@ -41,21 +48,32 @@ __all__ = [
     'create_default_tracker',
     'PreGameAnalyzer',
     'create_default_pre_game_analyzer',
+    'PersonalBettingStore',
+    'migrate_json_to_sqlite',
     'PersonalBettingSystem'
 ]
 
-def create_integrated_betting_system(initial_bankroll: float = 1000.0):
+def create_integrated_betting_system(initial_bankroll: float = 1000.0, db_file: str = None):
     """
     Cria sistema integrado completo de apostas LoL
     
+    Args:
+        initial_bankroll: Bankroll inicial
+        db_file: Banco SQLite opcional (padrão: arquivos JSON)
+    
     Returns:
         dict: Sistema completo com todos os componentes integrados
     """
     # Cria componentes individuais
-    bankroll_manager = create_default_manager(initial_bankroll)
-    value_analyzer = create_default_analyzer()
-    betting_tracker = create_default_tracker()
-    pre_game_analyzer = create_default_pre_game_analyzer()
+    store = PersonalBettingStore(db_file) if db_file else None
+    bankroll_manager = create_default_manager(initial_bankroll, store=store)
+    value_analyzer = create_default_analyzer(store=store)
+    betting_tracker = create_default_tracker(
+        bankroll_manager=bankroll_manager,
+        value_analyzer=value_analyzer,
+        store=store
+    )
+    pre_game_analyzer = create_default_pre_game_analyzer(store=store)
     
     # Sistema integrado
     system = {
@@ -63,6 +81,7 @@ def create_integrated_betting_system(initial_bankroll: float = 1000.0):
         'value_analyzer': value_analyzer,
         'betting_tracker': betting_tracker,
         'pre_game_analyzer': pre_game_analyzer,
+        'store': store,
         'version': '1.4.0',
         'features': [
             '💰 Gestão de Bankroll com Kelly Criterion',
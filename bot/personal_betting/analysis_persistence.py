@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Persistência write-behind das análises pré-jogo
+Lotes de análises sujas gravados fora do event loop + arquivo gzip com retenção
+"""
+
+import asyncio
+import atexit
+import gzip
+import json
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Logger local simples
+class SimpleLogger:
+    def info(self, msg): print(f"INFO: {msg}")
+    def error(self, msg): print(f"ERROR: {msg}")
+    def warning(self, msg): print(f"WARNING: {msg}")
+
+logger = SimpleLogger()
+
+FLUSH_INTERVAL_SECONDS = 2.0      # atraso máximo até gravar uma análise
+FLUSH_BATCH_SIZE = 50             # lote que dispara gravação imediata
+ANALYSIS_RETENTION_DAYS = 30      # análises mantidas em memória/armazenamento ativo
+ARCHIVE_RETENTION_DAYS = 365      # segmentos gzip mais antigos são apagados
+
+# sink(sujas, arquivadas, ativas): ativas só vem preenchido quando é preciso compactar
+AnalysisSink = Callable[[List[Dict[str, Any]], List[Dict[str, Any]], Optional[List[Dict[str, Any]]]], None]
+
+
+class AnalysisArchive:
+    """
+    Segmentos mensais gzip (JSONL) com análises antigas
+
+    Cada arquivamento anexa um novo membro gzip ao segmento do mês
+    (formato válido para leitura contínua); segmentos além da retenção
+    são removidos inteiros.
+    """
+
+    def __init__(self, archive_dir: str, retention_days: int = ARCHIVE_RETENTION_DAYS):
+        self.archive_dir = archive_dir
+        self.retention_days = retention_days
+
+    def _segment_path(self, month: str) -> str:
+        return os.path.join(self.archive_dir, f"analyses-{month}.jsonl.gz")
+
+    def segments(self) -> List[str]:
+        """Segmentos existentes em ordem cronológica"""
+        if not os.path.isdir(self.archive_dir):
+            return []
+        return sorted(
+            os.path.join(self.archive_dir, name) for name in os.listdir(self.archive_dir)
+            if name.startswith("analyses-") and name.endswith(".jsonl.gz")
+        )
+
+    def append(self, analyses: List[Dict[str, Any]]) -> int:
+        """Anexa análises serializadas aos segmentos dos seus meses"""
+        if not analyses:
+            return 0
+        os.makedirs(self.archive_dir, exist_ok=True)
+
+        by_month: Dict[str, List[str]] = {}
+        for analysis in analyses:
+            by_month.setdefault(analysis["date"][:7], []).append(
+                json.dumps(analysis, ensure_ascii=False)
+            )
+
+        for month, lines in by_month.items():
+            with gzip.open(self._segment_path(month), "at", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        return len(analyses)
+
+    def iter_analyses(self, since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Lê análises arquivadas (opcionalmente só a partir de uma data ISO)"""
+        for path in self.segments():
+            month = os.path.basename(path)[len("analyses-"):-len(".jsonl.gz")]
+            if since and month < since[:7]:
+                continue
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        analysis = json.loads(line)
+                        if not since or analysis["date"] >= since:
+                            yield analysis
+            except (EOFError, OSError, json.JSONDecodeError) as e:
+                # Membro final truncado (crash durante o append)
+                logger.warning(f"Segmento de arquivo incompleto ignorado ({path}): {e}")
+
+    def prune(self, now: Optional[datetime] = None) -> List[str]:
+        """Remove segmentos de meses totalmente fora da retenção"""
+        cutoff_month = ((now or datetime.now()) - timedelta(days=self.retention_days)).strftime("%Y-%m")
+        removed = []
+        for path in self.segments():
+            month = os.path.basename(path)[len("analyses-"):-len(".jsonl.gz")]
+            if month < cutoff_month:
+                os.remove(path)
+                removed.append(path)
+        if removed:
+            logger.info(f"Arquivo de análises: {len(removed)} segmento(s) removido(s) pela retenção")
+        return removed
+
+
+# Writers abertos: um único hook de saída grava o pendente de todos (sem manter vivos os fechados)
+_OPEN_WRITERS: "weakref.WeakSet[AnalysisWriteBehind]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_writers() -> None:
+    for writer in list(_OPEN_WRITERS):
+        writer.close()
+
+
+class AnalysisWriteBehind:
+    """
+    Buffer write-behind de análises
+
+    - mark_dirty()/mark_archived() só atualizam memória (O(1) por análise)
+    - Um timer em thread daemon grava o lote após `flush_interval`
+      (ou imediatamente ao atingir `max_batch`), fora do event loop
+    - flush_async() permite aguardar a gravação a partir de código async
+    - Mantém o espelho das análises ativas para compactações
+    """
+
+    def __init__(self, sink: AnalysisSink,
+                 flush_interval: float = FLUSH_INTERVAL_SECONDS,
+                 max_batch: int = FLUSH_BATCH_SIZE):
+        self.sink = sink
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self.active: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._dirty: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._archived: List[Dict[str, Any]] = []
+        self._compact = False
+
+        self._lock = threading.Lock()        # estado em memória
+        self._flush_lock = threading.Lock()  # uma gravação por vez
+        self._timer: Optional[threading.Timer] = None
+        self._closed = False
+
+        _OPEN_WRITERS.add(self)
+
+    @property
+    def pending(self) -> int:
+        return len(self._dirty) + len(self._archived)
+
+    def load(self, records: List[Dict[str, Any]]) -> None:
+        """Registra análises já persistidas (não marca como sujas)"""
+        with self._lock:
+            for record in records:
+                self.active[record["id"]] = record
+
+    def mark_dirty(self, record_id: str, record: Dict[str, Any]) -> None:
+        """Agenda gravação de uma análise serializada"""
+        with self._lock:
+            self.active[record_id] = record
+            self._dirty[record_id] = record
+        self._schedule()
+
+    def mark_archived(self, record_ids: List[str]) -> None:
+        """Move análises do armazenamento ativo para o arquivo"""
+        with self._lock:
+            for record_id in record_ids:
+                record = self.active.pop(record_id, None)
+                self._dirty.pop(record_id, None)
+                if record is not None:
+                    self._archived.append(record)
+        self._schedule()
+
+    def request_compaction(self) -> None:
+        """Força reescrita do armazenamento ativo no próximo flush"""
+        with self._lock:
+            self._compact = True
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._closed:
+            self.flush()
+            return
+
+        with self._lock:
+            immediate = len(self._dirty) + len(self._archived) >= self.max_batch
+            if self._timer is not None:
+                if not immediate:
+                    return
+                self._timer.cancel()
+
+            self._start_timer(0 if immediate else self.flush_interval)
+
+    def _start_timer(self, delay: float) -> None:
+        """Arma o timer de gravação (chamar com self._lock)"""
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self) -> int:
+        """Grava o lote pendente (bloqueante; chamado pelo timer ou no shutdown)"""
+        with self._flush_lock:
+            with self._lock:
+                self._timer = None
+                dirty = list(self._dirty.values())
+                archived = self._archived
+                compact = self._compact or bool(archived)
+                active = list(self.active.values()) if compact else None
+
+                self._dirty.clear()
+                self._archived = []
+                self._compact = False
+
+            if not dirty and not archived and not compact:
+                return 0
+
+            try:
+                self.sink(dirty, archived, active)
+            except Exception as e:
+                logger.error(f"Erro ao gravar análises (lote será refeito): {e}")
+                with self._lock:
+                    for record in dirty:
+                        self._dirty.setdefault(record["id"], record)
+                    self._archived = archived + self._archived
+                    self._compact = self._compact or compact
+                    # Rearma o timer: sem isso o lote só seria refeito no próximo mark_*
+                    if not self._closed and self._timer is None:
+                        self._start_timer(self.flush_interval)
+                return 0
+
+            return len(dirty) + len(archived)
+
+    async def flush_async(self) -> int:
+        """Grava o lote pendente em thread do executor, sem bloquear o loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+    def close(self) -> None:
+        """Cancela o timer e grava o que estiver pendente"""
+        _OPEN_WRITERS.discard(self)
+        with self._lock:
+            self._closed = True
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self.flush()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Journal append-only para o Personal Bankroll Manager
+Cada evento de aposta vira uma linha JSON; snapshots periódicos compactam o journal
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+# Logger local simples para evitar dependências
+class SimpleLogger:
+    def info(self, msg): print(f"INFO: {msg}")
+    def error(self, msg): print(f"ERROR: {msg}")
+    def warning(self, msg): print(f"WARNING: {msg}")
+
+logger = SimpleLogger()
+
+# Eventos no journal antes de compactar em um novo snapshot
+JOURNAL_COMPACT_EVERY = 200
+
+
+class BankrollJournal:
+    """
+    Armazenamento snapshot + journal
+
+    - Escrita O(1): cada evento é uma linha anexada ao journal (com fsync)
+    - Snapshot gravado em arquivo temporário + os.replace (atômico)
+    - Cada evento tem número de sequência; o snapshot guarda o último
+      aplicado, então um crash entre snapshot e truncamento do journal
+      não reaplica eventos
+    - Linha final truncada por crash é descartada (e cortada do arquivo);
+      linhas corrompidas no meio são puladas sem apagar as seguintes
+    """
+
+    def __init__(self, snapshot_file: str, journal_file: Optional[str] = None,
+                 compact_every: int = JOURNAL_COMPACT_EVERY):
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file or f"{os.path.splitext(snapshot_file)[0]}.journal.jsonl"
+        self.compact_every = compact_every
+
+        self.last_seq = 0
+        self.events_since_snapshot = 0
+
+    def load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Carrega snapshot e eventos do journal posteriores a ele
+
+        Returns:
+            (snapshot ou None, eventos a reaplicar em ordem)
+        """
+        snapshot = None
+        if os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+
+        snapshot_seq = int((snapshot or {}).get('journal_seq', 0))
+        self.last_seq = snapshot_seq
+
+        events = []
+        if os.path.exists(self.journal_file):
+            valid_size = 0
+            with open(self.journal_file, 'rb') as f:
+                for line_number, raw_line in enumerate(f, 1):
+                    if not raw_line.endswith(b"\n"):
+                        # Última linha sem quebra: escrita interrompida
+                        if raw_line.strip():
+                            logger.warning(f"Journal: linha final {line_number} incompleta descartada")
+                        break
+
+                    valid_size += len(raw_line)
+                    line = raw_line.strip()
+                    if not line:
+                        continue
+                    try:
+                        event = json.loads(line.decode('utf-8'))
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        event = None
+                    if not isinstance(event, dict):
+                        # Linha completa mas ilegível: pula sem descartar o resto do journal
+                        logger.warning(f"Journal: linha {line_number} corrompida ignorada")
+                        continue
+
+                    seq = int(event.get('seq', 0))
+                    if seq <= snapshot_seq:
+                        continue
+                    events.append(event)
+                    self.last_seq = max(self.last_seq, seq)
+
+            # Remove só a cauda incompleta para não contaminar os próximos appends
+            if valid_size < os.path.getsize(self.journal_file):
+                with open(self.journal_file, 'r+b') as f:
+                    f.truncate(valid_size)
+
+        self.events_since_snapshot = len(events)
+        return snapshot, events
+
+    def append(self, event: Dict[str, Any]) -> bool:
+        """
+        Anexa evento ao journal
+
+        Returns:
+            True se já é hora de compactar em um snapshot
+        """
+        self.last_seq += 1
+        record = {'seq': self.last_seq, **event}
+
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.events_since_snapshot += 1
+        return self.events_since_snapshot >= self.compact_every
+
+    def write_snapshot(self, data: Dict[str, Any]) -> None:
+        """Grava snapshot atomicamente e trunca o journal"""
+        data = {**data, 'journal_seq': self.last_seq}
+        tmp_file = f"{self.snapshot_file}.tmp"
+
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.snapshot_file)
+
+        # Eventos já incorporados ao snapshot
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, 'w', encoding='utf-8'):
+                pass
+        self.events_since_snapshot = 0
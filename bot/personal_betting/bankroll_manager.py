@@ -7,10 +7,15 @@ Sistema completo de gestão financeira pessoal
 import json
 import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from dataclasses import dataclass, asdict
 from enum import Enum
 
+from .bankroll_journal import BankrollJournal
+from .bet_columns import NUMPY_AVAILABLE, BetColumns
+from .equity_curve import EquityCurve
+from .sqlite_store import PersonalBettingStore
+
 # Logger local simples para evitar dependências
 class SimpleLogger:
     def info(self, msg): print(f"INFO: {msg}")
@@ -74,8 +79,10 @@ class BankrollSettings:
 class PersonalBankrollManager:
     """Sistema de Gestão de Bankroll Pessoal"""
     
-    def __init__(self, data_file: str = "bot/data/personal_betting/bankroll_data.json"):
+    def __init__(self, data_file: str = "bot/data/personal_betting/bankroll_data.json",
+                 store: Optional[PersonalBettingStore] = None):
         self.data_file = data_file
+        self.store = store
         self.data_dir = os.path.dirname(data_file)
         
         # Cria diretório se não existir
@@ -87,9 +94,26 @@ class PersonalBankrollManager:
             current_bankroll=1000.0
         )
         
-        # Lista de apostas
+        # Lista de apostas (ordem cronológica)
         self.bets: List[PersonalBet] = []
         
+        # Índices em memória, mantidos em sincronia com self.bets
+        self._bets_by_id: Dict[str, PersonalBet] = {}
+        self._pending_bets: Dict[str, PersonalBet] = {}  # conjunto ordenado de pendentes
+        self._pending_staked_by_day: Dict[str, float] = {}  # "YYYY-MM-DD" -> valor pendente
+        
+        # Colunas NumPy para análises vetorizadas (None sem NumPy)
+        self.columns: Optional[BetColumns] = BetColumns() if NUMPY_AVAILABLE else None
+        
+        # Bankroll após cada evento (pico, drawdown, gráficos)
+        self.equity = EquityCurve()
+        
+        # Callbacks (event_type, bet) notificados em place/resolve
+        self._listeners: List[Callable[[str, PersonalBet], None]] = []
+        
+        # Snapshot (data_file) + journal append-only de eventos (backend JSON)
+        self.journal = BankrollJournal(data_file)
+        
         # Carrega dados existentes
         self._load_data()
         
@@ -106,7 +130,8 @@ class PersonalBankrollManager:
                     if hasattr(self.settings, key):
                         setattr(self.settings, key, value)
             
-            self._save_data()
+            self._append_event({"type": "settings", "settings": asdict(self.settings)})
+            self.equity.reset(initial_amount)
             
             return {
                 "success": True,
@@ -200,10 +225,11 @@ class PersonalBankrollManager:
                 return {"success": False, "error": "Valor excede bankroll atual"}
             
             # Cria aposta
-            bet_id = f"bet_{int(datetime.now().timestamp())}"
+            now = datetime.now()
+            bet_id = self._generate_bet_id(now)
             bet = PersonalBet(
                 id=bet_id,
-                date=datetime.now().isoformat(),
+                date=now.isoformat(),
                 team=team,
                 opponent=opponent,
                 league=league,
@@ -217,13 +243,19 @@ class PersonalBankrollManager:
             )
             
             # Adiciona à lista
-            self.bets.append(bet)
+            self._add_bet(bet)
             
             # Atualiza bankroll disponível
             self.settings.current_bankroll -= amount
+            self.equity.record(self.settings.current_bankroll, now.timestamp())
             
-            # Salva dados
-            self._save_data()
+            # Registra evento
+            self._append_event({
+                "type": "bet_placed",
+                "bet": asdict(bet),
+                "current_bankroll": self.settings.current_bankroll
+            })
+            self._notify_listeners("bet_placed", bet)
             
             logger.info(f"Aposta registrada: {team} vs {opponent} - R${amount:.2f} @ {odds}")
             
@@ -242,11 +274,7 @@ class PersonalBankrollManager:
         """Resolve uma aposta"""
         try:
             # Encontra a aposta
-            bet = None
-            for b in self.bets:
-                if b.id == bet_id:
-                    bet = b
-                    break
+            bet = self._bets_by_id.get(bet_id)
             
             if not bet:
                 return {"success": False, "error": "Aposta não encontrada"}
@@ -255,6 +283,7 @@ class PersonalBankrollManager:
                 return {"success": False, "error": "Aposta já foi resolvida"}
             
             # Atualiza aposta
+            self._release_pending(bet)
             bet.status = "won" if won else "lost"
             bet.resolved_date = datetime.now().isoformat()
             bet.notes = notes
@@ -269,8 +298,22 @@ class PersonalBankrollManager:
                 bet.result = "LOSS"
                 # Valor já foi descontado, não retorna nada
             
-            # Salva dados
-            self._save_data()
+            if self.columns is not None:
+                self.columns.update(bet)
+            self.equity.record(self.settings.current_bankroll)
+            
+            # Registra evento
+            self._append_event({
+                "type": "bet_resolved",
+                "bet_id": bet.id,
+                "status": bet.status,
+                "result": bet.result,
+                "profit": bet.profit,
+                "resolved_date": bet.resolved_date,
+                "notes": bet.notes,
+                "current_bankroll": self.settings.current_bankroll
+            })
+            self._notify_listeners("bet_resolved", bet)
             
             result_msg = "VITÓRIA" if won else "DERROTA"
             logger.info(f"Aposta resolvida: {bet.team} - {result_msg} - Lucro: R${bet.profit:.2f}")
@@ -291,34 +334,27 @@ class PersonalBankrollManager:
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            # Filtra apostas do período
-            period_bets = []
-            for bet in self.bets:
-                bet_date = datetime.fromisoformat(bet.date)
-                if bet_date >= cutoff_date and bet.status != "pending":
-                    period_bets.append(bet)
+            totals = self._period_totals(cutoff_date)
             
-            if not period_bets:
+            if not totals:
                 return {"message": f"Nenhuma aposta resolvida nos últimos {days} dias", "total_bets": 0}
             
             # Cálculos básicos
-            total_bets = len(period_bets)
-            won_bets = [bet for bet in period_bets if bet.status == "won"]
-            
-            win_rate = len(won_bets) / total_bets * 100
-            total_staked = sum(bet.amount for bet in period_bets)
-            total_profit = sum(bet.profit for bet in period_bets)
+            total_bets = totals["total_bets"]
+            won_count = totals["won_bets"]
+            total_staked = totals["total_staked"]
+            total_profit = totals["total_profit"]
+            best_bet = totals["best_bet"]
+            worst_bet = totals["worst_bet"]
+            
+            win_rate = won_count / total_bets * 100
             roi = (total_profit / total_staked * 100) if total_staked > 0 else 0
             
-            # Melhor e pior aposta
-            best_bet = max(period_bets, key=lambda x: x.profit)
-            worst_bet = min(period_bets, key=lambda x: x.profit)
-            
             return {
                 "period_days": days,
                 "total_bets": total_bets,
-                "won_bets": len(won_bets),
-                "lost_bets": total_bets - len(won_bets),
+                "won_bets": won_count,
+                "lost_bets": total_bets - won_count,
                 "win_rate": round(win_rate, 2),
                 "total_staked": round(total_staked, 2),
                 "total_profit": round(total_profit, 2),
@@ -341,6 +377,31 @@ class PersonalBankrollManager:
             logger.error(f"Erro ao calcular estatísticas: {e}")
             return {"error": str(e)}
     
+    def _period_totals(self, cutoff_date: datetime) -> Optional[Dict]:
+        """Totais das apostas resolvidas desde a data (None se não houver)"""
+        if self.columns is not None:
+            # Máscaras vetorizadas sobre as colunas NumPy
+            totals = self.columns.performance_stats(cutoff_date)
+            if not totals:
+                return None
+            totals["best_bet"] = self.bets[totals.pop("best_row")]
+            totals["worst_bet"] = self.bets[totals.pop("worst_row")]
+            return totals
+        
+        period_bets = self.get_bets_since(cutoff_date, resolved_only=True)
+        if not period_bets:
+            return None
+        
+        return {
+            "total_bets": len(period_bets),
+            "won_bets": len([bet for bet in period_bets if bet.status == "won"]),
+            "total_staked": sum(bet.amount for bet in period_bets),
+            "total_profit": sum(bet.profit for bet in period_bets),
+            # Melhor e pior aposta
+            "best_bet": max(period_bets, key=lambda x: x.profit),
+            "worst_bet": min(period_bets, key=lambda x: x.profit)
+        }
+    
     def get_daily_limit(self) -> float:
         """Retorna limite diário de apostas"""
         return self.settings.current_bankroll * (self.settings.daily_limit_percentage / 100)
@@ -351,21 +412,30 @@ class PersonalBankrollManager:
     
     def get_daily_remaining_limit(self) -> float:
         """Retorna limite diário restante"""
-        today = datetime.now().date()
-        used_today = 0
-        
-        for bet in self.bets:
-            bet_date = datetime.fromisoformat(bet.date).date()
-            if bet_date == today and bet.status == "pending":
-                used_today += bet.amount
+        today = datetime.now().date().isoformat()
+        used_today = self._pending_staked_by_day.get(today, 0.0)
         
         daily_limit = self.get_daily_limit()
         return max(0, daily_limit - used_today)
     
     def get_pending_bets(self) -> List[Dict]:
         """Retorna apostas pendentes"""
-        pending = [bet for bet in self.bets if bet.status == "pending"]
-        return [bet.__dict__ for bet in pending]
+        return [bet.__dict__ for bet in self._pending_bets.values()]
+    
+    def get_bets_since(self, cutoff_date: datetime, resolved_only: bool = False) -> List[PersonalBet]:
+        """Apostas a partir de uma data (SQL no backend SQLite)"""
+        if self.store:
+            return [
+                PersonalBet(**bet_data)
+                for bet_data in self.store.get_bets_since(cutoff_date.isoformat(), resolved_only)
+            ]
+        
+        # Datas ISO comparadas como texto, sem parse por aposta
+        cutoff = cutoff_date.isoformat()
+        return [
+            bet for bet in self.bets
+            if bet.date >= cutoff and not (resolved_only and bet.status == "pending")
+        ]
     
     def generate_report(self) -> str:
         """Gera relatório completo formatado"""
@@ -410,6 +480,54 @@ class PersonalBankrollManager:
    Apostas Pendentes: {len(self.get_pending_bets())}
 """
     
+    def add_listener(self, listener: Callable[[str, PersonalBet], None]) -> None:
+        """Registra callback chamado com ("bet_placed" | "bet_resolved", aposta)"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[str, PersonalBet], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def _notify_listeners(self, event_type: str, bet: PersonalBet) -> None:
+        for listener in self._listeners:
+            try:
+                listener(event_type, bet)
+            except Exception as e:
+                logger.error(f"Erro em listener de apostas: {e}")
+    
+    def _generate_bet_id(self, now: datetime) -> str:
+        """ID único mesmo para apostas registradas no mesmo segundo"""
+        base_id = f"bet_{int(now.timestamp())}"
+        bet_id = base_id
+        suffix = 2
+        while bet_id in self._bets_by_id:
+            bet_id = f"{base_id}_{suffix}"
+            suffix += 1
+        return bet_id
+    
+    def _add_bet(self, bet: PersonalBet) -> None:
+        """Adiciona aposta à lista e aos índices"""
+        self.bets.append(bet)
+        self._bets_by_id[bet.id] = bet
+        if self.columns is not None:
+            self.columns.append(bet)
+        if bet.status == "pending":
+            self._pending_bets[bet.id] = bet
+            day = bet.date[:10]
+            self._pending_staked_by_day[day] = self._pending_staked_by_day.get(day, 0.0) + bet.amount
+    
+    def _release_pending(self, bet: PersonalBet) -> None:
+        """Remove aposta dos índices de pendentes (idempotente)"""
+        if self._pending_bets.pop(bet.id, None) is None:
+            return
+        day = bet.date[:10]
+        remaining = self._pending_staked_by_day.get(day, 0.0) - bet.amount
+        if remaining > 1e-9:
+            self._pending_staked_by_day[day] = remaining
+        else:
+            self._pending_staked_by_day.pop(day, None)
+    
     def _determine_risk_level(self, amount: float) -> str:
         """Determina nível de risco"""
         percentage = (amount / self.settings.current_bankroll) * 100
@@ -442,49 +560,136 @@ class PersonalBankrollManager:
         return warnings
     
     def _load_data(self):
-        """Carrega dados do arquivo"""
+        """Carrega snapshot e reaplica os eventos do journal"""
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
+            if self.store:
+                self._load_from_store()
+                self._rebuild_equity()
+                return
+            
+            data, events = self.journal.load()
+            
+            if data:
                 # Carrega configurações
                 if 'settings' in data:
-                    settings_data = data['settings']
-                    for key, value in settings_data.items():
-                        if hasattr(self.settings, key):
-                            setattr(self.settings, key, value)
+                    self._apply_settings(data['settings'])
                 
                 # Carrega apostas
                 if 'bets' in data:
                     for bet_data in data['bets']:
-                        bet = PersonalBet(**bet_data)
-                        self.bets.append(bet)
-                
-                logger.info(f"Dados carregados: {len(self.bets)} apostas")
+                        self._add_bet(PersonalBet(**bet_data))
+            
+            for event in events:
+                self._apply_event(event)
+            self._rebuild_equity()
+            
+            if data or events:
+                logger.info(f"Dados carregados: {len(self.bets)} apostas ({len(events)} eventos do journal)")
+            
+            if events and self.journal.events_since_snapshot >= self.journal.compact_every:
+                self._save_data()
         
         except Exception as e:
             logger.warning(f"Erro ao carregar dados: {e}")
     
+    def _rebuild_equity(self) -> None:
+        """Reconstrói a curva de capital a partir do histórico carregado"""
+        self.equity = EquityCurve.from_bets(self.settings.initial_bankroll, self.bets)
+        
+        # Ajustes manuais do bankroll (fora das apostas) entram como ponto final
+        if abs(self.equity.current - self.settings.current_bankroll) > 0.005:
+            self.equity.record(self.settings.current_bankroll)
+    
+    def _load_from_store(self) -> None:
+        """Carrega configurações e apostas do SQLite"""
+        settings_data = self.store.load_settings()
+        if settings_data:
+            self._apply_settings(settings_data)
+        
+        for bet_data in self.store.load_bets():
+            self._add_bet(PersonalBet(**bet_data))
+        if self.bets:
+            logger.info(f"Dados carregados do SQLite: {len(self.bets)} apostas")
+    
+    def _apply_settings(self, settings_data: Dict) -> None:
+        """Aplica configurações salvas"""
+        for key, value in settings_data.items():
+            if hasattr(self.settings, key):
+                setattr(self.settings, key, value)
+    
+    def _apply_event(self, event: Dict) -> None:
+        """Reaplica um evento do journal"""
+        event_type = event.get("type")
+        
+        if event_type == "settings":
+            self._apply_settings(event.get("settings", {}))
+        
+        elif event_type == "bet_placed":
+            self._add_bet(PersonalBet(**event["bet"]))
+            self.settings.current_bankroll = event["current_bankroll"]
+        
+        elif event_type == "bet_resolved":
+            bet = self._bets_by_id.get(event["bet_id"])
+            if bet:
+                self._release_pending(bet)
+                for key in ("status", "result", "profit", "resolved_date", "notes"):
+                    setattr(bet, key, event.get(key))
+                if self.columns is not None:
+                    self.columns.update(bet)
+            self.settings.current_bankroll = event["current_bankroll"]
+        
+        else:
+            logger.warning(f"Evento desconhecido no journal: {event_type}")
+    
+    def _append_event(self, event: Dict) -> None:
+        """Anexa evento ao journal (O(1)); compacta periodicamente"""
+        try:
+            if self.store:
+                self._persist_event_to_store(event)
+                return
+            
+            if self.journal.append(event):
+                self._save_data()
+        except Exception as e:
+            logger.error(f"Erro ao registrar evento no journal: {e}")
+    
+    def _persist_event_to_store(self, event: Dict) -> None:
+        """Grava no SQLite apenas a linha afetada pelo evento"""
+        settings = asdict(self.settings)
+        
+        if event["type"] == "bet_placed":
+            self.store.save_bet_and_settings(event["bet"], settings)
+        elif event["type"] == "bet_resolved":
+            bet = self._bets_by_id.get(event["bet_id"])
+            if bet:
+                self.store.save_bet_and_settings(asdict(bet), settings)
+        else:
+            self.store.save_settings(settings)
+    
     def _save_data(self):
-        """Salva dados no arquivo"""
+        """Compacta o estado atual em um snapshot (escrita atômica)"""
         try:
+            if self.store:
+                self.store.save_settings(asdict(self.settings))
+                self.store.upsert_bets([asdict(bet) for bet in self.bets])
+                return
+            
             data = {
                 'settings': self.settings.__dict__,
                 'bets': [bet.__dict__ for bet in self.bets],
                 'last_updated': datetime.now().isoformat()
             }
             
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self.journal.write_snapshot(data)
                 
         except Exception as e:
             logger.error(f"Erro ao salvar dados: {e}")
 
 
-def create_default_manager(initial_bankroll: float = 1000.0) -> PersonalBankrollManager:
+def create_default_manager(initial_bankroll: float = 1000.0,
+                           store: Optional[PersonalBettingStore] = None) -> PersonalBankrollManager:
     """Cria gerenciador com configurações padrão"""
-    manager = PersonalBankrollManager()
+    manager = PersonalBankrollManager(store=store)
     manager.setup_bankroll(initial_bankroll)
     return manager
 
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Histórico de apostas em colunas NumPy
+Estatísticas por período e breakdowns de padrões (dia da semana, faixa de
+odds, tamanho da aposta, liga) como máscaras/groupby vetorizados
+"""
+
+import calendar
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+STATUS_PENDING = 0
+STATUS_WON = 1
+STATUS_LOST = 2
+STATUS_CODES = {"pending": STATUS_PENDING, "won": STATUS_WON, "lost": STATUS_LOST}
+
+# Faixas de odds usadas na análise de padrões (limite superior inclusivo)
+ODDS_RANGES = (
+    ("1.00-1.50", 1.50),
+    ("1.51-2.00", 2.00),
+    ("2.01-3.00", 3.00),
+    ("3.01+", float("inf")),
+)
+
+_EPOCH = datetime(1970, 1, 1)
+_SECONDS_PER_DAY = 86400.0
+
+
+def to_local_seconds(moment: datetime) -> float:
+    """Segundos desde 1970 no relógio local (datas ISO sem timezone)"""
+    return (moment - _EPOCH).total_seconds()
+
+
+class BetColumns:
+    """
+    Colunas paralelas do histórico de apostas
+
+    A linha i corresponde a bankroll_manager.bets[i]. Append é O(1)
+    amortizado (capacidade dobra) e a resolução atualiza a linha in-place.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy não está instalado")
+
+        self.size = 0
+        self._allocate(capacity)
+        self._sorted = True  # timestamps em ordem crescente (permite busca binária)
+
+        self._rows: Dict[str, int] = {}
+        self.leagues: List[str] = []  # código -> nome da liga
+        self._league_codes: Dict[str, int] = {}
+
+    def _allocate(self, capacity: int) -> None:
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._odds = np.zeros(capacity, dtype=np.float64)
+        self._stakes = np.zeros(capacity, dtype=np.float64)
+        self._profit = np.zeros(capacity, dtype=np.float64)
+        self._status = np.zeros(capacity, dtype=np.int8)
+        self._league = np.zeros(capacity, dtype=np.int32)
+
+    def _columns(self) -> tuple:
+        return (self._timestamps, self._odds, self._stakes, self._profit, self._status, self._league)
+
+    def _grow(self) -> None:
+        old = self._columns()
+        self._allocate(max(1024, len(self._timestamps) * 2))
+        for new_column, old_column in zip(self._columns(), old):
+            new_column[:self.size] = old_column[:self.size]
+
+    # Views das linhas preenchidas
+    @property
+    def timestamps(self):
+        return self._timestamps[:self.size]
+
+    @property
+    def odds(self):
+        return self._odds[:self.size]
+
+    @property
+    def stakes(self):
+        return self._stakes[:self.size]
+
+    @property
+    def profit(self):
+        return self._profit[:self.size]
+
+    @property
+    def status(self):
+        return self._status[:self.size]
+
+    @property
+    def league_codes(self):
+        return self._league[:self.size]
+
+    def league_code(self, league: str) -> int:
+        """Código inteiro da liga (registra ligas novas)"""
+        code = self._league_codes.get(league)
+        if code is None:
+            code = self._league_codes[league] = len(self.leagues)
+            self.leagues.append(league)
+        return code
+
+    def rebuild(self, bets: Iterable[Any]) -> None:
+        """Recria as colunas a partir do histórico completo"""
+        self.size = 0
+        self._sorted = True
+        self._rows.clear()
+        self.leagues.clear()
+        self._league_codes.clear()
+        for bet in bets:
+            self.append(bet)
+
+    def append(self, bet) -> None:
+        if self.size == len(self._timestamps):
+            self._grow()
+
+        row = self.size
+        timestamp = to_local_seconds(datetime.fromisoformat(bet.date))
+        if row and timestamp < self._timestamps[row - 1]:
+            self._sorted = False
+        self._timestamps[row] = timestamp
+        self._odds[row] = bet.odds
+        self._stakes[row] = bet.amount
+        self._league[row] = self.league_code(bet.league)
+        self._rows[bet.id] = row
+        self.size += 1
+        self.update(bet)
+
+    def update(self, bet) -> None:
+        """Sincroniza status e lucro da linha da aposta"""
+        row = self._rows.get(bet.id)
+        if row is None:
+            return
+        self._status[row] = STATUS_CODES.get(bet.status, STATUS_PENDING)
+        self._profit[row] = bet.profit if bet.profit is not None else 0.0
+
+    def window(self, since: datetime, resolved_only: bool = False):
+        """Índices das linhas a partir de `since` (busca binária nos timestamps)"""
+        cutoff = to_local_seconds(since)
+        if self._sorted:
+            start = int(np.searchsorted(self.timestamps, cutoff, side="left"))
+            rows = np.arange(start, self.size)
+        else:
+            rows = np.flatnonzero(self.timestamps >= cutoff)
+        if resolved_only:
+            rows = rows[self._status[rows] != STATUS_PENDING]
+        return rows
+
+    # === ANÁLISES VETORIZADAS ===
+
+    def performance_stats(self, since: datetime) -> Optional[Dict[str, Any]]:
+        """Totais das apostas resolvidas desde `since` (None se não houver)"""
+        rows = self.window(since, resolved_only=True)
+        if not len(rows):
+            return None
+
+        profit = self._profit[rows]
+        won = self._status[rows] == STATUS_WON
+        return {
+            "total_bets": int(len(rows)),
+            "won_bets": int(won.sum()),
+            "total_staked": float(self._stakes[rows].sum()),
+            "total_profit": float(profit.sum()),
+            "best_row": int(rows[np.argmax(profit)]),
+            "worst_row": int(rows[np.argmin(profit)])
+        }
+
+    def pattern_breakdown(self, since: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Breakdowns das apostas resolvidas desde `since` (None se não houver)
+
+        Dia da semana, faixa de odds, tamanho da aposta (quartis de stake)
+        e liga: cada um é um bincount sobre o código do grupo.
+        """
+        rows = self.window(since, resolved_only=True)
+        if not len(rows):
+            return None
+
+        won = self._status[rows] == STATUS_WON
+        profit = self._profit[rows]
+        stakes = self._stakes[rows]
+
+        # 01/01/1970 foi uma quinta-feira; segunda = 0 como em calendar.day_name
+        weekday = ((self._timestamps[rows] // _SECONDS_PER_DAY).astype(np.int64) + 3) % 7
+        odds_bounds = np.array([upper for _, upper in ODDS_RANGES[:-1]])
+        odds_code = np.searchsorted(odds_bounds, self._odds[rows], side="left")
+
+        sorted_stakes = np.sort(stakes)
+        q1 = float(sorted_stakes[len(rows) // 4])
+        q3 = float(sorted_stakes[3 * len(rows) // 4])
+        size_code = np.searchsorted(np.array([q1, q3]), stakes, side="left")
+        size_labels = [
+            f"Pequenas (≤R${q1:.0f})",
+            f"Médias (R${q1:.0f}-R${q3:.0f})",
+            f"Grandes (>R${q3:.0f})",
+        ]
+
+        return {
+            "total_bets_analyzed": int(len(rows)),
+            "weekday_performance": _group(weekday, list(calendar.day_name), won, profit,
+                                          skip_empty=True),
+            "odds_range_performance": _group(odds_code, [key for key, _ in ODDS_RANGES], won, profit),
+            "bet_size_performance": _group(size_code, size_labels, won, profit),
+            "league_performance": _group(self._league[rows], self.leagues, won, profit,
+                                         stakes=stakes, skip_empty=True),
+        }
+
+    def league_breakdown(self) -> Dict[str, Dict[str, float]]:
+        """Totais por liga de todo o histórico resolvido"""
+        rows = np.flatnonzero(self.status != STATUS_PENDING)
+        return _group(self._league[rows], self.leagues, self._status[rows] == STATUS_WON,
+                      self._profit[rows], stakes=self._stakes[rows], skip_empty=True)
+
+
+def _group(codes, labels: List[str], won, profit, stakes=None,
+           skip_empty: bool = False) -> Dict[str, Dict[str, float]]:
+    """Groupby por código inteiro: apostas, vitórias, lucro e win rate por rótulo"""
+    size = len(labels)
+    bets = np.bincount(codes, minlength=size)
+    wins = np.bincount(codes, weights=won, minlength=size)
+    profits = np.bincount(codes, weights=profit, minlength=size)
+    staked = np.bincount(codes, weights=stakes, minlength=size) if stakes is not None else None
+
+    groups = {}
+    for code, label in enumerate(labels):
+        count = int(bets[code])
+        if skip_empty and not count:
+            continue
+        group = {
+            "bets": count,
+            "wins": int(wins[code]),
+            "profit": float(profits[code]),
+            "win_rate": (float(wins[code]) / count * 100) if count else 0,
+        }
+        if staked is not None:
+            group["staked"] = float(staked[code])
+        groups[label] = group
+    return groups
+
+
+def benchmark_pattern_breakdowns(n_bets: int = 100_000, repeats: int = 5) -> Dict[str, Any]:
+    """
+    Mede todos os breakdowns de padrões para `n_bets` apostas sintéticas
+
+    Cobre o que analyze_betting_patterns e export_performance_report
+    recalculam: padrões do período (dia, odds, tamanho, liga), totais por
+    liga do histórico e estatísticas do período.
+
+    Returns:
+        Tempo médio (ms) de cada etapa, o total e se ficou abaixo da meta
+        de 100 ms
+    """
+    rng = np.random.default_rng(42)
+    columns = BetColumns(capacity=n_bets)
+    for league in ("LCK", "LPL", "LEC", "LCS", "CBLOL", "VCS", "PCS", "LJL"):
+        columns.league_code(league)
+
+    start = to_local_seconds(datetime.now() - timedelta(days=365))
+    columns.size = n_bets
+    columns._timestamps[:n_bets] = np.sort(start + rng.uniform(0, 365 * _SECONDS_PER_DAY, n_bets))
+    columns._odds[:n_bets] = rng.uniform(1.1, 4.5, n_bets).round(2)
+    columns._stakes[:n_bets] = rng.uniform(5, 100, n_bets).round(2)
+    columns._status[:n_bets] = rng.choice([STATUS_PENDING, STATUS_WON, STATUS_LOST], n_bets, p=[0.05, 0.5, 0.45])
+    columns._league[:n_bets] = rng.integers(0, len(columns.leagues), n_bets)
+    won = columns._status[:n_bets] == STATUS_WON
+    lost = columns._status[:n_bets] == STATUS_LOST
+    stakes, odds = columns._stakes[:n_bets], columns._odds[:n_bets]
+    columns._profit[:n_bets] = np.where(won, stakes * (odds - 1), np.where(lost, -stakes, 0.0))
+
+    # Janela cobre todo o histórico sintético
+    since = datetime.now() - timedelta(days=366)
+
+    timings: Dict[str, Any] = {}
+    for name, call in (
+        ("pattern_breakdown_ms", lambda: columns.pattern_breakdown(since)),
+        ("league_breakdown_ms", columns.league_breakdown),
+        ("performance_stats_ms", lambda: columns.performance_stats(since)),
+    ):
+        started = time.perf_counter()
+        for _ in range(repeats):
+            call()
+        timings[name] = (time.perf_counter() - started) / repeats * 1000
+
+    timings["total_ms"] = sum(timings.values())
+    timings["within_target"] = timings["total_ms"] < 100.0
+    timings["bets_analyzed"] = columns.pattern_breakdown(since)["total_bets_analyzed"]
+    return timings
+
+
+if __name__ == "__main__":
+    print(benchmark_pattern_breakdowns())
@@ -21,6 +21,8 @@ from dataclasses import dataclass
 from enum import Enum
 import math
 
+from .rolling_aggregates import RollingBetAggregates
+
 # Logger local simples
 class SimpleLogger:
     def info(self, msg): print(f"INFO: {msg}")
@@ -73,6 +75,10 @@ class PerformanceMetrics:
     bankroll_current: float = 0.0
     bankroll_peak: float = 0.0
     bankroll_low: float = 0.0
+    max_drawdown: float = 0.0
+    max_drawdown_pct: float = 0.0
+    current_drawdown_pct: float = 0.0
+    longest_drawdown_days: float = 0.0
     
     performance_level: str = "average"
     trend_direction: str = "stable"
@@ -105,7 +111,8 @@ class BettingTracker:
     def __init__(self, 
                  data_file: str = "bot/data/personal_betting/betting_tracker.json",
                  bankroll_manager=None,
-                 value_analyzer=None):
+                 value_analyzer=None,
+                 store=None):
         """
         Inicializa o tracking system
         
@@ -113,8 +120,10 @@ class BettingTracker:
             data_file: Arquivo para persistir dados de tracking
             bankroll_manager: Instance do bankroll manager
             value_analyzer: Instance do value analyzer
+            store: PersonalBettingStore opcional (SQLite) no lugar do JSON
         """
         self.data_file = data_file
+        self.store = store
         self.data_dir = os.path.dirname(data_file)
         self.bankroll_manager = bankroll_manager
         self.value_analyzer = value_analyzer
@@ -122,6 +131,10 @@ class BettingTracker:
         # Cria diretório se não existir
         os.makedirs(self.data_dir, exist_ok=True)
         
+        # Agregados incrementais das apostas do bankroll manager
+        self.aggregates = RollingBetAggregates()
+        self._aggregates_source = None
+        
         # Dados de tracking
         self.tracking_data = {
             'sessions': [],
@@ -191,49 +204,46 @@ class BettingTracker:
             if not self.bankroll_manager:
                 return PerformanceMetrics()
             
-            cutoff_date = datetime.now() - timedelta(days=period_days)
-            
-            # Pega apostas do período
-            period_bets = []
-            for bet in self.bankroll_manager.bets:
-                bet_date = datetime.fromisoformat(bet.date)
-                if bet_date >= cutoff_date:
-                    period_bets.append(bet)
+            now = datetime.now()
+            summary = self._get_aggregates().summarize(period_days, now)
             
-            if not period_bets:
+            if not summary['total_bets']:
                 return PerformanceMetrics()
             
             # Calcula métricas básicas
-            total_bets = len(period_bets)
-            won_bets = len([b for b in period_bets if b.status == "won"])
-            lost_bets = len([b for b in period_bets if b.status == "lost"])
-            pending_bets = len([b for b in period_bets if b.status == "pending"])
+            total_bets = summary['total_bets']
+            won_bets = summary['won_bets']
+            lost_bets = summary['lost_bets']
+            pending_bets = summary['pending_bets']
+            resolved_count = won_bets + lost_bets
             
-            win_rate = (won_bets / (won_bets + lost_bets) * 100) if (won_bets + lost_bets) > 0 else 0
+            win_rate = (won_bets / resolved_count * 100) if resolved_count > 0 else 0
             
-            resolved_bets = [b for b in period_bets if b.status in ["won", "lost"]]
-            total_staked = sum(b.amount for b in resolved_bets)
-            total_profit = sum(b.profit for b in resolved_bets)
+            total_staked = summary['total_staked']
+            total_profit = summary['total_profit']
             roi = (total_profit / total_staked * 100) if total_staked > 0 else 0
             
             # Métricas avançadas
-            avg_odds = sum(b.odds for b in resolved_bets) / len(resolved_bets) if resolved_bets else 0
-            avg_stake = sum(b.amount for b in resolved_bets) / len(resolved_bets) if resolved_bets else 0
-            avg_confidence = sum(b.confidence for b in resolved_bets) / len(resolved_bets) if resolved_bets else 0
-            avg_ev = sum(b.ev_percentage for b in resolved_bets) / len(resolved_bets) if resolved_bets else 0
+            avg_odds = summary['sum_odds'] / resolved_count if resolved_count else 0
+            avg_stake = total_staked / resolved_count if resolved_count else 0
+            avg_confidence = summary['sum_confidence'] / resolved_count if resolved_count else 0
+            avg_ev = summary['sum_ev'] / resolved_count if resolved_count else 0
             
             # Análise de streaks
-            streak_info = self._calculate_streaks(resolved_bets)
+            streak = summary['streak']
             
             # Informações de bankroll
             bankroll_start = self.bankroll_manager.settings.initial_bankroll
             bankroll_current = self.bankroll_manager.settings.current_bankroll
+            equity = self.bankroll_manager.equity.get_stats(now.timestamp())
             
             # Determina nível de performance
             performance_level = self._determine_performance_level(roi, win_rate)
             
-            # Determina tendência
-            trend_direction = self._determine_trend_direction(period_bets)
+            # Determina tendência (últimas 10 apostas do período)
+            cutoff = (now - timedelta(days=period_days)).isoformat()
+            recent_bets = [b for b in self.bankroll_manager.bets[-10:] if b.date >= cutoff]
+            trend_direction = self._determine_trend_direction(recent_bets)
             
             return PerformanceMetrics(
                 total_bets=total_bets,
@@ -248,14 +258,18 @@ class BettingTracker:
                 avg_stake=avg_stake,
                 avg_confidence=avg_confidence,
                 avg_ev=avg_ev,
-                best_streak=streak_info['best_win_streak'],
-                worst_streak=streak_info['worst_loss_streak'],
-                current_streak=streak_info['current_streak_length'],
-                streak_type=streak_info['current_streak_type'],
+                best_streak=streak.best_win,
+                worst_streak=streak.worst_loss,
+                current_streak=streak.suffix,
+                streak_type=streak.last_type,
                 bankroll_start=bankroll_start,
                 bankroll_current=bankroll_current,
-                bankroll_peak=max(bankroll_start, bankroll_current),
-                bankroll_low=min(bankroll_start, bankroll_current),
+                bankroll_peak=equity['peak'],
+                bankroll_low=equity['low'],
+                max_drawdown=equity['max_drawdown'],
+                max_drawdown_pct=equity['max_drawdown_pct'],
+                current_drawdown_pct=equity['current_drawdown_pct'],
+                longest_drawdown_days=equity['longest_drawdown_days'],
                 performance_level=performance_level,
                 trend_direction=trend_direction
             )
@@ -279,9 +293,12 @@ class BettingTracker:
                 line = "─" * width
                 return f"{title}\n{line}"
             
-            # Escala os dados
+            # Amostra um ponto por coluna e escala só as colunas
             range_val = max_val - min_val
-            scaled_data = [(val - min_val) / range_val for val in data]
+            column_levels = [
+                (data[int(j * (len(data) - 1) / (width - 1))] - min_val) / range_val
+                for j in range(width)
+            ]
             
             # Cria o gráfico
             chart_lines = []
@@ -293,17 +310,8 @@ class BettingTracker:
             # Dados do gráfico
             for i in range(height):
                 level = 1 - (i / (height - 1))  # De 1.0 a 0.0
-                line = "│"
-                
-                for j in range(width):
-                    data_index = int(j * (len(data) - 1) / (width - 1))
-                    if scaled_data[data_index] >= level:
-                        line += "█"
-                    else:
-                        line += " "
-                
-                line += "│"
-                chart_lines.append(line)
+                line = "".join("█" if column >= level else " " for column in column_levels)
+                chart_lines.append("│" + line + "│")
             
             # Linha inferior
             chart_lines.append("└" + "─" * width + "┘")
@@ -322,103 +330,16 @@ class BettingTracker:
             if not self.bankroll_manager:
                 return {"error": "Bankroll manager não disponível"}
             
-            cutoff_date = datetime.now() - timedelta(days=period_days)
-            
-            period_bets = []
-            for bet in self.bankroll_manager.bets:
-                bet_date = datetime.fromisoformat(bet.date)
-                if bet_date >= cutoff_date and bet.status in ["won", "lost"]:
-                    period_bets.append(bet)
+            columns = self.bankroll_manager.columns
+            if columns is None:
+                return {"error": "Análise de padrões requer NumPy"}
             
-            if not period_bets:
+            # Dia da semana, odds, tamanho e liga vetorizados sobre as colunas
+            breakdown = columns.pattern_breakdown(datetime.now() - timedelta(days=period_days))
+            if breakdown is None:
                 return {"message": "Nenhuma aposta no período"}
             
-            # Análise por dia da semana
-            weekday_stats = {}
-            for bet in period_bets:
-                bet_date = datetime.fromisoformat(bet.date)
-                weekday = bet_date.strftime('%A')
-                
-                if weekday not in weekday_stats:
-                    weekday_stats[weekday] = {'bets': 0, 'wins': 0, 'profit': 0.0}
-                
-                weekday_stats[weekday]['bets'] += 1
-                if bet.status == "won":
-                    weekday_stats[weekday]['wins'] += 1
-                weekday_stats[weekday]['profit'] += bet.profit
-            
-            # Calcula win rate por dia
-            for day in weekday_stats:
-                stats = weekday_stats[day]
-                stats['win_rate'] = (stats['wins'] / stats['bets'] * 100) if stats['bets'] > 0 else 0
-            
-            # Análise por odds range
-            odds_ranges = {
-                "1.00-1.50": {"bets": 0, "wins": 0, "profit": 0.0},
-                "1.51-2.00": {"bets": 0, "wins": 0, "profit": 0.0},
-                "2.01-3.00": {"bets": 0, "wins": 0, "profit": 0.0},
-                "3.01+": {"bets": 0, "wins": 0, "profit": 0.0}
-            }
-            
-            for bet in period_bets:
-                if bet.odds <= 1.50:
-                    range_key = "1.00-1.50"
-                elif bet.odds <= 2.00:
-                    range_key = "1.51-2.00"
-                elif bet.odds <= 3.00:
-                    range_key = "2.01-3.00"
-                else:
-                    range_key = "3.01+"
-                
-                odds_ranges[range_key]['bets'] += 1
-                if bet.status == "won":
-                    odds_ranges[range_key]['wins'] += 1
-                odds_ranges[range_key]['profit'] += bet.profit
-            
-            # Calcula win rate por range
-            for range_key in odds_ranges:
-                stats = odds_ranges[range_key]
-                stats['win_rate'] = (stats['wins'] / stats['bets'] * 100) if stats['bets'] > 0 else 0
-            
-            # Análise por size de aposta
-            bet_sizes = sorted([bet.amount for bet in period_bets])
-            if bet_sizes:
-                q1 = bet_sizes[len(bet_sizes)//4]
-                q3 = bet_sizes[3*len(bet_sizes)//4]
-                
-                size_ranges = {
-                    f"Pequenas (≤R${q1:.0f})": {"bets": 0, "wins": 0, "profit": 0.0},
-                    f"Médias (R${q1:.0f}-R${q3:.0f})": {"bets": 0, "wins": 0, "profit": 0.0},
-                    f"Grandes (>R${q3:.0f})": {"bets": 0, "wins": 0, "profit": 0.0}
-                }
-                
-                for bet in period_bets:
-                    if bet.amount <= q1:
-                        range_key = f"Pequenas (≤R${q1:.0f})"
-                    elif bet.amount <= q3:
-                        range_key = f"Médias (R${q1:.0f}-R${q3:.0f})"
-                    else:
-                        range_key = f"Grandes (>R${q3:.0f})"
-                    
-                    size_ranges[range_key]['bets'] += 1
-                    if bet.status == "won":
-                        size_ranges[range_key]['wins'] += 1
-                    size_ranges[range_key]['profit'] += bet.profit
-                
-                # Calcula win rate por size
-                for range_key in size_ranges:
-                    stats = size_ranges[range_key]
-                    stats['win_rate'] = (stats['wins'] / stats['bets'] * 100) if stats['bets'] > 0 else 0
-            else:
-                size_ranges = {}
-            
-            return {
-                "period_days": period_days,
-                "total_bets_analyzed": len(period_bets),
-                "weekday_performance": weekday_stats,
-                "odds_range_performance": odds_ranges,
-                "bet_size_performance": size_ranges
-            }
+            return {"period_days": period_days, **breakdown}
             
         except Exception as e:
             logger.error(f"Erro ao analisar padrões: {e}")
@@ -460,7 +381,7 @@ class BettingTracker:
             }
             
             self.tracking_data['sessions'].append(session)
-            self._save_data()
+            self._save_data('sessions')
             
             logger.info(f"Sessão iniciada: {session_name}")
             
@@ -492,7 +413,7 @@ class BettingTracker:
             session['session_profit'] = session['ending_bankroll'] - session['starting_bankroll']
             session['active'] = False
             
-            self._save_data()
+            self._save_data('sessions')
             
             logger.info(f"Sessão finalizada: {session['name']}")
             
@@ -543,7 +464,7 @@ class BettingTracker:
                 if s['date'] >= cutoff_date
             ]
             
-            self._save_data()
+            self._save_data('daily_snapshots')
             
             return {"success": True, "snapshot": snapshot}
             
@@ -597,18 +518,35 @@ class BettingTracker:
 💳 Bankroll Inicial: R$ {metrics.bankroll_start:.2f}
 📊 Bankroll Atual: R$ {metrics.bankroll_current:.2f}
 🚀 Bankroll Máximo: R$ {metrics.bankroll_peak:.2f}
-📉 Bankroll Mínimo: R$ {metrics.bankroll_low:.2f}"""
+📉 Bankroll Mínimo: R$ {metrics.bankroll_low:.2f}
+🔻 Drawdown Máximo: {metrics.max_drawdown_pct:.1f}% (R$ {metrics.max_drawdown:.2f})
+⏳ Maior Drawdown: {metrics.longest_drawdown_days:.1f} dias"""
     
     def _generate_bankroll_chart(self, period_days: int) -> str:
         """Gera gráfico de evolução do bankroll"""
         try:
-            # Pega snapshots do período
+            # Curva de capital: um ponto por aposta/resolução, amostrada na largura
+            if self.bankroll_manager:
+                since = (datetime.now() - timedelta(days=period_days)).timestamp()
+                equity = self.bankroll_manager.equity
+                values = equity.downsample(50, since)
+                if len(values) >= 2:
+                    return self.generate_ascii_chart(
+                        values,
+                        f"Evolução do Bankroll ({len(equity) - equity.index_since(since)} eventos)",
+                        width=50,
+                        height=8
+                    )
+            
+            # Fallback: snapshots diários
+            # Pega snapshots do período (lista em ordem de data: varre só o final)
             cutoff_date = (datetime.now() - timedelta(days=period_days)).date().isoformat()
             
-            snapshots = [
-                s for s in self.tracking_data['daily_snapshots']
-                if s['date'] >= cutoff_date
-            ]
+            all_snapshots = self.tracking_data['daily_snapshots']
+            start = len(all_snapshots)
+            while start > 0 and all_snapshots[start - 1]['date'] >= cutoff_date:
+                start -= 1
+            snapshots = all_snapshots[start:]
             
             if len(snapshots) < 2:
                 return "Dados insuficientes para gráfico (mín. 2 dias)"
@@ -626,6 +564,14 @@ class BettingTracker:
         except Exception as e:
             return f"Erro ao gerar gráfico: {e}"
     
+    def get_equity_chart_data(self, period_days: int = 30, width: int = 120) -> Dict:
+        """Série do bankroll amostrada para gráficos HTML (labels/values do Chart.js)"""
+        if not self.bankroll_manager:
+            return {"labels": [], "values": []}
+        
+        since = (datetime.now() - timedelta(days=period_days)).timestamp()
+        return self.bankroll_manager.equity.chart_data(width, since)
+    
     def _generate_streak_analysis(self, metrics: PerformanceMetrics) -> str:
         """Gera análise de streaks"""
         if metrics.current_streak == 0:
@@ -648,23 +594,10 @@ class BettingTracker:
             if not self.bankroll_manager:
                 return "Dados não disponíveis"
             
-            league_stats = {}
-            
-            for bet in self.bankroll_manager.bets:
-                if bet.status in ["won", "lost"]:
-                    league = bet.league
-                    
-                    if league not in league_stats:
-                        league_stats[league] = {
-                            'bets': 0, 'wins': 0, 'profit': 0.0, 'staked': 0.0
-                        }
-                    
-                    league_stats[league]['bets'] += 1
-                    league_stats[league]['staked'] += bet.amount
-                    league_stats[league]['profit'] += bet.profit
-                    
-                    if bet.status == "won":
-                        league_stats[league]['wins'] += 1
+            if self.bankroll_manager.columns is None:
+                return "Breakdown por liga requer NumPy"
+            
+            league_stats = self.bankroll_manager.columns.league_breakdown()
             
             if not league_stats:
                 return "Nenhuma aposta resolvida ainda"
@@ -768,51 +701,17 @@ class BettingTracker:
         
         return "\n".join(f"   {rec}" for rec in recommendations[:4])  # Top 4
     
-    def _calculate_streaks(self, resolved_bets: List) -> Dict:
-        """Calcula informações sobre streaks"""
-        if not resolved_bets:
-            return {
-                'best_win_streak': 0,
-                'worst_loss_streak': 0,
-                'current_streak_length': 0,
-                'current_streak_type': 'none'
-            }
+    def _get_aggregates(self) -> RollingBetAggregates:
+        """Agregados sincronizados com o bankroll manager atual"""
+        if self._aggregates_source is not self.bankroll_manager:
+            if self._aggregates_source is not None:
+                self._aggregates_source.remove_listener(self.aggregates.on_bet_event)
+            
+            self.aggregates.rebuild(self.bankroll_manager.bets)
+            self.bankroll_manager.add_listener(self.aggregates.on_bet_event)
+            self._aggregates_source = self.bankroll_manager
         
-        # Ordena por data
-        sorted_bets = sorted(resolved_bets, key=lambda x: x.date)
-        
-        best_win_streak = 0
-        worst_loss_streak = 0
-        current_streak = 0
-        current_type = 'none'
-        
-        temp_win_streak = 0
-        temp_loss_streak = 0
-        
-        for bet in sorted_bets:
-            if bet.status == "won":
-                temp_win_streak += 1
-                temp_loss_streak = 0
-                best_win_streak = max(best_win_streak, temp_win_streak)
-            else:  # lost
-                temp_loss_streak += 1
-                temp_win_streak = 0
-                worst_loss_streak = max(worst_loss_streak, temp_loss_streak)
-        
-        # Streak atual
-        if temp_win_streak > 0:
-            current_streak = temp_win_streak
-            current_type = "win"
-        elif temp_loss_streak > 0:
-            current_streak = temp_loss_streak
-            current_type = "loss"
-        
-        return {
-            'best_win_streak': best_win_streak,
-            'worst_loss_streak': worst_loss_streak,
-            'current_streak_length': current_streak,
-            'current_streak_type': current_type
-        }
+        return self.aggregates
     
     def _determine_performance_level(self, roi: float, win_rate: float) -> str:
         """Determina nível de performance"""
@@ -923,6 +822,9 @@ Inicial: R$ {metrics.bankroll_start:.2f}
 Atual: R$ {metrics.bankroll_current:.2f}
 Máximo: R$ {metrics.bankroll_peak:.2f}
 Mínimo: R$ {metrics.bankroll_low:.2f}
+Drawdown Máximo: {metrics.max_drawdown_pct:.1f}% (R$ {metrics.max_drawdown:.2f})
+Drawdown Atual: {metrics.current_drawdown_pct:.1f}%
+Maior Drawdown: {metrics.longest_drawdown_days:.1f} dias
 """
         
         # Adiciona padrões se disponível
@@ -942,12 +844,21 @@ Mínimo: R$ {metrics.bankroll_low:.2f}
                 for range_key, stats in patterns['odds_range_performance'].items():
                     if stats['bets'] > 0:
                         report += f"\n  {range_key}: {stats['bets']} apostas | {stats['win_rate']:.1f}% WR | R$ {stats['profit']:+.2f}"
+            
+            if patterns.get('league_performance'):
+                report += "\n\nPerformance por Liga:"
+                for league, stats in patterns['league_performance'].items():
+                    report += f"\n  {league}: {stats['bets']} apostas | {stats['win_rate']:.1f}% WR | R$ {stats['profit']:+.2f}"
         
         return report
     
     def _load_data(self):
         """Carrega dados de tracking"""
         try:
+            if self.store:
+                self.tracking_data.update(self.store.load_tracking_data())
+                return
+            
             if os.path.exists(self.data_file):
                 with open(self.data_file, 'r', encoding='utf-8') as f:
                     loaded_data = json.load(f)
@@ -958,9 +869,14 @@ Mínimo: R$ {metrics.bankroll_low:.2f}
         except Exception as e:
             logger.warning(f"Erro ao carregar dados de tracking: {e}")
     
-    def _save_data(self):
-        """Salva dados de tracking"""
+    def _save_data(self, *sections: str):
+        """Salva dados de tracking (no SQLite, apenas as seções alteradas)"""
         try:
+            if self.store:
+                for section in sections or self.tracking_data.keys():
+                    self.store.save_tracking_section(section, self.tracking_data[section])
+                return
+            
             with open(self.data_file, 'w', encoding='utf-8') as f:
                 json.dump(self.tracking_data, f, indent=2, ensure_ascii=False)
                 
@@ -968,9 +884,9 @@ Mínimo: R$ {metrics.bankroll_low:.2f}
             logger.error(f"Erro ao salvar dados de tracking: {e}")
 
 
-def create_default_tracker(bankroll_manager=None, value_analyzer=None) -> BettingTracker:
+def create_default_tracker(bankroll_manager=None, value_analyzer=None, store=None) -> BettingTracker:
     """Cria tracker com configurações padrão"""
-    return BettingTracker(bankroll_manager=bankroll_manager, value_analyzer=value_analyzer)
+    return BettingTracker(bankroll_manager=bankroll_manager, value_analyzer=value_analyzer, store=store)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Curva de capital (equity curve) do Personal Bankroll Manager
+Bankroll registrado após cada evento, com pico, drawdown e duração do drawdown
+"""
+
+import bisect
+import time
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+SECONDS_PER_DAY = 86400.0
+
+
+class EquityCurve:
+    """
+    Série compacta (array('d')) do bankroll após cada aposta/resolução
+
+    - record() é O(1) e mantém pico, mínimo, drawdown máximo e a maior
+      duração de drawdown de forma incremental
+    - Janelas por período via busca binária nos timestamps
+    - Gráficos amostram a série na largura pedida (O(width))
+    """
+
+    def __init__(self, starting_value: Optional[float] = None, timestamp: Optional[float] = None):
+        self.times = array('d')
+        self.values = array('d')
+        self.reset(starting_value, timestamp)
+
+    def reset(self, starting_value: Optional[float] = None, timestamp: Optional[float] = None) -> None:
+        """Reinicia a série (ex.: novo bankroll configurado)"""
+        del self.times[:]
+        del self.values[:]
+
+        self.peak = 0.0
+        self.peak_time = 0.0
+        self.low = 0.0
+        self.max_drawdown = 0.0
+        self.max_drawdown_pct = 0.0
+        self.max_drawdown_seconds = 0.0
+        self.underwater_since: Optional[float] = None  # instante do pico antes da queda atual
+
+        if starting_value is not None:
+            self.record(starting_value, timestamp)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def current(self) -> float:
+        return self.values[-1] if self.values else 0.0
+
+    def record(self, value: float, timestamp: Optional[float] = None) -> None:
+        """Registra o bankroll após um evento (O(1))"""
+        timestamp = time.time() if timestamp is None else timestamp
+        if self.times and timestamp < self.times[-1]:
+            timestamp = self.times[-1]  # mantém a série ordenada para busca binária
+
+        if not self.values:
+            self.peak = self.low = value
+            self.peak_time = timestamp
+        elif value >= self.peak:
+            if self.underwater_since is not None:
+                self.max_drawdown_seconds = max(self.max_drawdown_seconds, timestamp - self.underwater_since)
+                self.underwater_since = None
+            self.peak = value
+            self.peak_time = timestamp
+        else:
+            if self.underwater_since is None:
+                self.underwater_since = self.peak_time
+            drawdown = self.peak - value
+            self.max_drawdown = max(self.max_drawdown, drawdown)
+            if self.peak > 0:
+                self.max_drawdown_pct = max(self.max_drawdown_pct, drawdown / self.peak * 100)
+
+        self.low = min(self.low, value)
+        self.times.append(timestamp)
+        self.values.append(value)
+
+    @property
+    def current_drawdown(self) -> float:
+        return max(0.0, self.peak - self.current) if self.values else 0.0
+
+    @property
+    def current_drawdown_pct(self) -> float:
+        return self.current_drawdown / self.peak * 100 if self.peak > 0 else 0.0
+
+    def current_drawdown_seconds(self, now: Optional[float] = None) -> float:
+        """Duração do drawdown em andamento (0 se no pico)"""
+        if self.underwater_since is None:
+            return 0.0
+        return max(0.0, (time.time() if now is None else now) - self.underwater_since)
+
+    def longest_drawdown_seconds(self, now: Optional[float] = None) -> float:
+        """Maior duração de drawdown, incluindo o atual"""
+        return max(self.max_drawdown_seconds, self.current_drawdown_seconds(now))
+
+    def index_since(self, timestamp: float) -> int:
+        """Primeiro ponto com time >= timestamp"""
+        return bisect.bisect_left(self.times, timestamp)
+
+    def sample_indices(self, width: int, start: int = 0) -> List[int]:
+        """Índices amostrados entre `start` e o fim (inclui primeiro e último)"""
+        count = len(self.values) - start
+        if count <= 0:
+            return []
+        if count <= width or width < 2:
+            return list(range(start, len(self.values)))
+        return [start + int(j * (count - 1) / (width - 1)) for j in range(width)]
+
+    def downsample(self, width: int, since: Optional[float] = None) -> List[float]:
+        """Valores amostrados na largura do gráfico (O(width))"""
+        start = self.index_since(since) if since is not None else 0
+        return [self.values[i] for i in self.sample_indices(width, start)]
+
+    def chart_data(self, width: int, since: Optional[float] = None) -> Dict[str, List]:
+        """Rótulos + valores amostrados (formato de datasets do Chart.js)"""
+        start = self.index_since(since) if since is not None else 0
+        indices = self.sample_indices(width, start)
+        return {
+            "labels": [datetime.fromtimestamp(self.times[i]).strftime('%d/%m %H:%M') for i in indices],
+            "values": [round(self.values[i], 2) for i in indices]
+        }
+
+    def get_stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Pico, mínimo e drawdowns (O(1))"""
+        return {
+            "points": len(self.values),
+            "current": round(self.current, 2),
+            "peak": round(self.peak, 2),
+            "low": round(self.low, 2),
+            "current_drawdown": round(self.current_drawdown, 2),
+            "current_drawdown_pct": round(self.current_drawdown_pct, 2),
+            "max_drawdown": round(self.max_drawdown, 2),
+            "max_drawdown_pct": round(self.max_drawdown_pct, 2),
+            "current_drawdown_days": round(self.current_drawdown_seconds(now) / SECONDS_PER_DAY, 2),
+            "longest_drawdown_days": round(self.longest_drawdown_seconds(now) / SECONDS_PER_DAY, 2)
+        }
+
+    @classmethod
+    def from_bets(cls, initial_bankroll: float, bets: Iterable[Any]) -> "EquityCurve":
+        """
+        Reconstrói a curva a partir do histórico de apostas
+
+        Cada aposta desconta o stake na data em que foi feita; vitórias
+        devolvem o retorno na data de resolução.
+        """
+        events = []
+        for bet in bets:
+            events.append((bet.date, -bet.amount))
+            if bet.status != "pending" and bet.resolved_date:
+                events.append((bet.resolved_date, bet.potential_return if bet.status == "won" else 0.0))
+        events.sort(key=lambda event: event[0])
+
+        curve = cls()
+        value = initial_bankroll
+        first_time = datetime.fromisoformat(events[0][0]).timestamp() if events else None
+        curve.record(value, first_time)
+        for moment, delta in events:
+            value += delta
+            curve.record(value, datetime.fromisoformat(moment).timestamp())
+        return curve
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Importação em massa de partidas históricas para o Pre-Game Analyzer
+Leitura em streaming de CSV/JSONL, normalização de times e gravação em lotes
+
+Uso:
+    python -m bot.personal_betting.match_importer partidas.csv --db bot/data/personal_betting/personal_betting.db
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .pre_game_analyzer import MatchResult, PreGameAnalyzer
+
+# Logger local simples
+class SimpleLogger:
+    def info(self, msg): print(f"INFO: {msg}")
+    def error(self, msg): print(f"ERROR: {msg}")
+    def warning(self, msg): print(f"WARNING: {msg}")
+
+logger = SimpleLogger()
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Nome completo/variações -> nome usado pelo analyzer
+TEAM_ALIASES = {
+    "SK Telecom T1": "T1", "SKT": "T1", "SKT T1": "T1",
+    "Gen.G Esports": "Gen.G", "GenG": "Gen.G", "GEN": "Gen.G",
+    "KT Rolster": "KT", "DRX": "DRX", "DragonX": "DRX",
+    "Hanwha Life Esports": "HLE", "Hanwha Life": "HLE",
+    "G2 Esports": "G2", "Fnatic": "FNC", "MAD Lions": "MAD", "MAD Lions KOI": "MAD",
+    "Team Vitality": "VIT", "Vitality": "VIT", "Team BDS": "BDS",
+    "100 Thieves": "100T", "Team Liquid": "TL", "Cloud9": "C9",
+    "FlyQuest": "FLY", "TSM": "TSM", "Team SoloMid": "TSM",
+    "JD Gaming": "JDG", "Bilibili Gaming": "BLG", "Weibo Gaming": "WBG",
+    "Top Esports": "TES", "Invictus Gaming": "IG",
+}
+
+# Colunas aceitas para cada campo do MatchResult (primeira encontrada vence)
+FIELD_COLUMNS = {
+    "date": ("date", "game_date", "datetime"),
+    "team1": ("team1", "blue_team", "blueteam", "team_blue"),
+    "team2": ("team2", "red_team", "redteam", "team_red"),
+    "winner": ("winner", "winning_team"),
+    "duration_minutes": ("duration_minutes", "duration"),
+    "patch": ("patch",),
+    "league": ("league",),
+    "importance": ("importance", "stage"),
+    "team1_kills": ("team1_kills", "blue_kills"),
+    "team2_kills": ("team2_kills", "red_kills"),
+    "team1_towers": ("team1_towers", "blue_towers"),
+    "team2_towers": ("team2_towers", "red_towers"),
+}
+
+
+def _alias_key(name: str) -> str:
+    """Forma canônica para comparar aliases (minúsculas, sem pontuação/espaços)"""
+    return re.sub(r"[\W_]+", "", name).lower()
+
+
+class TeamAliasTable:
+    """
+    Tabela de aliases de times com cache
+
+    Cada nome bruto distinto é normalizado uma única vez; as linhas
+    seguintes resolvem com um lookup no dicionário.
+    """
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None, known_teams: Iterable[str] = ()):
+        self._canonical: Dict[str, str] = {}
+        for team in known_teams:
+            self._canonical[_alias_key(team)] = team
+        for alias, team in {**TEAM_ALIASES, **(aliases or {})}.items():
+            self._canonical[_alias_key(alias)] = team
+        self._cache: Dict[str, str] = {}
+
+    def resolve(self, raw_name: str) -> str:
+        name = self._cache.get(raw_name)
+        if name is None:
+            stripped = raw_name.strip()
+            name = self._cache[raw_name] = self._canonical.get(_alias_key(stripped), stripped)
+        return name
+
+    @classmethod
+    def from_file(cls, path: str, known_teams: Iterable[str] = ()) -> "TeamAliasTable":
+        """Carrega aliases extras de um JSON {"alias": "time"}"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), known_teams)
+
+
+def iter_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """Lê linhas de um CSV ou JSONL sem carregar o arquivo inteiro"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Linha {line_number} inválida ignorada")
+        else:
+            yield from csv.DictReader(f)
+
+
+def iter_chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Agrupa um iterável em listas de até `size` itens"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def resolve_columns(keys: Iterable[str]) -> Dict[str, str]:
+    """Coluna do arquivo usada para cada campo (resolvida uma vez por cabeçalho)"""
+    keys = set(keys)
+    columns = {}
+    for name, candidates in FIELD_COLUMNS.items():
+        for column in candidates:
+            if column in keys:
+                columns[name] = column
+                break
+    return columns
+
+
+def row_to_result(row: Dict[str, Any], aliases: TeamAliasTable,
+                  columns: Optional[Dict[str, str]] = None) -> Optional[MatchResult]:
+    """Converte uma linha bruta em MatchResult (None se faltar dado essencial)"""
+    columns = columns if columns is not None else resolve_columns(row)
+
+    def _field(name: str, default: Any = None) -> Any:
+        value = row.get(columns.get(name))
+        return default if value in (None, "") else value
+
+    if any(_field(name) is None for name in ("date", "team1", "team2", "winner")):
+        return None
+
+    try:
+        team1 = aliases.resolve(str(_field("team1")))
+        team2 = aliases.resolve(str(_field("team2")))
+
+        # Vencedor pode vir como nome, lado (blue/red) ou posição (1/2)
+        winner_raw = str(_field("winner")).strip()
+        side = winner_raw.lower()
+        if side in ("1", "team1", "blue"):
+            winner = team1
+        elif side in ("2", "team2", "red"):
+            winner = team2
+        else:
+            winner = aliases.resolve(winner_raw)
+        if winner not in (team1, team2):
+            return None
+
+        # Datas com timezone viram horário local ingênuo (comparação por string ISO)
+        moment = datetime.fromisoformat(str(_field("date")).replace("Z", "+00:00"))
+        if moment.tzinfo is not None:
+            moment = moment.astimezone().replace(tzinfo=None)
+
+        duration = _field("duration_minutes")
+        if duration is None and row.get("gamelength") not in (None, ""):
+            duration = float(row["gamelength"]) / 60  # segundos
+
+        return MatchResult(
+            date=moment.isoformat(),
+            team1=team1,
+            team2=team2,
+            winner=winner,
+            duration_minutes=int(round(float(duration))) if duration is not None else 30,
+            patch=str(_field("patch", "unknown")),
+            league=str(_field("league", "unknown")),
+            importance=str(_field("importance", "regular")),
+            team1_kills=int(_field("team1_kills", 0)),
+            team2_kills=int(_field("team2_kills", 0)),
+            team1_towers=int(_field("team1_towers", 0)),
+            team2_towers=int(_field("team2_towers", 0))
+        )
+    except (TypeError, ValueError):
+        return None
+
+
+def import_match_history(analyzer: PreGameAnalyzer, path: str,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE,
+                         aliases: Optional[TeamAliasTable] = None) -> Dict[str, Any]:
+    """
+    Importa um dump CSV/JSONL de partidas para o analyzer
+
+    O arquivo é lido em streaming e gravado em lotes de `chunk_size`
+    partidas (uma transação por lote no SQLite; no backend JSON o arquivo
+    é reescrito uma única vez no final). Os ratings Elo são recalculados
+    uma única vez ao final, não a cada lote.
+
+    Returns:
+        Contadores de linhas lidas, importadas, duplicadas e inválidas
+    """
+    started = time.perf_counter()
+    aliases = aliases or TeamAliasTable(known_teams=analyzer.team_stats)
+    batched_writes = analyzer.store is not None
+    counts = {"rows": 0, "imported": 0, "duplicates": 0, "invalid": 0}
+    column_maps: Dict[tuple, Dict[str, str]] = {}
+
+    for chunk in iter_chunks(iter_rows(path), chunk_size):
+        results = []
+        for row in chunk:
+            keys = tuple(row)
+            columns = column_maps.get(keys)
+            if columns is None:
+                columns = column_maps[keys] = resolve_columns(keys)
+            result = row_to_result(row, aliases, columns)
+            if result is None:
+                counts["invalid"] += 1
+            else:
+                results.append(result)
+
+        added = analyzer.add_match_results(results, save=batched_writes, update_ratings=False)
+        counts["rows"] += len(chunk)
+        counts["imported"] += added
+        counts["duplicates"] += len(results) - added
+
+    if counts["imported"]:
+        analyzer.ratings.replay(analyzer.historical_results)
+        if not batched_writes:
+            analyzer._save_data()
+
+    counts["seconds"] = round(time.perf_counter() - started, 2)
+    logger.info(f"Importação concluída ({os.path.basename(path)}): {counts}")
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description="Importa histórico de partidas (CSV/JSONL)")
+    parser.add_argument("path", help="Arquivo .csv ou .jsonl")
+    parser.add_argument("--db", help="Banco SQLite (PersonalBettingStore); sem ele usa o JSON")
+    parser.add_argument("--data-file", default="bot/data/personal_betting/pre_game_data.json")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--aliases", help="JSON extra de aliases {\"alias\": \"time\"}")
+    args = parser.parse_args(argv)
+
+    store = None
+    if args.db:
+        from .sqlite_store import PersonalBettingStore
+        store = PersonalBettingStore(args.db)
+
+    try:
+        analyzer = PreGameAnalyzer(args.data_file, store=store)
+        aliases = TeamAliasTable.from_file(args.aliases, analyzer.team_stats) if args.aliases else None
+        return import_match_history(analyzer, args.path, args.chunk_size, aliases)
+    finally:
+        if store:
+            store.close()
+
+
+if __name__ == "__main__":
+    print(main())
@@ -21,6 +21,12 @@ from enum import Enum
 import statistics
 import math
 
+from .analysis_persistence import (
+    ANALYSIS_RETENTION_DAYS, FLUSH_INTERVAL_SECONDS, AnalysisArchive, AnalysisWriteBehind
+)
+from .results_index import MatchResultsIndex
+from .team_ratings import TeamRatingEngine
+
 # Logger local simples
 class SimpleLogger:
     def info(self, msg): print(f"INFO: {msg}")
@@ -181,7 +187,10 @@ class PreGameAnalyzer:
     def __init__(self, 
                  data_file: str = "bot/data/personal_betting/pre_game_data.json",
                  bankroll_manager=None,
-                 value_analyzer=None):
+                 value_analyzer=None,
+                 store=None,
+                 retention_days: int = ANALYSIS_RETENTION_DAYS,
+                 flush_interval: float = FLUSH_INTERVAL_SECONDS):
         """
         Inicializa o Pre-Game Analyzer
         
@@ -189,11 +198,22 @@ class PreGameAnalyzer:
             data_file: Arquivo para dados históricos
             bankroll_manager: Instance do bankroll manager
             value_analyzer: Instance do value analyzer
+            store: PersonalBettingStore opcional (SQLite) no lugar do JSON
+            retention_days: Dias que uma análise fica ativa antes de ir para o arquivo gzip
+            flush_interval: Atraso máximo (s) da gravação write-behind das análises
         """
         self.data_file = data_file
+        self.store = store
         self.data_dir = os.path.dirname(data_file)
         self.bankroll_manager = bankroll_manager
         self.value_analyzer = value_analyzer
+        self.retention_days = retention_days
+        
+        # Análises ativas (JSONL, backend JSON) e arquivo gzip das antigas
+        base_name = os.path.splitext(data_file)[0]
+        self.analyses_file = f"{base_name}.analyses.jsonl"
+        self.analysis_archive = AnalysisArchive(f"{base_name}_archive")
+        self.analysis_writer = AnalysisWriteBehind(self._write_analyses, flush_interval)
         
         # Cria diretório se não existir
         os.makedirs(self.data_dir, exist_ok=True)
@@ -203,9 +223,18 @@ class PreGameAnalyzer:
         self.team_stats: Dict[str, TeamStats] = {}
         self.analyses: List[PreGameAnalysis] = []
         
+        # Índice por time/confronto (forma, tendência e H2H via bisect)
+        self.results_index = MatchResultsIndex()
+        
+        # Ratings Elo (probabilidade pré-jogo = lookup + logística)
+        self.ratings = TeamRatingEngine()
+        
         # Carrega dados existentes
         self._load_data()
         self._initialize_sample_data()
+        self.results_index.rebuild(self.historical_results)
+        self.ratings.replay(self.historical_results)
+        self._archive_expired_analyses()
         
         logger.info(f"Pre-Game Analyzer inicializado - {len(self.historical_results)} partidas históricas")
     
@@ -230,10 +259,11 @@ class PreGameAnalyzer:
         """
         try:
             # Cria ID único
-            analysis_id = f"pregame_{int(datetime.now().timestamp())}"
+            analysis_id = self._generate_analysis_id(datetime.now())
             
-            # Atualiza estatísticas dos times
-            self._update_team_stats()
+            # Atualiza form dos times da partida (janela de 30 dias)
+            self._refresh_team_form(team1)
+            self._refresh_team_form(team2)
             
             # Obtém stats dos times
             team1_stats = self.team_stats.get(team1, self._create_default_team_stats(team1, league))
@@ -284,9 +314,10 @@ class PreGameAnalyzer:
                 reasoning=recommendation['reasoning']
             )
             
-            # Adiciona à lista
+            # Adiciona à lista; gravação em lote fora do fluxo da requisição
             self.analyses.append(analysis)
-            self._save_data()
+            self.analysis_writer.mark_dirty(analysis.id, self._analysis_to_dict(analysis))
+            self._archive_expired_analyses()
             
             logger.info(f"Análise pré-jogo criada: {team1} vs {team2} - {team1_prob:.1%} probabilidade")
             
@@ -430,15 +461,55 @@ Tendência recente: {analysis.head_to_head.recent_trend.replace('_', ' ').title(
             return {"error": str(e)}
     
     def add_match_result(self, result: MatchResult):
-        """Adiciona resultado de partida ao histórico"""
+        """Adiciona resultado de partida ao histórico (partidas já conhecidas são ignoradas)"""
         try:
+            if not self.results_index.add(result):
+                # Mesma identidade da restrição UNIQUE do SQLite: memória e banco não divergem
+                logger.warning(f"Resultado duplicado ignorado: {result.team1} vs {result.team2} ({result.date})")
+                return
+            
             self.historical_results.append(result)
-            self._save_data()
+            if not self.ratings.update(result):
+                # Resultado anterior ao último aplicado: recalcula em ordem
+                self.ratings.replay(self.historical_results)
+            self._refresh_team_form(result.team1)
+            self._refresh_team_form(result.team2)
+            self._save_data(results=[result])
             logger.info(f"Resultado adicionado: {result.team1} vs {result.team2} - Vencedor: {result.winner}")
             
         except Exception as e:
             logger.error(f"Erro ao adicionar resultado: {e}")
-    
+
+    def add_match_results(self, results: List[MatchResult], save: bool = True,
+                          update_ratings: bool = True) -> int:
+        """
+        Adiciona resultados em lote (importação de histórico)
+
+        Partidas já conhecidas são ignoradas. Com save=True grava o lote
+        de uma vez (uma transação no SQLite). Com update_ratings=False os
+        ratings Elo não são tocados: o chamador faz um único
+        `ratings.replay` ao final (histórico antigo cai antes de
+        `last_date` e forçaria um replay completo a cada lote).
+
+        Returns:
+            Quantidade de partidas novas
+        """
+        added = self.results_index.add_many(results)
+        if not added:
+            return 0
+
+        self.historical_results.extend(added)
+        if update_ratings:
+            ordered = sorted(added, key=lambda result: result.date)
+            if not self.ratings.apply(ordered):
+                self.ratings.replay(self.historical_results)
+        for team in {team for result in added for team in (result.team1, result.team2)}:
+            self._refresh_team_form(team)
+
+        if save:
+            self._save_data(results=added)
+        return len(added)
+
     def get_team_analysis_summary(self, team: str, days: int = 30) -> Dict:
         """Obtém resumo da análise de um time"""
         try:
@@ -449,9 +520,7 @@ Tendência recente: {analysis.head_to_head.recent_trend.replace('_', ' ').title(
             cutoff_date = datetime.now() - timedelta(days=days)
             
             # Partidas recentes
-            recent_matches = [r for r in self.historical_results 
-                            if (r.team1 == team or r.team2 == team) 
-                            and datetime.fromisoformat(r.date) >= cutoff_date]
+            recent_matches = self._get_team_matches_since(team, cutoff_date)
             
             recent_wins = len([r for r in recent_matches 
                              if r.winner == team])
@@ -460,6 +529,13 @@ Tendência recente: {analysis.head_to_head.recent_trend.replace('_', ' ').title(
             recent_analyses = [a for a in self.analyses 
                              if (a.team1 == team or a.team2 == team)
                              and a.date >= cutoff_date]
+            predictions_made = len(recent_analyses)
+            if days > self.retention_days:
+                # Período além da retenção: completa com o arquivo gzip
+                predictions_made += sum(
+                    1 for record in self.analysis_archive.iter_analyses(cutoff_date.isoformat())
+                    if team in (record['team1'], record['team2'])
+                )
             
             return {
                 "team": team,
@@ -478,7 +554,7 @@ Tendência recente: {analysis.head_to_head.recent_trend.replace('_', ' ').title(
                 },
                 "strengths": self._identify_team_strengths(stats),
                 "weaknesses": self._identify_team_weaknesses(stats),
-                "predictions_made": len(recent_analyses),
+                "predictions_made": predictions_made,
                 "game_style": {
                     "early_game": stats.early_game_strength,
                     "late_game": stats.late_game_strength,
@@ -496,8 +572,18 @@ Tendência recente: {analysis.head_to_head.recent_trend.replace('_', ' ').title(
                                    team2_stats: TeamStats,
                                    h2h_stats: HeadToHeadStats,
                                    importance: str) -> Tuple[float, float]:
-        """Calcula probabilidades de vitória baseado em múltiplos fatores"""
+        """
+        Calcula probabilidades de vitória
+        
+        Com histórico suficiente dos dois times usa os ratings Elo (lookup +
+        logística); senão combina stats, form, H2H e estilo.
+        """
         try:
+            if self.ratings.is_rated(team1_stats.name) and self.ratings.is_rated(team2_stats.name):
+                team1_prob, _ = self.ratings.win_probability(team1_stats.name, team2_stats.name)
+                team1_prob = max(0.1, min(0.9, team1_prob))
+                return team1_prob, 1 - team1_prob
+            
             # Peso dos fatores
             weights = {
                 'overall_performance': 0.3,
@@ -601,6 +687,8 @@ Tendência recente: {analysis.head_to_head.recent_trend.replace('_', ' ').title(
         if not self.historical_results:
             logger.info("Inicializando dados de exemplo...")
             self._create_sample_historical_data()
+            if self.store:
+                self._save_data()
     
     def _create_sample_historical_data(self):
         """Cria dados históricos de exemplo"""
@@ -678,6 +766,18 @@ Tendência recente: {analysis.head_to_head.recent_trend.replace('_', ' ').title(
     def _load_data(self):
         """Carrega dados do arquivo"""
         try:
+            if self.store:
+                self.historical_results = [
+                    MatchResult(**result) for result in self.store.load_match_results()
+                ]
+                self.team_stats = {
+                    name: TeamStats(**stats) for name, stats in self.store.load_team_stats().items()
+                }
+                self._load_analyses(self.store.load_pregame_analyses())
+                logger.info(f"Dados carregados do SQLite")
+                return
+            
+            legacy_analyses = []
             if os.path.exists(self.data_file):
                 with open(self.data_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
@@ -695,35 +795,131 @@ Tendência recente: {analysis.head_to_head.recent_trend.replace('_', ' ').title(
                             for name, stats in data['team_stats'].items()
                         }
                     
-                    # Carrega análises
-                    if 'analyses' in data:
-                        for analysis_data in data['analyses']:
-                            analysis_data['date'] = datetime.fromisoformat(analysis_data['date'])
-                            analysis_data['team1_stats'] = TeamStats(**analysis_data['team1_stats'])
-                            analysis_data['team2_stats'] = TeamStats(**analysis_data['team2_stats'])
-                            analysis_data['head_to_head'] = HeadToHeadStats(**analysis_data['head_to_head'])
-                            self.analyses.append(PreGameAnalysis(**analysis_data))
+                    # Análises de versões antigas (dentro do JSON principal)
+                    legacy_analyses = data.get('analyses', [])
                 
                 logger.info(f"Dados carregados do arquivo")
+            
+            self._load_analyses(legacy_analyses + self._read_analyses_file())
+            
+            if legacy_analyses:
+                # Migra para o JSONL e tira as análises do JSON principal
+                self.analysis_writer.request_compaction()
+                self.analysis_writer.flush()
+                self._save_data()
                 
         except Exception as e:
             logger.warning(f"Erro ao carregar dados: {e}")
     
-    def _save_data(self):
-        """Salva dados no arquivo"""
+    def _read_analyses_file(self) -> List[Dict]:
+        """Lê o JSONL de análises ativas (linha final truncada é ignorada)"""
+        records = []
+        if os.path.exists(self.analyses_file):
+            with open(self.analyses_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logger.warning("Linha incompleta ignorada no arquivo de análises")
+        return records
+    
+    def _load_analyses(self, records: List[Dict]):
+        """Reconstrói análises ativas (última versão de cada ID, em ordem de data)"""
+        latest = {record['id']: record for record in records}
+        ordered = sorted(latest.values(), key=lambda record: record['date'])
+        self.analysis_writer.load(ordered)
+        self.analyses = [self._analysis_from_dict(dict(record)) for record in ordered]
+    
+    def _archive_expired_analyses(self):
+        """Move análises fora da retenção para o arquivo gzip (O(1) se nada expirou)"""
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        expired = 0
+        while expired < len(self.analyses) and self.analyses[expired].date < cutoff:
+            expired += 1
+        
+        if expired:
+            self.analysis_writer.mark_archived([analysis.id for analysis in self.analyses[:expired]])
+            del self.analyses[:expired]
+    
+    def _write_analyses(self, dirty: List[Dict], archived: List[Dict],
+                        active: Optional[List[Dict]]):
+        """Sink do write-behind (executa em thread de background)"""
+        if archived:
+            self.analysis_archive.append(archived)
+            self.analysis_archive.prune()
+        
+        if self.store:
+            if dirty:
+                self.store.upsert_pregame_analyses(dirty)
+            if archived:
+                self.store.delete_pregame_analyses([record['id'] for record in archived])
+            return
+        
+        if active is not None:
+            # Compactação: reescreve só as ativas (escrita atômica)
+            temp_file = f"{self.analyses_file}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                for record in active:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(temp_file, self.analyses_file)
+        elif dirty:
+            with open(self.analyses_file, 'a', encoding='utf-8') as f:
+                for record in dirty:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    
+    def _generate_analysis_id(self, now: datetime) -> str:
+        """ID único mesmo para análises criadas no mesmo segundo"""
+        base_id = f"pregame_{int(now.timestamp())}"
+        analysis_id = base_id
+        suffix = 2
+        while analysis_id in self.analysis_writer.active:
+            analysis_id = f"{base_id}_{suffix}"
+            suffix += 1
+        return analysis_id
+    
+    def flush_analyses(self) -> int:
+        """Grava imediatamente as análises pendentes"""
+        return self.analysis_writer.flush()
+    
+    async def flush_analyses_async(self) -> int:
+        """Grava as análises pendentes sem bloquear o event loop"""
+        return await self.analysis_writer.flush_async()
+    
+    @staticmethod
+    def _analysis_from_dict(analysis_data: Dict) -> PreGameAnalysis:
+        """Reconstrói PreGameAnalysis serializada"""
+        analysis_data['date'] = datetime.fromisoformat(analysis_data['date'])
+        analysis_data['team1_stats'] = TeamStats(**analysis_data['team1_stats'])
+        analysis_data['team2_stats'] = TeamStats(**analysis_data['team2_stats'])
+        analysis_data['head_to_head'] = HeadToHeadStats(**analysis_data['head_to_head'])
+        return PreGameAnalysis(**analysis_data)
+    
+    @staticmethod
+    def _analysis_to_dict(analysis: PreGameAnalysis) -> Dict:
+        analysis_dict = asdict(analysis)
+        analysis_dict['date'] = analysis.date.isoformat()
+        return analysis_dict
+    
+    def _save_data(self, results: Optional[List[MatchResult]] = None):
+        """
+        Salva resultados históricos e stats dos times
+        
+        No SQLite grava apenas os resultados informados (sem argumentos,
+        grava tudo). Análises são gravadas pelo write-behind.
+        """
         try:
+            if self.store:
+                changed_results = self.historical_results if results is None else results
+                # MatchResult só tem campos simples: __dict__ evita o deepcopy do asdict
+                self.store.insert_match_results([r.__dict__ for r in changed_results])
+                self.store.upsert_team_stats({name: asdict(stats) for name, stats in self.team_stats.items()})
+                return
+            
             data = {
-                'historical_results': [asdict(result) for result in self.historical_results],
-                'team_stats': {name: asdict(stats) for name, stats in self.team_stats.items()},
-                'analyses': []
+                'historical_results': [result.__dict__ for result in self.historical_results],
+                'team_stats': {name: asdict(stats) for name, stats in self.team_stats.items()}
             }
             
-            # Salva análises
-            for analysis in self.analyses:
-                analysis_dict = asdict(analysis)
-                analysis_dict['date'] = analysis.date.isoformat()
-                data['analyses'].append(analysis_dict)
-            
             with open(self.data_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
                 
@@ -731,40 +927,42 @@ Tendência recente: {analysis.head_to_head.recent_trend.replace('_', ' ').title(
             logger.error(f"Erro ao salvar dados: {e}")
     
     def _update_team_stats(self):
-        """Atualiza estatísticas dos times baseado em resultados recentes"""
+        """Atualiza estatísticas de todos os times baseado em resultados recentes"""
+        for team_name in self.team_stats:
+            self._refresh_team_form(team_name)
+    
+    def _refresh_team_form(self, team_name: str, days: int = 30):
+        """Atualiza form e tendência de um time (últimas 5 partidas em `days` dias)"""
         try:
-            # Atualiza stats baseado nos últimos 30 dias
-            cutoff_date = datetime.now() - timedelta(days=30)
+            stats = self.team_stats.get(team_name)
+            if stats is None:
+                return
             
-            for team_name in self.team_stats:
-                recent_matches = [r for r in self.historical_results 
-                               if (r.team1 == team_name or r.team2 == team_name)
-                               and datetime.fromisoformat(r.date) >= cutoff_date]
+            cutoff_date = datetime.now() - timedelta(days=days)
+            recent_matches = self._get_team_matches_since(team_name, cutoff_date)[-5:]
+            
+            if recent_matches:
+                # Atualiza form recente
+                recent_results = ["W" if match.winner == team_name else "L" for match in recent_matches]
+                stats.last_5_games = recent_results
                 
-                if recent_matches:
-                    # Atualiza form recente
-                    recent_results = []
-                    for match in recent_matches[-5:]:  # Últimas 5 partidas
-                        if match.winner == team_name:
-                            recent_results.append("W")
-                        else:
-                            recent_results.append("L")
-                    
-                    self.team_stats[team_name].last_5_games = recent_results
-                    
-                    # Atualiza tendência
-                    if len(recent_results) >= 3:
-                        recent_wins = recent_results[-3:].count("W")
-                        if recent_wins >= 2:
-                            self.team_stats[team_name].form_trend = "improving"
-                        elif recent_wins <= 1:
-                            self.team_stats[team_name].form_trend = "declining"
-                        else:
-                            self.team_stats[team_name].form_trend = "stable"
+                # Atualiza tendência
+                if len(recent_results) >= 3:
+                    recent_wins = recent_results[-3:].count("W")
+                    if recent_wins >= 2:
+                        stats.form_trend = "improving"
+                    elif recent_wins <= 1:
+                        stats.form_trend = "declining"
+                    else:
+                        stats.form_trend = "stable"
             
         except Exception as e:
             logger.error(f"Erro ao atualizar stats: {e}")
     
+    def _get_team_matches_since(self, team: str, cutoff_date: datetime) -> List[MatchResult]:
+        """Partidas de um time desde a data, em ordem cronológica (busca binária no índice)"""
+        return self.results_index.team_matches_since(team, cutoff_date.isoformat())
+    
     def _create_default_team_stats(self, team_name: str, league: str) -> TeamStats:
         """Cria stats padrão para um time não conhecido"""
         return TeamStats(
@@ -789,11 +987,9 @@ Tendência recente: {analysis.head_to_head.recent_trend.replace('_', ' ').title(
     def _calculate_head_to_head(self, team1: str, team2: str) -> HeadToHeadStats:
         """Calcula estatísticas head-to-head entre dois times"""
         try:
-            h2h_matches = [r for r in self.historical_results 
-                          if (r.team1 == team1 and r.team2 == team2) 
-                          or (r.team1 == team2 and r.team2 == team1)]
+            series = self.results_index.head_to_head(team1, team2)
             
-            if not h2h_matches:
+            if not series:
                 return HeadToHeadStats(
                     team1=team1, team2=team2,
                     team1_wins=0, team2_wins=0, total_games=0,
@@ -801,14 +997,15 @@ Tendência recente: {analysis.head_to_head.recent_trend.replace('_', ' ').title(
                     recent_trend="even"
                 )
             
-            team1_wins = len([m for m in h2h_matches if m.winner == team1])
-            team2_wins = len([m for m in h2h_matches if m.winner == team2])
+            # Vitórias e duração acumuladas no índice; série já ordenada por data
+            team1_wins = series.wins.get(team1, 0)
+            team2_wins = series.wins.get(team2, 0)
             
-            avg_duration = sum(m.duration_minutes for m in h2h_matches) / len(h2h_matches)
-            last_meeting = max(h2h_matches, key=lambda x: x.date).date
+            avg_duration = series.total_duration / len(series)
+            last_meeting = series.dates[-1]
             
             # Determina tendência recente (últimas 3 partidas)
-            recent_matches = sorted(h2h_matches, key=lambda x: x.date)[-3:]
+            recent_matches = series.last(3)
             recent_team1_wins = len([m for m in recent_matches if m.winner == team1])
             
             if recent_team1_wins >= 2:
@@ -821,7 +1018,7 @@ Tendência recente: {analysis.head_to_head.recent_trend.replace('_', ' ').title(
             return HeadToHeadStats(
                 team1=team1, team2=team2,
                 team1_wins=team1_wins, team2_wins=team2_wins,
-                total_games=len(h2h_matches),
+                total_games=len(series),
                 avg_game_duration=avg_duration,
                 last_meeting_date=last_meeting,
                 recent_trend=trend
@@ -1107,11 +1304,12 @@ Nenhuma aposta recomendada:
         return weaknesses[:3]
 
 
-def create_default_pre_game_analyzer(bankroll_manager=None, value_analyzer=None):
+def create_default_pre_game_analyzer(bankroll_manager=None, value_analyzer=None, store=None):
     """Cria analyzer com configurações padrão"""
     return PreGameAnalyzer(
         bankroll_manager=bankroll_manager,
-        value_analyzer=value_analyzer
+        value_analyzer=value_analyzer,
+        store=store
     )
 
 
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Índice de resultados históricos do Pre-Game Analyzer
+Partidas por time e por confronto, ordenadas por data (consultas via bisect)
+"""
+
+import bisect
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+
+def pair_key(team1: str, team2: str) -> Tuple[str, str]:
+    """Chave do confronto independente da ordem dos times"""
+    return (team1, team2) if team1 <= team2 else (team2, team1)
+
+
+def result_key(result) -> Tuple[str, str, str, str]:
+    """Identidade de uma partida (mesma restrição UNIQUE do SQLite)"""
+    return (result.date, result.team1, result.team2, result.league)
+
+
+@dataclass
+class ResultSeries:
+    """Partidas ordenadas por data com array paralelo de datas ISO"""
+    dates: List[str] = field(default_factory=list)
+    results: List[Any] = field(default_factory=list)  # MatchResult
+
+    wins: Dict[str, int] = field(default_factory=dict)  # vencedor -> vitórias
+    total_duration: int = 0
+
+    def add(self, result) -> None:
+        # Resultados costumam chegar em ordem: bisect_right mantém estabilidade e O(1) no fim
+        position = bisect.bisect_right(self.dates, result.date)
+        self.dates.insert(position, result.date)
+        self.results.insert(position, result)
+
+        self.wins[result.winner] = self.wins.get(result.winner, 0) + 1
+        self.total_duration += result.duration_minutes
+
+    def extend(self, results: List[Any]) -> None:
+        """Adiciona um lote já ordenado por data (fusão em O(n) com a série)"""
+        for result in results:
+            self.wins[result.winner] = self.wins.get(result.winner, 0) + 1
+            self.total_duration += result.duration_minutes
+
+        dates = [result.date for result in results]
+        if not self.dates or dates[0] >= self.dates[-1]:
+            self.results.extend(results)
+            self.dates.extend(dates)
+        elif dates[-1] < self.dates[0]:
+            # Dumps em ordem decrescente: o lote inteiro vem antes da série
+            self.results[:0] = results
+            self.dates[:0] = dates
+        else:
+            self.results.extend(results)
+            self.results.sort(key=lambda result: result.date)  # timsort funde os dois runs
+            self.dates = [result.date for result in self.results]
+
+    def since(self, cutoff_iso: str) -> List[Any]:
+        """Partidas com data >= cutoff"""
+        return self.results[bisect.bisect_left(self.dates, cutoff_iso):]
+
+    def last(self, n: int) -> List[Any]:
+        return self.results[-n:]
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+
+class MatchResultsIndex:
+    """
+    Índice em memória dos resultados históricos
+
+    - Por time: série ordenada por data (forma, tendência, partidas recentes)
+    - Por confronto (par não ordenado): série com vitórias e duração
+      acumuladas, então o H2H sai em O(1) + últimas partidas
+    - add() é incremental (inserção ordenada por bisect) e ignora duplicadas
+    """
+
+    def __init__(self):
+        self.by_team: Dict[str, ResultSeries] = {}
+        self.by_pair: Dict[Tuple[str, str], ResultSeries] = {}
+        self._keys: Set[Tuple[str, str, str, str]] = set()
+
+    def rebuild(self, results: Iterable[Any]) -> None:
+        """Recria o índice a partir do histórico completo"""
+        self.by_team.clear()
+        self.by_pair.clear()
+        self._keys.clear()
+        self.add_many(results)
+
+    def add(self, result) -> bool:
+        """Indexa a partida (False se já estava no índice)"""
+        key = result_key(result)
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+
+        for team in (result.team1, result.team2):
+            self.by_team.setdefault(team, ResultSeries()).add(result)
+        self.by_pair.setdefault(pair_key(result.team1, result.team2), ResultSeries()).add(result)
+        return True
+
+    def add_many(self, results: Iterable[Any]) -> List[Any]:
+        """
+        Indexa um lote (importação em massa)
+
+        Cada série tocada é reordenada uma única vez em vez de uma
+        inserção por partida.
+
+        Returns:
+            Partidas novas (duplicadas ignoradas)
+        """
+        added = []
+        grouped: Dict[Any, List[Any]] = {}
+        for result in sorted(results, key=lambda result: result.date):
+            key = result_key(result)
+            if key in self._keys:
+                continue
+            self._keys.add(key)
+            added.append(result)
+            grouped.setdefault(result.team1, []).append(result)
+            grouped.setdefault(result.team2, []).append(result)
+            grouped.setdefault(pair_key(result.team1, result.team2), []).append(result)
+
+        for key, series_results in grouped.items():
+            target = self.by_pair if isinstance(key, tuple) else self.by_team
+            target.setdefault(key, ResultSeries()).extend(series_results)
+        return added
+
+    def __contains__(self, result) -> bool:
+        return result_key(result) in self._keys
+
+    def team_series(self, team: str) -> ResultSeries:
+        return self.by_team.get(team) or ResultSeries()
+
+    def team_matches_since(self, team: str, cutoff_iso: str) -> List[Any]:
+        """Partidas do time desde a data (ordem cronológica)"""
+        return self.team_series(team).since(cutoff_iso)
+
+    def head_to_head(self, team1: str, team2: str) -> ResultSeries:
+        """Série do confronto entre os dois times (vazia se nunca jogaram)"""
+        return self.by_pair.get(pair_key(team1, team2)) or ResultSeries()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Agregados incrementais do Betting Tracker
+Contadores, somas e streaks mantidos em buckets diários
+(breakdowns de padrões e por liga ficam nas colunas NumPy)
+"""
+
+import bisect
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+
+@dataclass
+class StreakSummary:
+    """
+    Resumo de sequências de um trecho de apostas resolvidas
+
+    Resumos de trechos consecutivos são combinados com `combine`, então
+    as streaks de uma janela saem dos resumos diários sem reordenar apostas.
+    """
+    count: int = 0
+    first_type: str = "none"  # win/loss
+    prefix: int = 0
+    last_type: str = "none"
+    suffix: int = 0
+    best_win: int = 0
+    worst_loss: int = 0
+
+    @classmethod
+    def from_statuses(cls, statuses: Iterable[str]) -> "StreakSummary":
+        summary = cls()
+        for status in statuses:
+            summary = summary.combine(cls._single(status))
+        return summary
+
+    @classmethod
+    def _single(cls, status: str) -> "StreakSummary":
+        streak_type = "win" if status == "won" else "loss"
+        return cls(
+            count=1, first_type=streak_type, prefix=1, last_type=streak_type, suffix=1,
+            best_win=1 if streak_type == "win" else 0,
+            worst_loss=1 if streak_type == "loss" else 0
+        )
+
+    def combine(self, other: "StreakSummary") -> "StreakSummary":
+        """Resumo do trecho `self` seguido de `other`"""
+        if not self.count:
+            return other
+        if not other.count:
+            return self
+
+        joined = self.suffix + other.prefix if self.last_type == other.first_type else 0
+        best_win = max(self.best_win, other.best_win, joined if self.last_type == "win" else 0)
+        worst_loss = max(self.worst_loss, other.worst_loss, joined if self.last_type == "loss" else 0)
+
+        prefix = self.prefix
+        if self.prefix == self.count and self.first_type == other.first_type:
+            prefix = self.count + other.prefix
+
+        suffix = other.suffix
+        if other.suffix == other.count and other.last_type == self.last_type:
+            suffix = other.count + self.suffix
+
+        return StreakSummary(
+            count=self.count + other.count,
+            first_type=self.first_type, prefix=prefix,
+            last_type=other.last_type, suffix=suffix,
+            best_win=best_win, worst_loss=worst_loss
+        )
+
+
+@dataclass
+class DailyBucket:
+    """Agregados das apostas feitas em um dia"""
+    day: str  # YYYY-MM-DD
+    bets: List[Any] = field(default_factory=list)  # PersonalBet, ordem cronológica
+
+    placed: int = 0
+    pending: int = 0
+    won: int = 0
+    lost: int = 0
+
+    # Somas das apostas resolvidas
+    staked: float = 0.0
+    profit: float = 0.0
+    sum_odds: float = 0.0
+    sum_confidence: float = 0.0
+    sum_ev: float = 0.0
+
+    _streak: Optional[StreakSummary] = None
+
+    @property
+    def resolved(self) -> int:
+        return self.won + self.lost
+
+    @property
+    def streak(self) -> StreakSummary:
+        # Recalculado só quando uma aposta do dia muda de status (O(k) no dia)
+        if self._streak is None:
+            self._streak = StreakSummary.from_statuses(
+                bet.status for bet in self.bets if bet.status in ("won", "lost")
+            )
+        return self._streak
+
+    def add(self, bet) -> None:
+        """Registra aposta feita no dia (pendente ou já resolvida)"""
+        self.bets.append(bet)
+        self.placed += 1
+        if bet.status == "pending":
+            self.pending += 1
+        else:
+            self._count_resolved(bet)
+
+    def resolve(self, bet) -> None:
+        """Move aposta de pendente para resolvida"""
+        self.pending -= 1
+        self._count_resolved(bet)
+
+    def _count_resolved(self, bet) -> None:
+        if bet.status == "won":
+            self.won += 1
+        else:
+            self.lost += 1
+
+        self.staked += bet.amount
+        self.profit += bet.profit or 0.0
+        self.sum_odds += bet.odds
+        self.sum_confidence += bet.confidence
+        self.sum_ev += bet.ev_percentage
+
+        self._streak = None
+
+
+class RollingBetAggregates:
+    """
+    Motor de agregados incrementais por dia
+
+    - Place/resolve atualizam apenas o bucket do dia da aposta
+    - Qualquer janela `period_days` é montada a partir dos buckets do
+      período; só o bucket da data de corte é filtrado aposta a aposta
+    """
+
+    def __init__(self):
+        self.buckets: Dict[str, DailyBucket] = {}
+        self._days: List[str] = []  # dias com apostas, ordenados
+
+    def rebuild(self, bets: Iterable[Any]) -> None:
+        """Recria os agregados a partir do histórico completo"""
+        self.buckets.clear()
+        self._days.clear()
+        for bet in bets:
+            self.add_bet(bet)
+
+    def on_bet_event(self, event_type: str, bet) -> None:
+        """Listener do PersonalBankrollManager"""
+        if event_type == "bet_placed":
+            self.add_bet(bet)
+        elif event_type == "bet_resolved":
+            self.resolve_bet(bet)
+
+    def add_bet(self, bet) -> None:
+        day = bet.date[:10]
+        bucket = self.buckets.get(day)
+        if bucket is None:
+            bucket = self.buckets[day] = DailyBucket(day=day)
+            bisect.insort(self._days, day)
+        bucket.add(bet)
+
+    def resolve_bet(self, bet) -> None:
+        bucket = self.buckets.get(bet.date[:10])
+        if bucket is None:
+            return
+        bucket.resolve(bet)
+
+    def window(self, period_days: int, now: Optional[datetime] = None) -> List[DailyBucket]:
+        """
+        Buckets das apostas feitas desde `now - period_days`
+
+        O bucket da data de corte é reconstruído só com as apostas
+        posteriores ao instante exato de corte.
+        """
+        cutoff = (now or datetime.now()) - timedelta(days=period_days)
+        cutoff_iso = cutoff.isoformat()
+        cutoff_day = cutoff_iso[:10]
+
+        start = bisect.bisect_left(self._days, cutoff_day)
+        buckets = [self.buckets[day] for day in self._days[start:]]
+
+        if buckets and buckets[0].day == cutoff_day:
+            partial = DailyBucket(day=cutoff_day)
+            for bet in buckets[0].bets:
+                if bet.date >= cutoff_iso:
+                    partial.add(bet)
+            buckets[0] = partial
+
+        return buckets
+
+    def summarize(self, period_days: int, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Totais, médias e streaks da janela"""
+        totals = {
+            "total_bets": 0, "won_bets": 0, "lost_bets": 0, "pending_bets": 0,
+            "total_staked": 0.0, "total_profit": 0.0,
+            "sum_odds": 0.0, "sum_confidence": 0.0, "sum_ev": 0.0
+        }
+        streak = StreakSummary()
+
+        for bucket in self.window(period_days, now):
+            totals["total_bets"] += bucket.placed
+            totals["won_bets"] += bucket.won
+            totals["lost_bets"] += bucket.lost
+            totals["pending_bets"] += bucket.pending
+            totals["total_staked"] += bucket.staked
+            totals["total_profit"] += bucket.profit
+            totals["sum_odds"] += bucket.sum_odds
+            totals["sum_confidence"] += bucket.sum_confidence
+            totals["sum_ev"] += bucket.sum_ev
+            streak = streak.combine(bucket.streak)
+
+        totals["streak"] = streak
+        return totals
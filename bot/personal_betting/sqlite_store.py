@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Armazenamento SQLite para o Sistema de Apostas Pessoais
+Backend opcional (WAL + índices) compartilhado por bankroll, tracker e analisadores
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Logger local simples para evitar dependências
+class SimpleLogger:
+    def info(self, msg): print(f"INFO: {msg}")
+    def error(self, msg): print(f"ERROR: {msg}")
+    def warning(self, msg): print(f"WARNING: {msg}")
+
+logger = SimpleLogger()
+
+DEFAULT_DB_FILE = "bot/data/personal_betting/personal_betting.db"
+
+BET_COLUMNS = (
+    "id", "date", "team", "opponent", "league", "odds", "amount", "potential_return",
+    "reasoning", "confidence", "ev_percentage", "risk_level", "status", "result",
+    "profit", "resolved_date", "notes"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bankroll_settings (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS bets (
+    id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    day TEXT NOT NULL,
+    team TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    league TEXT NOT NULL,
+    odds REAL NOT NULL,
+    amount REAL NOT NULL,
+    potential_return REAL NOT NULL,
+    reasoning TEXT,
+    confidence REAL,
+    ev_percentage REAL,
+    risk_level TEXT,
+    status TEXT NOT NULL,
+    result TEXT,
+    profit REAL,
+    resolved_date TEXT,
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_bets_date ON bets(date);
+
+CREATE TABLE IF NOT EXISTS tracking_data (
+    section TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS value_analyses (
+    id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    league TEXT NOT NULL,
+    team1 TEXT NOT NULL,
+    team2 TEXT NOT NULL,
+    confidence_level INTEGER NOT NULL,
+    value_rating TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_value_date ON value_analyses(date);
+CREATE INDEX IF NOT EXISTS idx_value_league ON value_analyses(league);
+CREATE INDEX IF NOT EXISTS idx_value_team1 ON value_analyses(team1);
+CREATE INDEX IF NOT EXISTS idx_value_team2 ON value_analyses(team2);
+
+CREATE TABLE IF NOT EXISTS match_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    team1 TEXT NOT NULL,
+    team2 TEXT NOT NULL,
+    pair_key TEXT NOT NULL,
+    winner TEXT NOT NULL,
+    league TEXT NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (date, team1, team2, league)
+);
+CREATE INDEX IF NOT EXISTS idx_results_date ON match_results(date);
+CREATE INDEX IF NOT EXISTS idx_results_league ON match_results(league);
+
+CREATE TABLE IF NOT EXISTS team_stats (
+    name TEXT PRIMARY KEY,
+    league TEXT,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS pregame_analyses (
+    id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    team1 TEXT NOT NULL,
+    team2 TEXT NOT NULL,
+    league TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pregame_date ON pregame_analyses(date);
+CREATE INDEX IF NOT EXISTS idx_pregame_league ON pregame_analyses(league);
+CREATE INDEX IF NOT EXISTS idx_pregame_team1 ON pregame_analyses(team1);
+CREATE INDEX IF NOT EXISTS idx_pregame_team2 ON pregame_analyses(team2);
+"""
+
+
+def pair_key(team1: str, team2: str) -> str:
+    """Chave do confronto independente da ordem dos times"""
+    return "|".join(sorted((team1, team2)))
+
+
+class PersonalBettingStore:
+    """
+    Banco SQLite embarcado para os dados de apostas pessoais
+
+    - WAL: leituras não bloqueiam a escrita corrente
+    - Índices por data (e liga/time nas análises); pendentes, períodos e H2H
+      são respondidos pelos índices em memória de cada classe
+    - Cada escrita é uma transação curta (O(1) por aposta/análise)
+    - Value bets por idade e janelas de período (get_bets_since) respondidas em SQL
+    """
+
+    def __init__(self, db_file: str = DEFAULT_DB_FILE):
+        self.db_file = db_file
+        db_dir = os.path.dirname(db_file)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+        logger.info(f"SQLite store inicializado: {db_file}")
+
+    def close(self) -> None:
+        """Fecha a conexão"""
+        with self._lock:
+            self.conn.close()
+
+    def _execute(self, sql: str, params: tuple = ()) -> None:
+        with self._lock:
+            self.conn.execute(sql, params)
+            self.conn.commit()
+
+    def _executemany(self, sql: str, rows: List[tuple]) -> None:
+        with self._lock:
+            self.conn.executemany(sql, rows)
+            self.conn.commit()
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    # === BANKROLL ===
+
+    def save_settings(self, settings: Dict[str, Any]) -> None:
+        """Grava configurações do bankroll"""
+        self._execute(
+            "INSERT OR REPLACE INTO bankroll_settings (id, data) VALUES (1, ?)",
+            (json.dumps(settings, ensure_ascii=False),)
+        )
+
+    def load_settings(self) -> Optional[Dict[str, Any]]:
+        """Carrega configurações do bankroll"""
+        rows = self._query("SELECT data FROM bankroll_settings WHERE id = 1")
+        return json.loads(rows[0]["data"]) if rows else None
+
+    @staticmethod
+    def _bet_row(bet: Dict[str, Any]) -> tuple:
+        return tuple(bet.get(column) for column in BET_COLUMNS) + (bet["date"][:10],)
+
+    def upsert_bets(self, bets: List[Dict[str, Any]]) -> None:
+        """Insere ou atualiza apostas em lote"""
+        columns = ", ".join(BET_COLUMNS + ("day",))
+        placeholders = ", ".join("?" for _ in range(len(BET_COLUMNS) + 1))
+        self._executemany(
+            f"INSERT OR REPLACE INTO bets ({columns}) VALUES ({placeholders})",
+            [self._bet_row(bet) for bet in bets]
+        )
+
+    def save_bet_and_settings(self, bet: Dict[str, Any], settings: Dict[str, Any]) -> None:
+        """Grava aposta e bankroll resultante na mesma transação"""
+        columns = ", ".join(BET_COLUMNS + ("day",))
+        placeholders = ", ".join("?" for _ in range(len(BET_COLUMNS) + 1))
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    f"INSERT OR REPLACE INTO bets ({columns}) VALUES ({placeholders})",
+                    self._bet_row(bet)
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO bankroll_settings (id, data) VALUES (1, ?)",
+                    (json.dumps(settings, ensure_ascii=False),)
+                )
+
+    def _rows_to_bets(self, rows: List[sqlite3.Row]) -> List[Dict[str, Any]]:
+        return [{column: row[column] for column in BET_COLUMNS} for row in rows]
+
+    def load_bets(self) -> List[Dict[str, Any]]:
+        """Todas as apostas em ordem cronológica"""
+        return self._rows_to_bets(self._query("SELECT * FROM bets ORDER BY date, rowid"))
+
+    def get_bets_since(self, cutoff: str, resolved_only: bool = False) -> List[Dict[str, Any]]:
+        """Apostas a partir de uma data ISO (índice por data)"""
+        sql = "SELECT * FROM bets WHERE date >= ?"
+        if resolved_only:
+            sql += " AND status IN ('won', 'lost')"
+        return self._rows_to_bets(self._query(sql + " ORDER BY date, rowid", (cutoff,)))
+
+    # === TRACKER ===
+
+    def save_tracking_section(self, section: str, data: Any) -> None:
+        """Grava uma seção dos dados de tracking"""
+        self._execute(
+            "INSERT OR REPLACE INTO tracking_data (section, data) VALUES (?, ?)",
+            (section, json.dumps(data, ensure_ascii=False))
+        )
+
+    def load_tracking_data(self) -> Dict[str, Any]:
+        """Carrega todas as seções de tracking"""
+        return {
+            row["section"]: json.loads(row["data"])
+            for row in self._query("SELECT section, data FROM tracking_data")
+        }
+
+    # === VALUE ANALYZER ===
+
+    def upsert_value_analysis(self, analysis: Dict[str, Any]) -> None:
+        """Insere ou atualiza uma análise manual (formato MatchAnalysis.to_dict)"""
+        self.upsert_value_analyses([analysis])
+
+    def upsert_value_analyses(self, analyses: List[Dict[str, Any]]) -> None:
+        self._executemany(
+            """
+            INSERT OR REPLACE INTO value_analyses
+                (id, date, league, team1, team2, confidence_level, value_rating, data)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    a["id"], a["date"], a["league"], a["team1"]["name"], a["team2"]["name"],
+                    int(a["confidence_level"]), a.get("value_rating"),
+                    json.dumps(a, ensure_ascii=False)
+                )
+                for a in analyses
+            ]
+        )
+
+    def load_value_analyses(self) -> List[Dict[str, Any]]:
+        return [json.loads(row["data"]) for row in self._query(
+            "SELECT data FROM value_analyses ORDER BY date, rowid"
+        )]
+
+    def find_value_analyses(self, cutoff: str, min_confidence: int) -> List[Dict[str, Any]]:
+        """Análises recentes acima da confiança mínima (índice por data)"""
+        return [json.loads(row["data"]) for row in self._query(
+            "SELECT data FROM value_analyses WHERE date >= ? AND confidence_level >= ? ORDER BY date",
+            (cutoff, min_confidence)
+        )]
+
+    # === PRE-GAME ANALYZER ===
+
+    def insert_match_results(self, results: List[Dict[str, Any]]) -> None:
+        """Insere resultados históricos (duplicados são ignorados)"""
+        self._executemany(
+            """
+            INSERT OR IGNORE INTO match_results
+                (date, team1, team2, pair_key, winner, league, data)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    r["date"], r["team1"], r["team2"], pair_key(r["team1"], r["team2"]),
+                    r["winner"], r["league"], json.dumps(r, ensure_ascii=False)
+                )
+                for r in results
+            ]
+        )
+
+    def load_match_results(self) -> List[Dict[str, Any]]:
+        return [json.loads(row["data"]) for row in self._query(
+            "SELECT data FROM match_results ORDER BY date, id"
+        )]
+
+    def upsert_team_stats(self, stats: Dict[str, Dict[str, Any]]) -> None:
+        """Grava estatísticas dos times"""
+        self._executemany(
+            "INSERT OR REPLACE INTO team_stats (name, league, data) VALUES (?, ?, ?)",
+            [(name, data.get("league"), json.dumps(data, ensure_ascii=False)) for name, data in stats.items()]
+        )
+
+    def load_team_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            row["name"]: json.loads(row["data"])
+            for row in self._query("SELECT name, data FROM team_stats")
+        }
+
+    def upsert_pregame_analyses(self, analyses: List[Dict[str, Any]]) -> None:
+        """Grava análises pré-jogo (date já serializada em ISO)"""
+        self._executemany(
+            """
+            INSERT OR REPLACE INTO pregame_analyses (id, date, team1, team2, league, data)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (a["id"], a["date"], a["team1"], a["team2"], a["league"], json.dumps(a, ensure_ascii=False))
+                for a in analyses
+            ]
+        )
+
+    def delete_pregame_analyses(self, analysis_ids: List[str]) -> None:
+        """Remove análises (arquivadas fora do banco)"""
+        self._executemany(
+            "DELETE FROM pregame_analyses WHERE id = ?",
+            [(analysis_id,) for analysis_id in analysis_ids]
+        )
+
+    def load_pregame_analyses(self) -> List[Dict[str, Any]]:
+        return [json.loads(row["data"]) for row in self._query(
+            "SELECT data FROM pregame_analyses ORDER BY date, rowid"
+        )]
+
+
+def migrate_json_to_sqlite(data_dir: str = "bot/data/personal_betting",
+                           db_file: Optional[str] = None) -> Dict[str, int]:
+    """
+    Importa os arquivos JSON existentes para o SQLite (one-shot, idempotente)
+
+    Returns:
+        Quantidade de registros importados por tipo
+    """
+    store = PersonalBettingStore(db_file or os.path.join(data_dir, "personal_betting.db"))
+    counts = {"bets": 0, "tracking_sections": 0, "value_analyses": 0,
+              "match_results": 0, "team_stats": 0, "pregame_analyses": 0}
+
+    def read_json(filename: str) -> Optional[Dict[str, Any]]:
+        path = os.path.join(data_dir, filename)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    try:
+        # Snapshot + journal reaplicados pelo próprio gerenciador
+        from .bankroll_manager import PersonalBankrollManager
+        bankroll = PersonalBankrollManager(os.path.join(data_dir, "bankroll_data.json"))
+        if os.path.exists(bankroll.data_file) or os.path.exists(bankroll.journal.journal_file):
+            store.save_settings(asdict(bankroll.settings))
+            store.upsert_bets([asdict(bet) for bet in bankroll.bets])
+            counts["bets"] = len(bankroll.bets)
+
+        tracking = read_json("betting_tracker.json")
+        if tracking:
+            for section, data in tracking.items():
+                store.save_tracking_section(section, data)
+            counts["tracking_sections"] = len(tracking)
+
+        value = read_json("value_analysis.json")
+        if value:
+            store.upsert_value_analyses(value.get("analyses", []))
+            counts["value_analyses"] = len(value.get("analyses", []))
+
+        pre_game = read_json("pre_game_data.json")
+        analyses_path = os.path.join(data_dir, "pre_game_data.analyses.jsonl")
+        if os.path.exists(analyses_path):
+            # Análises ativas do write-behind (JSONL) somam-se às do JSON antigo
+            pre_game = pre_game or {}
+            with open(analyses_path, 'r', encoding='utf-8') as f:
+                pre_game["analyses"] = pre_game.get("analyses", []) + [
+                    json.loads(line) for line in f if line.strip()
+                ]
+        if pre_game:
+            store.insert_match_results(pre_game.get("historical_results", []))
+            store.upsert_team_stats(pre_game.get("team_stats", {}))
+            analyses = pre_game.get("analyses", [])
+            for analysis in analyses:
+                if isinstance(analysis.get("date"), datetime):
+                    analysis["date"] = analysis["date"].isoformat()
+            store.upsert_pregame_analyses(analyses)
+            counts["match_results"] = len(pre_game.get("historical_results", []))
+            counts["team_stats"] = len(pre_game.get("team_stats", {}))
+            counts["pregame_analyses"] = len(analyses)
+
+        logger.info(f"Migração JSON -> SQLite concluída: {counts}")
+        return counts
+
+    finally:
+        store.close()
+
+
+# Uso: python -m bot.personal_betting.sqlite_store
+if __name__ == "__main__":
+    print(migrate_json_to_sqlite())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Motor de rating Elo dos times
+Atualização O(1) por partida, offsets de força por liga e replay do histórico
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+BASE_RATING = 1500.0
+K_FACTOR = 32.0
+PROVISIONAL_GAMES = 10          # times novos ajustam mais rápido
+PROVISIONAL_K_MULTIPLIER = 1.5
+MIN_RATED_GAMES = 3             # abaixo disso o rating ainda não é confiável
+
+# Importância da partida multiplica o K
+IMPORTANCE_K_MULTIPLIERS = {
+    "regular": 1.0,
+    "playoffs": 1.25,
+    "final": 1.5,
+}
+
+# Rating inicial relativo por liga (força regional histórica)
+LEAGUE_RATING_OFFSETS = {
+    "LCK": 100.0, "LPL": 100.0,
+    "LEC": 40.0, "LCS": 0.0,
+    "MSI": 80.0, "WORLDS": 80.0,
+    "PCS": -40.0, "VCS": -40.0,
+    "CBLOL": -60.0, "LLA": -80.0, "LJL": -80.0, "LCO": -100.0, "TCL": -80.0,
+    "LCKC": -60.0, "LDL": -60.0, "ERL": -100.0, "ACADEMY": -120.0, "PRIME": -120.0,
+}
+
+
+def expected_score(rating1: float, rating2: float) -> float:
+    """Probabilidade logística (Elo) de o time 1 vencer"""
+    return 1.0 / (1.0 + 10 ** ((rating2 - rating1) / 400.0))
+
+
+def league_offset(league: Optional[str]) -> float:
+    return LEAGUE_RATING_OFFSETS.get((league or "").upper(), 0.0)
+
+
+@dataclass
+class TeamRating:
+    """Rating corrente de um time"""
+    name: str
+    league: str
+    rating: float
+    games: int = 0
+    wins: int = 0
+    last_played: str = ""
+
+    @property
+    def provisional(self) -> bool:
+        return self.games < MIN_RATED_GAMES
+
+
+class TeamRatingEngine:
+    """
+    Ratings Elo dos times a partir de MatchResult
+
+    - update() aplica uma partida em O(1) (lookup + logística)
+    - Times novos começam em BASE_RATING + offset da liga
+    - replay() recalcula tudo em ordem cronológica (back-fills e
+      resultados fora de ordem)
+    - win_probability() é um lookup nas tabelas + logística
+    """
+
+    def __init__(self, k_factor: float = K_FACTOR, base_rating: float = BASE_RATING):
+        self.k_factor = k_factor
+        self.base_rating = base_rating
+        self.teams: Dict[str, TeamRating] = {}
+        self._lookup: Dict[str, str] = {}  # nome em minúsculas -> nome canônico
+        self.last_date = ""
+        self.matches_applied = 0
+
+    def reset(self) -> None:
+        self.teams.clear()
+        self._lookup.clear()
+        self.last_date = ""
+        self.matches_applied = 0
+
+    def _team(self, name: str, league: str) -> TeamRating:
+        team = self.teams.get(name)
+        if team is None:
+            team = self.teams[name] = TeamRating(
+                name=name, league=league, rating=self.base_rating + league_offset(league)
+            )
+            self._lookup[name.lower()] = name
+        return team
+
+    def get(self, *names: Optional[str]) -> Optional[TeamRating]:
+        """Rating do primeiro nome conhecido (case-insensitive; aceita nome ou sigla)"""
+        for name in names:
+            if not name:
+                continue
+            canonical = self._lookup.get(name.lower())
+            if canonical is not None:
+                return self.teams[canonical]
+        return None
+
+    def rating_of(self, name: str, league: Optional[str] = None) -> float:
+        """Rating do time ou inicial da liga se ainda não jogou"""
+        team = self.get(name)
+        return team.rating if team else self.base_rating + league_offset(league)
+
+    def update(self, result) -> bool:
+        """
+        Aplica uma partida (O(1))
+
+        Returns:
+            False se a partida é anterior à última aplicada (o chamador
+            deve fazer replay para manter a ordem cronológica)
+        """
+        team1 = self._team(result.team1, result.league)
+        team2 = self._team(result.team2, result.league)
+
+        expected1 = expected_score(team1.rating, team2.rating)
+        score1 = 1.0 if result.winner == result.team1 else 0.0
+
+        k = self.k_factor * IMPORTANCE_K_MULTIPLIERS.get(result.importance, 1.0)
+        for team, delta in ((team1, score1 - expected1), (team2, expected1 - score1)):
+            multiplier = PROVISIONAL_K_MULTIPLIER if team.games < PROVISIONAL_GAMES else 1.0
+            team.rating += k * multiplier * delta
+            team.games += 1
+            team.last_played = max(team.last_played, result.date)
+        (team1 if score1 else team2).wins += 1
+
+        in_order = result.date >= self.last_date
+        self.last_date = max(self.last_date, result.date)
+        self.matches_applied += 1
+        return in_order
+
+    def apply(self, results: List[Any]) -> bool:
+        """Aplica um lote já ordenado por data; False se exigir replay"""
+        if results and results[0].date < self.last_date:
+            return False
+        for result in results:
+            self.update(result)
+        return True
+
+    def replay(self, results: Iterable[Any]) -> None:
+        """Recalcula todos os ratings a partir do histórico completo"""
+        self.reset()
+        for result in sorted(results, key=lambda result: result.date):
+            self.update(result)
+
+    def win_probability(self, team1: str, team2: str,
+                        league: Optional[str] = None) -> Tuple[float, float]:
+        """Probabilidades (team1, team2) pelos ratings atuais"""
+        probability = expected_score(self.rating_of(team1, league), self.rating_of(team2, league))
+        return probability, 1.0 - probability
+
+    def is_rated(self, *names: Optional[str]) -> bool:
+        """Time tem partidas suficientes para o rating ser usado"""
+        team = self.get(*names)
+        return team is not None and not team.provisional
+
+    def rankings(self, league: Optional[str] = None, limit: int = 20) -> List[TeamRating]:
+        """Times ordenados por rating (opcionalmente de uma liga)"""
+        teams = [
+            team for team in self.teams.values()
+            if league is None or team.league.upper() == league.upper()
+        ]
+        return sorted(teams, key=lambda team: team.rating, reverse=True)[:limit]
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {"rating": round(team.rating, 1), "games": team.games, "league": team.league}
+            for name, team in self.teams.items()
+        }
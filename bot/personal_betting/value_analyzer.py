@@ -131,9 +131,11 @@ class ManualValueAnalyzer:
     - Integração com bankroll manager
     """
     
-    def __init__(self, data_file: str = "bot/data/personal_betting/value_analysis.json"):
-        """Inicializa o analisador de value"""
+    def __init__(self, data_file: str = "bot/data/personal_betting/value_analysis.json",
+                 store=None):
+        """Inicializa o analisador de value (store: PersonalBettingStore opcional)"""
         self.data_file = data_file
+        self.store = store
         self.data_dir = os.path.dirname(data_file)
         
         # Cria diretório se não existir
@@ -232,7 +234,7 @@ class ManualValueAnalyzer:
             self.analyses.append(analysis)
             
             # Salva dados
-            self._save_data()
+            self._save_data(analysis)
             
             logger.info(f"Análise criada: {team1_analysis.name} vs {team2_analysis.name}")
             
@@ -261,7 +263,16 @@ class ManualValueAnalyzer:
             cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
             value_bets = []
             
-            for analysis in self.analyses:
+            if self.store:
+                # Pré-filtro por data e confiança via índice do SQLite
+                candidates = [
+                    MatchAnalysis.from_dict(data)
+                    for data in self.store.find_value_analyses(cutoff_time.isoformat(), min_confidence)
+                ]
+            else:
+                candidates = self.analyses
+            
+            for analysis in candidates:
                 # Filtra por idade
                 if analysis.date < cutoff_time:
                     continue
@@ -667,6 +678,14 @@ class ManualValueAnalyzer:
     def _load_data(self):
         """Carrega dados do arquivo"""
         try:
+            if self.store:
+                self.analyses = [
+                    MatchAnalysis.from_dict(analysis_data)
+                    for analysis_data in self.store.load_value_analyses()
+                ]
+                logger.info(f"Dados carregados do SQLite: {len(self.analyses)} análises")
+                return
+            
             if os.path.exists(self.data_file):
                 with open(self.data_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
@@ -681,9 +700,14 @@ class ManualValueAnalyzer:
         except Exception as e:
             logger.warning(f"Erro ao carregar dados: {e}")
     
-    def _save_data(self):
-        """Salva dados no arquivo"""
+    def _save_data(self, analysis: Optional[MatchAnalysis] = None):
+        """Salva dados no arquivo (no SQLite, apenas a análise alterada)"""
         try:
+            if self.store:
+                changed = [analysis] if analysis else self.analyses
+                self.store.upsert_value_analyses([a.to_dict() for a in changed])
+                return
+            
             data = {
                 'analyses': [analysis.to_dict() for analysis in self.analyses],
                 'last_updated': datetime.now().isoformat()
@@ -696,9 +720,9 @@ class ManualValueAnalyzer:
             logger.error(f"Erro ao salvar dados: {e}")
 
 
-def create_default_analyzer() -> ManualValueAnalyzer:
+def create_default_analyzer(store=None) -> ManualValueAnalyzer:
     """Cria analisador com configurações padrão"""
-    return ManualValueAnalyzer()
+    return ManualValueAnalyzer(store=store)
 
 
 if __name__ == "__main__":
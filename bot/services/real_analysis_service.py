@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 from ..api_clients.lolesports_api_client import LoLEsportsAPIClient
+from ..personal_betting.team_ratings import TeamRatingEngine, expected_score
 from ..utils.logger_config import get_logger
 
 logger = get_logger(__name__)
@@ -17,50 +18,132 @@ class RealAnalysisService:
     Substitui os dados hardcoded por análises baseadas em dados reais
     """
     
-    def __init__(self):
+    def __init__(self, rating_engine: Optional[TeamRatingEngine] = None):
         self.api_client = LoLEsportsAPIClient()
+        # Ratings Elo compartilhados (ex.: PreGameAnalyzer.ratings); None = só heurística
+        self.rating_engine = rating_engine
         self.teams_cache = {}
         self.leagues_cache = {}
         self.cache_expiry = 3600  # 1 hora
+        self.refresh_retry_seconds = 60  # Intervalo mínimo entre tentativas após falha
         self.last_cache_update = 0
+        self.last_refresh_attempt = 0
+
+        # Stale-while-revalidate: snapshot atual é servido enquanto a task atualiza
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_lock = asyncio.Lock()
+        self._persistent_session = False
     
     async def __aenter__(self):
-        await self.api_client.__aenter__()
+        await self.api_client.start_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.api_client.__aexit__(exc_type, exc_val, exc_tb)
+        # Sessão persistente (start/close) não é fechada a cada comando
+        if not self._persistent_session:
+            await self.close()
+
+    async def start(self) -> None:
+        """Abre a sessão persistente e aquece o cache em background"""
+        await self.api_client.start_session()
+        self._persistent_session = True
+        self._schedule_refresh()
+        logger.info("RealAnalysisService iniciado com sessão persistente")
+
+    async def close(self) -> None:
+        """Cancela a atualização em andamento e fecha a sessão"""
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+        self._refresh_task = None
+        self._persistent_session = False
+        await self.api_client.close_session()
+
+    @property
+    def has_snapshot(self) -> bool:
+        return self.last_cache_update > 0
+
+    def _is_cache_stale(self, current_time: float) -> bool:
+        return current_time - self.last_cache_update > self.cache_expiry
     
     async def _update_cache_if_needed(self):
-        """Atualiza cache de times e ligas se necessário"""
+        """
+        Garante cache de times e ligas (stale-while-revalidate)
+
+        Sem snapshot, aguarda a primeira carga. Com snapshot expirado,
+        serve o snapshot atual e atualiza em background.
+        """
         current_time = datetime.now().timestamp()
-        
-        if current_time - self.last_cache_update > self.cache_expiry:
+
+        if not self._is_cache_stale(current_time):
+            return
+
+        if not self.has_snapshot:
+            await self._refresh_cache()
+            return
+
+        self._schedule_refresh()
+
+    def _schedule_refresh(self) -> None:
+        """Dispara atualização em background (no máximo uma por vez)"""
+        if self._refresh_task and not self._refresh_task.done():
+            return
+
+        current_time = datetime.now().timestamp()
+        if current_time - self.last_refresh_attempt < self.refresh_retry_seconds:
+            return
+
+        self._refresh_task = asyncio.create_task(self._refresh_cache())
+
+    async def _refresh_cache(self) -> None:
+        """Baixa times e ligas e troca o snapshot de uma vez"""
+        async with self._refresh_lock:
+            current_time = datetime.now().timestamp()
+
+            # Outra chamada concorrente já atualizou
+            if not self._is_cache_stale(current_time):
+                return
+            # Falha recente: mantém o snapshot (ou vazio) sem martelar a API
+            if current_time - self.last_refresh_attempt < self.refresh_retry_seconds:
+                return
+
+            self.last_refresh_attempt = current_time
             logger.info("Atualizando cache de times e ligas...")
-            
+
             try:
+                await self.api_client.start_session()
+
                 # Buscar times
                 teams = await self.api_client.get_teams()
-                self.teams_cache = {}
+                teams_cache = {}
                 for team in teams:
                     team_name = team.get('name')
                     if team_name and isinstance(team_name, str) and team_name.strip():
-                        self.teams_cache[team_name.lower()] = team
+                        teams_cache[team_name.lower()] = team
                         
                         # Também adicionar por código se disponível
                         team_code = team.get('code')
                         if team_code and isinstance(team_code, str) and team_code.strip():
-                            self.teams_cache[team_code.lower()] = team
+                            teams_cache[team_code.lower()] = team
                 
                 # Buscar ligas
                 leagues = await self.api_client.get_leagues()
-                self.leagues_cache = {}
+                leagues_cache = {}
                 for league in leagues:
                     league_name = league.get('name')
                     if league_name and isinstance(league_name, str) and league_name.strip():
-                        self.leagues_cache[league_name.lower()] = league
-                
-                self.last_cache_update = current_time
+                        leagues_cache[league_name.lower()] = league
+
+                if not teams_cache and self.teams_cache:
+                    logger.warning("API retornou lista de times vazia - mantendo snapshot anterior")
+                    return
+
+                self.teams_cache = teams_cache
+                self.leagues_cache = leagues_cache
+                self.last_cache_update = datetime.now().timestamp()
                 logger.info(f"Cache atualizado: {len(self.teams_cache)} times, {len(self.leagues_cache)} ligas")
                 
             except Exception as e:
@@ -144,8 +227,14 @@ class RealAnalysisService:
         team2_score = self._calculate_team_strength(team2_data)
         
         total_score = team1_score + team2_score
+        team1_rating = self._get_team_rating(team1_data)
+        team2_rating = self._get_team_rating(team2_data)
         
-        if total_score > 0:
+        if team1_rating and team2_rating:
+            # Ratings Elo: lookup + logística
+            team1_prob = expected_score(team1_rating.rating, team2_rating.rating) * 100
+            team2_prob = 100 - team1_prob
+        elif total_score > 0:
             team1_prob = (team1_score / total_score) * 100
             team2_prob = (team2_score / total_score) * 100
         else:
@@ -191,13 +280,30 @@ class RealAnalysisService:
             "details": {
                 "team1_strength": team1_score,
                 "team2_strength": team2_score,
-                "analysis_method": "real_data_based",
+                "team1_rating": round(team1_rating.rating, 1) if team1_rating else None,
+                "team2_rating": round(team2_rating.rating, 1) if team2_rating else None,
+                "analysis_method": "elo_rating" if team1_rating and team2_rating else "real_data_based",
                 "data_quality": "high" if total_score > 0 else "medium"
             }
         }
     
+    def _get_team_rating(self, team_data: Dict):
+        """Rating Elo do time (por nome ou sigla), se houver histórico suficiente"""
+        if not self.rating_engine:
+            return None
+        names = (team_data.get('name'), team_data.get('code'))
+        if not self.rating_engine.is_rated(*names):
+            return None
+        return self.rating_engine.get(*names)
+    
     def _calculate_team_strength(self, team_data: Dict) -> float:
         """Calcula força do time baseado nos dados disponíveis"""
+        team_rating = self._get_team_rating(team_data)
+        if team_rating:
+            # Escala do Elo para 10-90: ±400 pontos da base cobrem a faixa
+            strength = 50.0 + (team_rating.rating - self.rating_engine.base_rating) / 10
+            return max(10.0, min(90.0, strength))
+        
         strength = 50.0  # Base strength
         
         # Fatores que podem influenciar a força (baseado nos dados da API)
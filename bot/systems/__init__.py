@@ -4,9 +4,22 @@ Sistemas principais do Bot LoL V3 Ultra Avançado
 Este módulo contém os sistemas centrais de processamento:
 - Sistema de Tips Profissionais: Geração e validação de tips
 - Gerenciador de Cronograma: Orquestração e automação
+- Stream de Livestats: Ingestão orientada a eventos do feed ao vivo
 """
 
-from .tips_system import ProfessionalTipsSystem, TipStatus, GeneratedTip, MonitoringStats
+from .tips_system import (
+    ProfessionalTipsSystem,
+    TipStatus,
+    GeneratedTip,
+    MonitoringStats,
+    DraftCacheEntry
+)
+from .live_stats_stream import (
+    LiveStatsStream,
+    LiveStatsEvent,
+    LiveEventType,
+    RecordedLiveStatsFeed
+)
 from .schedule_manager import (
     ScheduleManager,
     TaskStatus,
@@ -20,6 +33,11 @@ __all__ = [
     'TipStatus',
     'GeneratedTip',
     'MonitoringStats',
+    'DraftCacheEntry',
+    'LiveStatsStream',
+    'LiveStatsEvent',
+    'LiveEventType',
+    'RecordedLiveStatsFeed',
     'ScheduleManager',
     'TaskStatus',
     'TaskType',
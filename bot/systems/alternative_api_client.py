@@ -7,11 +7,18 @@ import asyncio
 import aiohttp
 import json
 import logging
+import time
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Intervalo para reconsultar a versão mais recente do Data Dragon
+DDRAGON_VERSION_TTL_SECONDS = 6 * 3600
+
+# Máximo de partidas com fonte preferida memorizada
+MAX_PREFERRED_SOURCES = 512
+
 @dataclass
 class CompositionData:
     """Dados de composição obtidos de APIs alternativas"""
@@ -26,19 +33,72 @@ class CompositionData:
 class AlternativeAPIClient:
     """Cliente para obter dados de composições de APIs gratuitas"""
     
+    # Tabelas championId -> nome do Data Dragon, compartilhadas por patch
+    _champion_maps_by_patch: Dict[str, Dict[int, str]] = {}
+    _latest_ddragon_version: Optional[str] = None
+    _ddragon_version_checked_at: float = 0.0
+    
     def __init__(self):
         self.session = None
         self._champion_id_map = {}
+        self._champion_lock: Optional[asyncio.Lock] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Última API que respondeu com draft completo, por partida
+        self._preferred_sources: Dict[str, str] = {}
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=5)
-        )
+        await self.start_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        await self.close_session()
+    
+    async def start_session(self) -> None:
+        """Inicia sessão HTTP com keep-alive e cache de DNS"""
+        loop = asyncio.get_running_loop()
+        if self.session and not self.session.closed:
+            if self._session_loop is loop:
+                return
+            self._discard_stale_session(self.session, self._session_loop)
+        
+        self.session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=5),
+            connector=aiohttp.TCPConnector(
+                limit=20,
+                limit_per_host=5,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+        )
+        self._session_loop = loop
+        self._champion_lock = asyncio.Lock()
+        logger.debug("Sessão HTTP de APIs alternativas iniciada")
+    
+    @staticmethod
+    def _discard_stale_session(session: aiohttp.ClientSession,
+                               session_loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """
+        Libera a sessão criada em outro event loop
+        
+        Ela não pode ser aguardada no loop atual: se o loop de origem ainda
+        roda (outra thread) o close é agendado nele; senão a sessão é
+        desacoplada do connector (as conexões morreram com o loop).
+        """
+        if session_loop is not None and session_loop.is_running() and not session_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+            logger.debug("Sessão HTTP de APIs alternativas de outro loop agendada para fechamento")
+            return
+        
+        session.detach()
+        logger.warning("Sessão HTTP de APIs alternativas de um loop encerrado descartada")
+    
+    async def close_session(self) -> None:
+        """Fecha sessão HTTP"""
+        if self.session and not self.session.closed:
             await self.session.close()
+            logger.debug("Sessão HTTP de APIs alternativas fechada")
+        self.session = None
     
     async def get_compositions_for_match(self, match_data) -> Optional[CompositionData]:
         """
@@ -52,6 +112,12 @@ class AlternativeAPIClient:
             ("Game Stats Scraping", self._scrape_game_stats)
         ]
         
+        # Tenta primeiro a API que respondeu da última vez para esta partida
+        match_key = str(getattr(match_data, 'match_id', '') or '')
+        preferred = self._preferred_sources.get(match_key)
+        if preferred:
+            methods.sort(key=lambda item: item[0] != preferred)
+        
         for api_name, method in methods:
             try:
                 logger.debug(f"🔍 Tentando {api_name}...")
@@ -60,6 +126,7 @@ class AlternativeAPIClient:
                 
                 if result and result.draft_complete:
                     logger.info(f"✅ Composições obtidas via {api_name}")
+                    self._remember_source(match_key, api_name)
                     return result
                 elif result:
                     logger.debug(f"⏳ Dados parciais de {api_name}")
@@ -73,6 +140,18 @@ class AlternativeAPIClient:
         logger.warning("❌ Nenhuma API alternativa forneceu composições completas")
         return None
     
+    def _remember_source(self, match_key: str, api_name: str) -> None:
+        """Memoriza a API que respondeu para priorizá-la na próxima consulta"""
+        if not match_key:
+            return
+        
+        self._preferred_sources.pop(match_key, None)
+        self._preferred_sources[match_key] = api_name
+        
+        # Descarta as entradas mais antigas (dict mantém ordem de inserção)
+        while len(self._preferred_sources) > MAX_PREFERRED_SOURCES:
+            self._preferred_sources.pop(next(iter(self._preferred_sources)))
+    
     async def _get_live_client_data(self, match_data) -> Optional[CompositionData]:
         """Tenta obter dados do Live Client Data API (127.0.0.1:2999)"""
         try:
@@ -457,7 +536,7 @@ class AlternativeAPIClient:
     async def _get_champion_name(self, champion_id: int) -> Optional[str]:
         """Converte champion ID para nome usando Data Dragon"""
         try:
-            if not self._champion_id_map:
+            if not self._champion_id_map or self._ddragon_version_is_stale():
                 await self._load_champion_data()
             
             return self._champion_id_map.get(champion_id)
@@ -466,33 +545,65 @@ class AlternativeAPIClient:
             logger.debug(f"Champion name lookup error: {e}")
             return f"Champion_{champion_id}"
     
+    @classmethod
+    def _ddragon_version_is_stale(cls) -> bool:
+        """Verifica se a versão do Data Dragon precisa ser reconsultada"""
+        return time.time() - cls._ddragon_version_checked_at > DDRAGON_VERSION_TTL_SECONDS
+    
     async def _load_champion_data(self):
-        """Carrega dados de champions do Data Dragon"""
-        try:
-            # Pega versão mais recente
-            versions_url = 'https://ddragon.leagueoflegends.com/api/versions.json'
-            
-            async with self.session.get(versions_url) as response:
-                if response.status == 200:
-                    versions = await response.json()
-                    latest_version = versions[0]
-                    
-                    # Carrega dados dos champions
-                    champ_url = f'https://ddragon.leagueoflegends.com/cdn/{latest_version}/data/en_US/champion.json'
+        """
+        Carrega dados de champions do Data Dragon
+        
+        A tabela é baixada uma vez por patch e compartilhada entre instâncias;
+        versions.json só é reconsultado a cada DDRAGON_VERSION_TTL_SECONDS.
+        """
+        cls = type(self)
+        # Sem start_session: cria o lock uma única vez e o reaproveita
+        if self._champion_lock is None:
+            self._champion_lock = asyncio.Lock()
+        
+        async with self._champion_lock:
+            try:
+                # Pega versão mais recente (apenas se a anterior estiver velha)
+                if cls._latest_ddragon_version is None or self._ddragon_version_is_stale():
+                    versions_url = 'https://ddragon.leagueoflegends.com/api/versions.json'
                     
-                    async with self.session.get(champ_url) as champ_response:
-                        if champ_response.status == 200:
-                            champ_data = await champ_response.json()
-                            
-                            # Cria mapeamento ID -> Nome
-                            for champ_name, champ_info in champ_data['data'].items():
-                                champ_id = int(champ_info['key'])
-                                self._champion_id_map[champ_id] = champ_name
-                            
-                            logger.debug(f"Carregados {len(self._champion_id_map)} champions")
+                    async with self.session.get(versions_url) as response:
+                        if response.status == 200:
+                            versions = await response.json()
+                            cls._latest_ddragon_version = versions[0]
+                            cls._ddragon_version_checked_at = time.time()
+                
+                latest_version = cls._latest_ddragon_version
+                if not latest_version:
+                    return
+                
+                # Reaproveita tabela já carregada para este patch
+                cached_map = cls._champion_maps_by_patch.get(latest_version)
+                if cached_map:
+                    self._champion_id_map = cached_map
+                    return
+                
+                # Carrega dados dos champions
+                champ_url = f'https://ddragon.leagueoflegends.com/cdn/{latest_version}/data/en_US/champion.json'
+                
+                async with self.session.get(champ_url) as champ_response:
+                    if champ_response.status == 200:
+                        champ_data = await champ_response.json()
+                        
+                        # Cria mapeamento ID -> Nome
+                        champion_map = {}
+                        for champ_name, champ_info in champ_data['data'].items():
+                            champ_id = int(champ_info['key'])
+                            champion_map[champ_id] = champ_name
+                        
+                        cls._champion_maps_by_patch[latest_version] = champion_map
+                        self._champion_id_map = champion_map
+                        
+                        logger.debug(f"Carregados {len(champion_map)} champions (patch {latest_version})")
                             
-        except Exception as e:
-            logger.error(f"Erro ao carregar dados de champions: {e}")
+            except Exception as e:
+                logger.error(f"Erro ao carregar dados de champions: {e}")
     
     async def _get_game_draft_data(self, game_id: str) -> Optional[CompositionData]:
         """Obtém dados específicos de draft de um game"""
@@ -541,8 +652,29 @@ class AlternativeAPIClient:
         
         return None
 
+# Cliente compartilhado pelo processo (mantém conexões keep-alive e DNS em cache)
+_shared_client: Optional[AlternativeAPIClient] = None
+
+
+async def get_shared_alternative_client() -> AlternativeAPIClient:
+    """Retorna o cliente compartilhado, iniciando/reiniciando a sessão se necessário"""
+    global _shared_client
+    
+    if _shared_client is None:
+        _shared_client = AlternativeAPIClient()
+    
+    await _shared_client.start_session()
+    return _shared_client
+
+
+async def close_shared_alternative_client() -> None:
+    """Fecha a sessão do cliente compartilhado (chamar no shutdown)"""
+    if _shared_client is not None:
+        await _shared_client.close_session()
+
+
 # Função de conveniência para uso standalone
 async def get_match_compositions(match_data) -> Optional[CompositionData]:
     """Função de conveniência para obter composições de um match"""
-    async with AlternativeAPIClient() as client:
-        return await client.get_compositions_for_match(match_data) 
\ No newline at end of file
+    client = await get_shared_alternative_client()
+    return await client.get_compositions_for_match(match_data)
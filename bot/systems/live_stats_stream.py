@@ -0,0 +1,457 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from ..data_models.match_data import DraftData, MatchData, TeamStats
+from ..utils.constants import (
+    LIVE_STREAM_MIN_POLL_SECONDS,
+    LIVE_STREAM_MAX_POLL_SECONDS,
+    LIVE_STREAM_DISCOVERY_SECONDS,
+)
+from ..utils.logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class LiveEventType(Enum):
+    """Tipos de evento emitidos pelo stream de livestats"""
+    DRAFT_COMPLETE = "draft_complete"
+    STATE_CHANGE = "state_change"
+    GAME_FINISHED = "game_finished"
+
+
+@dataclass
+class LiveStatsEvent:
+    """Evento de mudança em um game ao vivo"""
+    event_type: LiveEventType
+    game_id: str
+    match: MatchData
+    game_state: str = ""
+    previous_state: str = ""
+    created_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class TrackedGame:
+    """Estado de um game em acompanhamento pelo stream"""
+    game_id: str
+    match: MatchData
+    cursor: Optional[str] = None  # startingTime da próxima consulta (RFC3339)
+    game_state: str = ""
+    draft_emitted: bool = False
+    seen_pregame: bool = False  # consultado antes do primeiro frame: relógio ancorado
+    late_join: bool = False     # descoberto com o game já rodando: sem draft/tips
+    first_frame_at: Optional[datetime] = None
+    last_frame_at: Optional[datetime] = None
+    poll_interval: float = LIVE_STREAM_MIN_POLL_SECONDS
+    next_poll_at: float = 0.0
+    polls: int = 0
+
+
+def _parse_rfc3339(value: str) -> Optional[datetime]:
+    """Converte timestamp RFC3339 do feed em datetime UTC"""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None
+
+
+def _format_cursor(moment: datetime) -> str:
+    """Formata cursor startingTime (o feed exige múltiplos de 10 segundos)"""
+    moment = moment.astimezone(timezone.utc)
+    moment = moment - timedelta(seconds=moment.second % 10, microseconds=moment.microsecond)
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+class LiveStatsStream:
+    """
+    Ingestão em streaming do feed livestats (/window/{gameId})
+
+    Em vez de varrer as listas de partidas a cada 3 minutos:
+    - Descobre games em andamento via getLive em cadência lenta
+    - Consulta apenas os games em andamento, avançando o cursor startingTime
+    - Cadência adaptativa: rápida até o draft fechar e na janela de tip,
+      mais lenta quando não há frames novos
+    - Publica eventos de draft completo e mudança de estado em uma asyncio.Queue
+
+    O cliente pode ser o RiotAPIClient ou um RecordedLiveStatsFeed
+    (replay de um feed gravado em JSONL) para testes. As consultas usam
+    fresh=True: o cache "live" do cliente (até 30s) anularia a cadência de 2s.
+    """
+
+    def __init__(
+        self,
+        riot_client,
+        event_queue: Optional[asyncio.Queue] = None,
+        min_poll_seconds: float = LIVE_STREAM_MIN_POLL_SECONDS,
+        max_poll_seconds: float = LIVE_STREAM_MAX_POLL_SECONDS,
+        discovery_seconds: float = LIVE_STREAM_DISCOVERY_SECONDS,
+        tip_window_seconds: float = 120.0
+    ):
+        """
+        Inicializa o stream
+
+        Args:
+            riot_client: Cliente com get_live_matches() e get_live_match_window()
+            event_queue: Fila onde os eventos serão publicados
+            min_poll_seconds: Intervalo mínimo entre consultas de um game
+            max_poll_seconds: Intervalo máximo entre consultas de um game
+            discovery_seconds: Intervalo entre descobertas de games (getLive)
+            tip_window_seconds: Janela pós-draft em que a cadência fica mínima
+        """
+        self.riot_client = riot_client
+        self.event_queue: asyncio.Queue = event_queue or asyncio.Queue()
+        self.min_poll_seconds = min_poll_seconds
+        self.max_poll_seconds = max_poll_seconds
+        self.discovery_seconds = discovery_seconds
+        self.tip_window_seconds = tip_window_seconds
+
+        self.tracked_games: Dict[str, TrackedGame] = {}
+        self.is_running = False
+        self._last_discovery: Optional[float] = None
+
+        self.stats = {
+            "discoveries": 0,
+            "window_polls": 0,
+            "events_published": 0,
+            "games_finished": 0,
+            "late_joins": 0
+        }
+
+        logger.info("LiveStatsStream inicializado")
+
+    async def run(self) -> None:
+        """Loop principal: descoberta periódica + polling dos games em andamento"""
+        self.is_running = True
+        logger.info("📡 Stream de livestats iniciado")
+
+        try:
+            while self.is_running:
+                await self.step()
+                await asyncio.sleep(self._seconds_until_next_poll())
+        except asyncio.CancelledError:
+            logger.info("Stream de livestats cancelado")
+            raise
+        finally:
+            self.is_running = False
+
+    def stop(self) -> None:
+        """Sinaliza parada do loop"""
+        self.is_running = False
+
+    async def step(self, now: Optional[float] = None) -> int:
+        """
+        Executa um ciclo: descoberta (se vencida) e consulta dos games vencidos
+
+        Returns:
+            Número de eventos publicados neste ciclo
+        """
+        now = now if now is not None else time.time()
+        published_before = self.stats["events_published"]
+
+        if self._last_discovery is None or now - self._last_discovery >= self.discovery_seconds:
+            await self.discover_games()
+            self._last_discovery = now
+
+        due_games = [
+            game for game in self.tracked_games.values()
+            if game.next_poll_at <= now
+        ]
+        if due_games:
+            results = await asyncio.gather(
+                *(self._poll_game(game, now) for game in due_games),
+                return_exceptions=True
+            )
+            for game, result in zip(due_games, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Erro ao consultar livestats do game {game.game_id}: {result}")
+                    self._schedule_next_poll(game, now, has_new_frames=False)
+
+        return self.stats["events_published"] - published_before
+
+    async def discover_games(self) -> None:
+        """Descobre games em andamento via endpoint de lista (getLive)"""
+        try:
+            events = await self.riot_client.get_live_matches(fresh=True)
+        except Exception as e:
+            logger.warning(f"Erro na descoberta de games ao vivo: {e}")
+            return
+
+        self.stats["discoveries"] += 1
+        in_progress = set()
+
+        for event in events or []:
+            if not isinstance(event, dict):
+                continue
+
+            for game in event.get("match", {}).get("games", []):
+                game_id = str(game.get("id", ""))
+                if not game_id or game.get("state") != "inProgress":
+                    continue
+
+                in_progress.add(game_id)
+                if game_id not in self.tracked_games:
+                    self.track_game(game_id, self._build_match(event, game))
+
+        # Games que saíram da lista sem frame "finished" no feed
+        for game_id in [gid for gid in self.tracked_games if gid not in in_progress]:
+            game = self.tracked_games.pop(game_id)
+            self.stats["games_finished"] += 1
+            await self._publish(LiveEventType.GAME_FINISHED, game, game.game_state)
+
+    def track_game(self, game_id: str, match: MatchData) -> TrackedGame:
+        """Passa a acompanhar um game em andamento"""
+        tracked = TrackedGame(game_id=str(game_id), match=match, poll_interval=self.min_poll_seconds)
+        self.tracked_games[tracked.game_id] = tracked
+        logger.info(f"📡 Acompanhando game {game_id}: {match.team1_name} vs {match.team2_name}")
+        return tracked
+
+    def _build_match(self, event: Dict[str, Any], game: Dict[str, Any]) -> MatchData:
+        """Cria MatchData a partir do evento getLive e do game em andamento"""
+        match = MatchData.from_api_data(event, api_source="riot")
+        try:
+            match.game_number = int(game.get("number", match.game_number))
+        except (TypeError, ValueError):
+            pass
+        return match
+
+    async def _poll_game(self, game: TrackedGame, now: float) -> None:
+        """Consulta a janela de um game a partir do cursor e publica mudanças"""
+        game.polls += 1
+        self.stats["window_polls"] += 1
+
+        window = await self.riot_client.get_live_match_window(game.game_id, game.cursor, fresh=True)
+        frames = (window or {}).get("frames", [])
+
+        new_frames = []
+        for frame in frames:
+            frame_at = _parse_rfc3339(frame.get("rfc460Timestamp", ""))
+            if frame_at is None:
+                continue
+            if game.last_frame_at is None or frame_at > game.last_frame_at:
+                new_frames.append((frame_at, frame))
+
+        if game.first_frame_at is None:
+            if not new_frames:
+                game.seen_pregame = True
+            elif not game.seen_pregame:
+                self._mark_late_join(game)
+
+        if window and not game.draft_emitted:
+            await self._check_draft(game, window)
+
+        for frame_at, frame in new_frames:
+            if game.first_frame_at is None:
+                game.first_frame_at = frame_at
+            game.last_frame_at = frame_at
+            await self._apply_frame_state(game, frame)
+
+        if game.last_frame_at is not None:
+            game.cursor = _format_cursor(game.last_frame_at)
+
+        self._schedule_next_poll(game, now, has_new_frames=bool(new_frames))
+
+    def _mark_late_join(self, game: TrackedGame) -> None:
+        """
+        Game cujo primeiro poll já trouxe frames (restart do bot, stream ligado no meio)
+
+        A janela não informa o relógio do game: o primeiro frame visto não é o
+        início da partida, então a janela de tip não pode ser avaliada. O game
+        segue acompanhado (estado/fim), mas nunca publica DRAFT_COMPLETE.
+        """
+        game.late_join = True
+        game.draft_emitted = True
+        self.stats["late_joins"] += 1
+        logger.info(f"📡 Game {game.game_id} descoberto já em andamento - sem draft/tips pelo stream")
+
+    async def _check_draft(self, game: TrackedGame, window: Dict[str, Any]) -> None:
+        """Publica DRAFT_COMPLETE quando os 10 campeões estão no metadata"""
+        metadata = window.get("gameMetadata", {})
+        blue = self._extract_champions(metadata.get("blueTeamMetadata", {}))
+        red = self._extract_champions(metadata.get("redTeamMetadata", {}))
+
+        if len(blue) != 5 or len(red) != 5:
+            return
+
+        game.match.team1_composition = [{'name': champ} for champ in blue]
+        game.match.team2_composition = [{'name': champ} for champ in red]
+        game.match.draft_data = DraftData(team1_picks=blue, team2_picks=red)
+        game.match.has_complete_draft = True
+        game.draft_emitted = True
+
+        logger.info(f"✅ Draft completo via livestats: game {game.game_id}")
+        await self._publish(LiveEventType.DRAFT_COMPLETE, game)
+
+    @staticmethod
+    def _extract_champions(team_metadata: Dict[str, Any]) -> List[str]:
+        """Extrai nomes de campeões do metadata de um time"""
+        return [
+            str(participant["championId"])
+            for participant in team_metadata.get("participantMetadata", [])
+            if participant.get("championId")
+        ]
+
+    async def _apply_frame_state(self, game: TrackedGame, frame: Dict[str, Any]) -> None:
+        """Atualiza tempo/estado do game e publica mudanças de estado"""
+        if game.first_frame_at and game.last_frame_at and not game.late_join:
+            # Primeiro frame visto = início do game (houve poll anterior sem frames)
+            game.match.game_time_seconds = int((game.last_frame_at - game.first_frame_at).total_seconds())
+        self._apply_team_stats(game.match, frame)
+
+        state = str(frame.get("gameState", "")).lower()
+        if not state or state == game.game_state:
+            return
+
+        previous_state = game.game_state
+        game.game_state = state
+        game.match.status = state
+
+        if state == "finished":
+            self.tracked_games.pop(game.game_id, None)
+            self.stats["games_finished"] += 1
+            await self._publish(LiveEventType.GAME_FINISHED, game, previous_state)
+        else:
+            await self._publish(LiveEventType.STATE_CHANGE, game, previous_state)
+
+    @staticmethod
+    def _apply_team_stats(match: MatchData, frame: Dict[str, Any]) -> None:
+        """Atualiza estatísticas dos times a partir de um frame da janela"""
+        blue = frame.get("blueTeam")
+        red = frame.get("redTeam")
+        if not isinstance(blue, dict) or not isinstance(red, dict):
+            return
+
+        def to_stats(team_name: str, team_frame: Dict[str, Any]) -> TeamStats:
+            return TeamStats(
+                team_name=team_name,
+                total_gold=int(team_frame.get("totalGold", 0)),
+                total_kills=int(team_frame.get("totalKills", 0)),
+                towers_destroyed=int(team_frame.get("towers", 0)),
+                dragons_taken=len(team_frame.get("dragons", [])),
+                barons_taken=int(team_frame.get("barons", 0)),
+                inhibitors=int(team_frame.get("inhibitors", 0))
+            )
+
+        match.team1_stats = to_stats(match.team1_name, blue)
+        match.team2_stats = to_stats(match.team2_name, red)
+        match.has_live_stats = True
+        match.calculate_differences()
+        match.determine_favored_team()
+
+    def _schedule_next_poll(self, game: TrackedGame, now: float, has_new_frames: bool) -> None:
+        """Cadência adaptativa por game"""
+        in_tip_window = not game.late_join and (
+            not game.draft_emitted or
+            game.match.game_time_seconds <= self.tip_window_seconds
+        )
+
+        if not in_tip_window:
+            game.poll_interval = self.max_poll_seconds
+        elif has_new_frames:
+            game.poll_interval = self.min_poll_seconds
+        else:
+            # Sem frames novos: afasta as consultas gradualmente
+            game.poll_interval = min(self.max_poll_seconds, game.poll_interval * 1.5)
+
+        game.next_poll_at = now + game.poll_interval
+
+    def _seconds_until_next_poll(self) -> float:
+        """Tempo até o próximo game (ou descoberta) vencer"""
+        now = time.time()
+        next_times = [game.next_poll_at for game in self.tracked_games.values()]
+        if self._last_discovery is not None:
+            next_times.append(self._last_discovery + self.discovery_seconds)
+        if not next_times:
+            return 0.1
+        return max(0.1, min(next_times) - now)
+
+    async def _publish(self, event_type: LiveEventType, game: TrackedGame, previous_state: str = "") -> None:
+        """Publica evento na fila"""
+        await self.event_queue.put(LiveStatsEvent(
+            event_type=event_type,
+            game_id=game.game_id,
+            match=game.match,
+            game_state=game.game_state,
+            previous_state=previous_state
+        ))
+        self.stats["events_published"] += 1
+
+    def get_stream_status(self) -> Dict[str, Any]:
+        """Status do stream para monitoramento"""
+        return {
+            "is_running": self.is_running,
+            "tracked_games": len(self.tracked_games),
+            "queue_size": self.event_queue.qsize(),
+            "poll_intervals": {
+                game_id: round(game.poll_interval, 2)
+                for game_id, game in self.tracked_games.items()
+            },
+            **self.stats
+        }
+
+
+class RecordedLiveStatsFeed:
+    """
+    Replay de um feed livestats gravado em JSONL
+
+    Formato (uma linha por resposta, na ordem em que foram gravadas):
+        {"type": "live", "events": [...]}                       # resposta de getLive
+        {"type": "window", "game_id": "...", "response": {...}}  # resposta de /window
+
+    Cada chamada consome a próxima resposta gravada do mesmo tipo/game;
+    quando acabam, repete a última (como um feed parado).
+    """
+
+    def __init__(self, source: Union[str, Path, List[Dict[str, Any]]]):
+        if isinstance(source, (str, Path)):
+            with open(source, 'r', encoding='utf-8') as f:
+                records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = list(source)
+
+        self._live: List[List[Dict[str, Any]]] = []
+        self._windows: Dict[str, List[Dict[str, Any]]] = {}
+
+        for record in records:
+            if record.get("type") == "live":
+                self._live.append(record.get("events", []))
+            elif record.get("type") == "window":
+                self._windows.setdefault(str(record["game_id"]), []).append(record.get("response"))
+
+        self._live_index = 0
+        self._window_index: Dict[str, int] = {}
+        self.window_requests: List[Dict[str, Any]] = []
+
+    async def get_live_matches(self, locale: str = "pt-BR", fresh: bool = False) -> List[Dict[str, Any]]:
+        """Próxima resposta gravada de getLive"""
+        if not self._live:
+            return []
+
+        events = self._live[min(self._live_index, len(self._live) - 1)]
+        self._live_index += 1
+        return events
+
+    async def get_live_match_window(
+        self,
+        game_id,
+        starting_time: Optional[str] = None,
+        fresh: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Próxima resposta gravada de /window/{gameId}"""
+        game_id = str(game_id)
+        self.window_requests.append({"game_id": game_id, "starting_time": starting_time})
+
+        responses = self._windows.get(game_id)
+        if not responses:
+            return None
+
+        index = self._window_index.get(game_id, 0)
+        self._window_index[game_id] = index + 1
+        return responses[min(index, len(responses) - 1)]
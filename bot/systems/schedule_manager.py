@@ -12,9 +12,12 @@ from ..api_clients.pandascore_api_client import PandaScoreAPIClient
 from ..api_clients.riot_api_client import RiotAPIClient
 from ..telegram_bot.alerts_system import TelegramAlertsSystem
 from ..data_models.match_data import MatchData
-from ..utils.constants import SCAN_INTERVAL_MINUTES, SUPPORTED_LEAGUES, CLEANUP_INTERVAL_HOURS
+from ..utils.constants import (
+    SCAN_INTERVAL_MINUTES, SUPPORTED_LEAGUES, CLEANUP_INTERVAL_HOURS, LIVE_STREAM_ENABLED
+)
 from ..utils.helpers import get_current_timestamp
 from ..utils.logger_config import get_logger
+from .live_stats_stream import LiveStatsStream
 
 if TYPE_CHECKING:
     from .tips_system import ProfessionalTipsSystem
@@ -103,7 +106,9 @@ class ScheduleManager:
         telegram_alerts: TelegramAlertsSystem,
         pandascore_client: PandaScoreAPIClient,
         riot_client: RiotAPIClient,
-        lolesports_client=None
+        lolesports_client=None,
+        live_stream: Optional["LiveStatsStream"] = None,
+        enable_live_stream: bool = LIVE_STREAM_ENABLED
     ):
         """
         Inicializa o gerenciador de cronograma
@@ -114,18 +119,25 @@ class ScheduleManager:
             pandascore_client: Cliente do PandaScore API
             riot_client: Cliente da Riot API
             lolesports_client: Cliente da Lolesports API (opcional)
+            live_stream: Stream de livestats para tips orientadas a eventos (opcional)
+            enable_live_stream: Cria um LiveStatsStream sobre o riot_client quando
+                nenhum stream é fornecido (padrão: LIVE_STREAM_ENABLED)
         """
         self.tips_system = tips_system
         self.telegram_alerts = telegram_alerts
         self.pandascore_client = pandascore_client
         self.riot_client = riot_client
         self.lolesports_client = lolesports_client
+        self.live_stream = live_stream
+        if self.live_stream is None and enable_live_stream:
+            self.live_stream = LiveStatsStream(riot_client)
         
         # Estado do sistema
         self.is_running = False
         self.start_time = time.time()
         self.scheduled_tasks: Dict[str, ScheduledTask] = {}
         self.running_tasks: Dict[str, asyncio.Task] = {}
+        self.stream_tasks: List[asyncio.Task] = []  # Tarefas contínuas do modo streaming
         
         # Health monitoring
         self.health = SystemHealth()
@@ -167,6 +179,9 @@ class ScheduleManager:
             # Cria tarefas agendadas
             await self._create_scheduled_tasks()
             
+            # Modo streaming (eventos livestats -> tips em segundos)
+            self._start_live_stream()
+            
             # Inicia loop principal
             await self._main_scheduler_loop()
             
@@ -192,6 +207,8 @@ class ScheduleManager:
         if self.running_tasks:
             await asyncio.gather(*self.running_tasks.values(), return_exceptions=True)
         
+        await self._stop_live_stream()
+        
         # Envia alerta de parada
         await self._notify_system_stop()
         
@@ -244,6 +261,28 @@ class ScheduleManager:
         logger.info(f"✅ {len(self.scheduled_tasks)} tarefas agendadas criadas")
         self.stats["tasks_created"] = len(self.scheduled_tasks)
 
+    def _start_live_stream(self) -> None:
+        """Inicia stream de livestats e o consumidor do sistema de tips"""
+        if not self.live_stream or self.stream_tasks:
+            return
+        
+        self.stream_tasks = [
+            asyncio.create_task(self.live_stream.run()),
+            asyncio.create_task(self.tips_system.consume_live_events(self.live_stream.event_queue))
+        ]
+        logger.info("📡 Modo streaming de livestats ativo")
+
+    async def _stop_live_stream(self) -> None:
+        """Para stream de livestats e consumidor"""
+        if not self.stream_tasks:
+            return
+        
+        self.live_stream.stop()
+        for task in self.stream_tasks:
+            task.cancel()
+        await asyncio.gather(*self.stream_tasks, return_exceptions=True)
+        self.stream_tasks = []
+
     async def _main_scheduler_loop(self) -> None:
         """Loop principal do agendador"""
         logger.info("🔄 Loop principal do ScheduleManager iniciado")
@@ -608,6 +647,7 @@ class ScheduleManager:
                 "task_details": task_status
             },
             "statistics": self.stats,
+            "live_stream": self.live_stream.get_stream_status() if self.live_stream else None,
             "health": {
                 "components_status": self.health.components_status,
                 "last_tip_time": self.health.last_tip_time,
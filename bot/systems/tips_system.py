@@ -10,6 +10,8 @@ import logging
 
 from ..api_clients.pandascore_api_client import PandaScoreAPIClient
 from ..api_clients.riot_api_client import RiotAPIClient
+from ..api_clients.rate_limiter import TokenBucketRateLimiter
+from ..api_clients.response_cache import ResponseCache
 from ..core_logic import (
     DynamicPredictionSystem,
     LoLGameAnalyzer,
@@ -20,13 +22,22 @@ from ..data_models.match_data import MatchData
 from ..data_models.tip_data import ProfessionalTip
 from ..utils.constants import (
     SCAN_INTERVAL_MINUTES,
+    MAX_CONCURRENT_MATCH_PIPELINES,
+    LIVE_FETCH_TIMEOUT_SECONDS,
+    MATCH_CACHE_TIMEOUT_MINUTES,
+    DRAFT_CACHE_TTL_SECONDS,
+    MATCH_MEMO_TTL_SECONDS,
     SUPPORTED_LEAGUES,
     VALID_LIVE_STATUSES,
     PREDICTION_THRESHOLDS
 )
 from ..utils.helpers import get_current_timestamp, normalize_team_name
 from ..utils.logger_config import get_logger
-from .alternative_api_client import AlternativeAPIClient, get_match_compositions
+from .alternative_api_client import (
+    AlternativeAPIClient,
+    get_match_compositions,
+    close_shared_alternative_client
+)
 
 logger = get_logger(__name__)
 
@@ -86,6 +97,22 @@ class MonitoringStats:
         return (time.time() - self.uptime_start) / 3600
 
 
+@dataclass
+class DraftCacheEntry:
+    """Estado de draft memorizado para um mapa"""
+    game_number: int
+    draft_complete: bool
+    checked_at: float
+    source: str = ""
+    team1_composition: Optional[List[str]] = None
+    team2_composition: Optional[List[str]] = None
+    
+    @property
+    def age_seconds(self) -> float:
+        """Idade da verificação em segundos"""
+        return time.time() - self.checked_at
+
+
 class ProfessionalTipsSystem:
     """
     Sistema Profissional de Tips para League of Legends
@@ -111,7 +138,8 @@ class ProfessionalTipsSystem:
         pandascore_client: PandaScoreAPIClient,
         riot_client: RiotAPIClient,
         prediction_system: DynamicPredictionSystem,
-        telegram_alerts=None  # TelegramAlertsSystem será implementado depois
+        telegram_alerts=None,  # TelegramAlertsSystem será implementado depois
+        max_concurrent_matches: int = MAX_CONCURRENT_MATCH_PIPELINES
     ):
         """
         Inicializa o sistema profissional de tips
@@ -121,6 +149,7 @@ class ProfessionalTipsSystem:
             riot_client: Cliente da Riot API
             prediction_system: Sistema de predição dinâmico
             telegram_alerts: Sistema de alertas Telegram (opcional)
+            max_concurrent_matches: Partidas processadas em paralelo por scan
         """
         self.pandascore_client = pandascore_client
         self.riot_client = riot_client
@@ -138,12 +167,28 @@ class ProfessionalTipsSystem:
         # NOVO: Controle de tips por mapa individual (1 tip por mapa)
         self.processed_maps: Set[str] = set()  # Cache de mapas já processados
         
+        # Estado de draft por partida (completo = fixo até mudar o game)
+        self.draft_cache: Dict[str, DraftCacheEntry] = {}
+        self.draft_cache_ttl = DRAFT_CACHE_TTL_SECONDS
+        
         # Rate limiting
         self.last_tip_times: List[float] = []
         self.max_tips_per_hour = 5
         
+        # Pipeline concorrente por partida (odds + predição)
+        self.max_concurrent_matches = max(1, max_concurrent_matches)
+        self._pipeline_semaphore = asyncio.Semaphore(self.max_concurrent_matches)
+        
+        # Busca paralela das fontes ao vivo (timeout por fonte + último resultado válido)
+        self.live_source_timeouts: Dict[str, float] = {
+            "pandascore": LIVE_FETCH_TIMEOUT_SECONDS,
+            "riot": LIVE_FETCH_TIMEOUT_SECONDS
+        }
+        self._last_live_results: Dict[str, Tuple[float, List[Any]]] = {}
+        
         # Estatísticas
         self.stats = MonitoringStats()
+        self.scan_timings: Dict[str, float] = {}  # Duração (s) de cada etapa do último scan
         
         # Filtros de qualidade - AJUSTADOS para dados reais
         self.quality_filters = {
@@ -194,6 +239,9 @@ class ProfessionalTipsSystem:
                 await self.monitoring_task
             except asyncio.CancelledError:
                 pass
+        
+        # Fecha conexões persistentes das APIs alternativas
+        await close_shared_alternative_client()
 
     async def _monitoring_loop(self) -> None:
         """Loop principal de monitoramento"""
@@ -204,11 +252,15 @@ class ProfessionalTipsSystem:
                 scan_start = time.time()
                 
                 # 1. Busca partidas ao vivo
+                stage_start = time.time()
                 live_matches = await self._get_live_matches()
+                self._record_stage_timing("fetch", stage_start)
                 logger.debug(f"Encontradas {len(live_matches)} partidas ao vivo")
                 
                 # 2. Filtra partidas adequadas
+                stage_start = time.time()
                 suitable_matches = await self._filter_suitable_matches(live_matches)
+                self._record_stage_timing("filter", stage_start)
                 logger.debug(f"Filtradas {len(suitable_matches)} partidas adequadas")
                 
                 # 3. Atualiza cache de partidas monitoradas
@@ -227,6 +279,7 @@ class ProfessionalTipsSystem:
                 self.stats.last_scan_time = time.time()
                 
                 scan_duration = time.time() - scan_start
+                self._record_stage_timing("total", scan_start)
                 logger.debug(f"Scan completo em {scan_duration:.2f}s")
                 
                 # 7. Aguarda próximo ciclo
@@ -237,58 +290,123 @@ class ProfessionalTipsSystem:
                 await asyncio.sleep(30)  # Espera 30s em caso de erro
 
     async def _get_live_matches(self) -> List[MatchData]:
-        """Obtém partidas ao vivo de ambas as APIs"""
-        all_matches = []
+        """
+        Obtém partidas ao vivo de ambas as APIs em paralelo
         
+        Cada fonte tem seu próprio timeout; se uma falhar, usa o último
+        resultado válido dela (se recente) e segue com a outra. O resultado
+        final é de-duplicado por times normalizados + liga.
+        """
         try:
-            # PandaScore - partidas com odds
-            pandascore_raw = await self.pandascore_client.get_lol_live_matches()
+            pandascore_raw, riot_raw = await asyncio.gather(
+                self._fetch_live_source("pandascore", self.pandascore_client.get_lol_live_matches),
+                self._fetch_live_source("riot", self.riot_client.get_live_matches)
+            )
             logger.debug(f"PandaScore: {len(pandascore_raw)} partidas encontradas")
-            
-            # Riot API - dados detalhados de partidas  
-            riot_raw = await self.riot_client.get_live_matches()
             logger.debug(f"Riot API: {len(riot_raw)} partidas encontradas")
             
             # Converte dados raw em objetos MatchData
-            from ..data_models.match_data import MatchData
-            
-            # Converte dados do PandaScore
-            for raw_match in pandascore_raw:
-                try:
-                    if isinstance(raw_match, dict):
-                        match_obj = MatchData.from_api_data(raw_match, api_source="pandascore")
-                        all_matches.append(match_obj)
-                    elif isinstance(raw_match, MatchData):
-                        # Já é um objeto MatchData
-                        all_matches.append(raw_match)
-                    else:
-                        logger.warning(f"Tipo inesperado do PandaScore: {type(raw_match)}")
-                except Exception as e:
-                    logger.warning(f"Erro ao converter partida PandaScore: {e}")
-                    continue
+            all_matches = (
+                self._convert_raw_matches(pandascore_raw, "pandascore") +
+                self._convert_raw_matches(riot_raw, "riot")
+            )
             
-            # Converte dados do Riot API
-            for raw_match in riot_raw:
-                try:
-                    if isinstance(raw_match, dict):
-                        match_obj = MatchData.from_api_data(raw_match, api_source="riot")
-                        all_matches.append(match_obj)
-                    elif isinstance(raw_match, MatchData):
-                        # Já é um objeto MatchData
-                        all_matches.append(raw_match)
-                    else:
-                        logger.warning(f"Tipo inesperado do Riot API: {type(raw_match)}")
-                except Exception as e:
-                    logger.warning(f"Erro ao converter partida Riot API: {e}")
-                    continue
+            merged_matches = self._merge_live_matches(all_matches)
             
-            logger.info(f"Encontradas {len(all_matches)} partidas ao vivo no total")
-            return all_matches
+            logger.info(
+                f"Encontradas {len(merged_matches)} partidas ao vivo no total "
+                f"({len(all_matches) - len(merged_matches)} duplicadas removidas)"
+            )
+            return merged_matches
             
         except Exception as e:
             logger.error(f"Erro ao buscar partidas ao vivo: {e}")
             return []
 
+    async def _fetch_live_source(self, source: str, fetch_func) -> List[Any]:
+        """
+        Busca partidas de uma fonte com orçamento de tempo próprio
+        
+        Em caso de timeout/erro retorna o último resultado válido da fonte,
+        desde que não seja mais antigo que MATCH_CACHE_TIMEOUT_MINUTES.
+        """
+        timeout = self.live_source_timeouts.get(source, LIVE_FETCH_TIMEOUT_SECONDS)
+        
+        try:
+            result = await asyncio.wait_for(fetch_func(), timeout=timeout)
+            result = list(result or [])
+            self._last_live_results[source] = (time.time(), result)
+            return result
+            
+        except asyncio.TimeoutError:
+            logger.warning(f"⏱️ {source}: timeout de {timeout:.1f}s ao buscar partidas ao vivo")
+        except Exception as e:
+            logger.warning(f"Erro ao buscar partidas ao vivo de {source}: {e}")
+        
+        # Fallback parcial: último resultado válido ainda recente
+        last_result = self._last_live_results.get(source)
+        if last_result:
+            fetched_at, matches = last_result
+            if time.time() - fetched_at <= MATCH_CACHE_TIMEOUT_MINUTES * 60:
+                logger.info(f"🔄 {source}: usando último resultado válido ({len(matches)} partidas)")
+                return matches
+        
+        return []
+
+    def _convert_raw_matches(self, raw_matches: List[Any], api_source: str) -> List[MatchData]:
+        """Converte dados raw de uma API em objetos MatchData"""
+        converted = []
+        
+        for raw_match in raw_matches:
+            try:
+                if isinstance(raw_match, dict):
+                    converted.append(MatchData.from_api_data(raw_match, api_source=api_source))
+                elif isinstance(raw_match, MatchData):
+                    # Já é um objeto MatchData
+                    converted.append(raw_match)
+                else:
+                    logger.warning(f"Tipo inesperado de {api_source}: {type(raw_match)}")
+            except Exception as e:
+                logger.warning(f"Erro ao converter partida {api_source}: {e}")
+                continue
+        
+        return converted
+
+    def _get_series_key(self, match: MatchData) -> Tuple[Tuple[str, ...], str]:
+        """Chave de série independente da API: times normalizados (sem ordem) + liga"""
+        league = match.league
+        if isinstance(league, dict):
+            league = league.get('name', '')
+        
+        teams = tuple(sorted((
+            normalize_team_name(match.team1_name),
+            normalize_team_name(match.team2_name)
+        )))
+        return teams, normalize_team_name(str(league or ''))
+
+    def _merge_live_matches(self, matches: List[MatchData]) -> List[MatchData]:
+        """
+        Remove séries reportadas por ambas as APIs
+        
+        Mantém a primeira ocorrência (PandaScore, que traz dados da série)
+        e completa tempo de jogo a partir da duplicata quando ausente.
+        """
+        merged: Dict[Tuple[Tuple[str, ...], str], MatchData] = {}
+        
+        for match in matches:
+            key = self._get_series_key(match)
+            existing = merged.get(key)
+            
+            if existing is None:
+                merged[key] = match
+                continue
+            
+            logger.debug(f"Série duplicada entre APIs: {match.team1_name} vs {match.team2_name}")
+            if not existing.game_time_seconds and match.game_time_seconds:
+                existing.game_time_seconds = match.game_time_seconds
+        
+        return list(merged.values())
+
     async def _filter_suitable_matches(self, matches: List[MatchData]) -> List[MatchData]:
         """Filtra partidas adequadas para análise"""
         suitable = []
@@ -443,45 +561,179 @@ class ProfessionalTipsSystem:
         for match in matches:
             self.monitored_matches[match.match_id] = match
 
-    async def _process_matches_for_tips(self, matches: List[MatchData]) -> None:
-        """Processa partidas para geração de tips"""
+    async def _process_matches_for_tips(self, matches: List[MatchData]) -> int:
+        """
+        Processa partidas para geração de tips
         
+        Etapas:
+        1. Reserva (claim) atômica dos mapas ativos em processed_maps
+        2. Odds + predição de todas as partidas em paralelo (limitado pelo semáforo)
+        3. Aplica o limite de tips/hora e despacha os resultados na ordem original
+        
+        Returns:
+            Número de tips despachadas
+        """
+        if not self._can_generate_tip():
+            logger.debug("Rate limit atingido, pulando geração de tips")
+            return 0
+        
+        # 1. Reserva dos mapas - sem await entre verificação e marcação
+        stage_start = time.time()
+        claimed: List[Tuple[MatchData, str]] = []
         for match in matches:
+            # VALIDAÇÃO CRÍTICA: Verifica se o mapa atual ainda está ativo
+            if not self._is_current_game_active(match):
+                logger.warning(f"❌ MAPA JÁ FINALIZADO - pulando: {match.match_id}")
+                continue
+            
+            map_id = self._get_map_identifier(match)
+            if not self._claim_map(map_id):
+                logger.debug(f"Mapa já reservado por outro scan: {map_id}")
+                continue
+            
+            claimed.append((match, map_id))
+        self._record_stage_timing("claim", stage_start)
+        
+        if not claimed:
+            return 0
+        
+        # 2. Odds + predição em paralelo
+        stage_start = time.time()
+        results = await asyncio.gather(
+            *(self._run_match_pipeline(match) for match, _ in claimed),
+            return_exceptions=True
+        )
+        self._record_stage_timing("pipeline", stage_start)
+        
+        # 3. Rate limiting aplicado aos resultados
+        stage_start = time.time()
+        dispatched = 0
+        for (match, map_id), tip_result in zip(claimed, results):
             try:
-                # Verifica rate limiting
-                if not self._can_generate_tip():
-                    logger.debug("Rate limit atingido, pulando geração de tips")
-                    break
+                if isinstance(tip_result, BaseException):
+                    logger.error(f"Erro ao processar partida {match.match_id}: {tip_result}")
+                    tip_result = None
                 
-                # VALIDAÇÃO CRÍTICA: Verifica se o mapa atual ainda está ativo
-                if not self._is_current_game_active(match):
-                    logger.warning(f"❌ MAPA JÁ FINALIZADO - pulando: {match.match_id}")
+                if not tip_result:
+                    # Se falhou na geração, libera o mapa para tentar novamente depois
+                    self.processed_maps.discard(map_id)
+                    logger.debug(f"❌ Tip não gerada - removendo do cache: {map_id}")
                     continue
                 
-                # Gera identificador do mapa
-                map_id = self._get_map_identifier(match)
+                if not self._can_generate_tip():
+                    # Libera o mapa: a tip pode ser gerada quando houver orçamento
+                    self.processed_maps.discard(map_id)
+                    logger.debug(f"Rate limit atingido - tip descartada: {map_id}")
+                    continue
                 
-                # CRÍTICO: Marca como processado ANTES de gerar para evitar condições de corrida
-                self.processed_maps.add(map_id)
-                logger.info(f"🔒 Mapa marcado como processado: {map_id}")
+                game_number = self._get_game_number_in_series(match)
+                logger.info(f"✅ Tip gerada: {match.team1_name} vs {match.team2_name} - Game {game_number}")
                 
-                # Gera tip para a partida
-                tip_result = await self._generate_tip_for_match(match)
-                
-                if tip_result:
-                    game_number = self._get_game_number_in_series(match)
-                    logger.info(f"✅ Tip gerada: {match.team1_name} vs {match.team2_name} - Game {game_number}")
-                    
-                    await self._handle_generated_tip(tip_result, match)
-                else:
-                    # Se falhou na geração, remove do cache para tentar novamente depois
-                    self.processed_maps.discard(map_id)
-                    logger.debug(f"❌ Tip não gerada - removendo do cache: {map_id}")
+                await self._handle_generated_tip(tip_result, match)
+                dispatched += 1
                 
             except Exception as e:
                 logger.error(f"Erro ao processar partida {match.match_id}: {e}")
+        self._record_stage_timing("dispatch", stage_start)
+        
+        return dispatched
+
+    def _claim_map(self, map_id: str) -> bool:
+        """
+        Marca o mapa como processado se ainda não estiver
+        
+        CRÍTICO: Verificação e marcação ocorrem sem await entre elas,
+        o que torna o claim atômico dentro do event loop
+        """
+        if map_id in self.processed_maps:
+            return False
+        
+        self.processed_maps.add(map_id)
+        logger.info(f"🔒 Mapa marcado como processado: {map_id}")
+        return True
+
+    async def _run_match_pipeline(self, match: MatchData) -> Optional[ProfessionalTip]:
+        """Executa odds + predição de uma partida respeitando o limite de concorrência"""
+        async with self._pipeline_semaphore:
+            return await self._generate_tip_for_match(match)
+
+    def _record_stage_timing(self, stage: str, stage_start: float) -> None:
+        """Registra duração de uma etapa do scan atual"""
+        self.scan_timings[stage] = round(time.time() - stage_start, 3)
+
+    async def consume_live_events(self, event_queue: asyncio.Queue) -> None:
+        """
+        Consome eventos do LiveStatsStream (modo streaming)
+        
+        Draft completo dispara o pipeline de tips imediatamente, sem esperar
+        o próximo scan de 3 minutos.
+        """
+        logger.info("📡 Consumidor de eventos livestats iniciado")
+        
+        while True:
+            event = await event_queue.get()
+            try:
+                await self._handle_live_event(event)
+            except Exception as e:
+                logger.error(f"Erro ao processar evento livestats {event.event_type.value}: {e}")
+            finally:
+                event_queue.task_done()
+
+    async def _handle_live_event(self, event) -> int:
+        """
+        Processa um LiveStatsEvent
+        
+        Returns:
+            Número de tips despachadas
+        """
+        from .live_stats_stream import LiveEventType
+        
+        match = event.match
+        
+        if event.event_type == LiveEventType.GAME_FINISHED:
+            self.monitored_matches.pop(match.match_id, None)
+            self.draft_cache.pop(match.match_id, None)
+            logger.debug(f"Game finalizado via livestats: {match.match_id}")
+            return 0
+        
+        if event.event_type == LiveEventType.STATE_CHANGE:
+            if match.match_id in self.monitored_matches:
+                self.monitored_matches[match.match_id] = match
+            return 0
+        
+        # DRAFT_COMPLETE: composições já vieram do feed
+        team1 = [champ.get('name') for champ in getattr(match, 'team1_composition', [])]
+        team2 = [champ.get('name') for champ in getattr(match, 'team2_composition', [])]
+        self.draft_cache[match.match_id] = DraftCacheEntry(
+            game_number=self._get_game_number_in_series(match),
+            draft_complete=True,
+            checked_at=time.time(),
+            source="livestats_stream",
+            team1_composition=team1,
+            team2_composition=team2
+        )
+        
+        stage_start = time.time()
+        suitable_matches = await self._filter_suitable_matches([match])
+        self._record_stage_timing("stream_filter", stage_start)
+        
+        if not suitable_matches:
+            return 0
+        
+        self.monitored_matches[match.match_id] = match
+        return await self._process_matches_for_tips(suitable_matches)
+
+    def set_max_concurrent_matches(self, max_concurrent: int) -> None:
+        """Atualiza número de partidas processadas em paralelo"""
+        if max_concurrent < 1:
+            raise ValueError("Concorrência deve ser pelo menos 1")
+        
+        old_limit = self.max_concurrent_matches
+        self.max_concurrent_matches = max_concurrent
+        self._pipeline_semaphore = asyncio.Semaphore(max_concurrent)
+        
+        logger.info(f"Concorrência do pipeline atualizada: {old_limit} -> {max_concurrent}")
 
-    
     async def _validate_real_odds_first(self, match: MatchData) -> Dict:
         """
         CORREÇÃO: Tenta buscar odds REAIS antes de usar estimadas
@@ -786,6 +1038,7 @@ class ProfessionalTipsSystem:
         
         # NOVO: Limpa mapas processados antigos (após 4 horas)
         self._cleanup_old_processed_maps()
+        self._cleanup_draft_cache()
 
     def _cleanup_old_processed_maps(self) -> None:
         """
@@ -855,6 +1108,7 @@ class ProfessionalTipsSystem:
                 "monitored_matches": len(self.monitored_matches),
                 "active_tips": len(self.generated_tips),
                 "processed_maps": len(self.processed_maps),
+                "draft_cache": len(self.draft_cache),
                 "tips_by_status": tips_by_status
             },
             "rate_limiting": {
@@ -862,9 +1116,33 @@ class ProfessionalTipsSystem:
                 "max_per_hour": self.max_tips_per_hour,
                 "can_generate": self._can_generate_tip()
             },
+            "pipeline": {
+                "max_concurrent_matches": self.max_concurrent_matches,
+                "stage_timings_seconds": dict(self.scan_timings)
+            },
+            "api_rate_limits": self._get_api_rate_limits(),
+            "api_cache": self._get_api_cache_stats(),
             "quality_filters": self.quality_filters
         }
 
+    def _get_api_cache_stats(self) -> Dict[str, Any]:
+        """Hits, misses e evictions dos caches das APIs"""
+        cache_stats = {}
+        for source, client in (("pandascore", self.pandascore_client), ("riot", self.riot_client)):
+            cache = getattr(client, "cache", None)
+            if isinstance(cache, ResponseCache):
+                cache_stats[source] = cache.get_stats()
+        return cache_stats
+
+    def _get_api_rate_limits(self) -> Dict[str, Any]:
+        """Orçamento e esperas dos rate limiters das APIs"""
+        rate_limits = {}
+        for source, client in (("pandascore", self.pandascore_client), ("riot", self.riot_client)):
+            limiter = getattr(client, "rate_limiter", None)
+            if isinstance(limiter, TokenBucketRateLimiter):
+                rate_limits[source] = limiter.get_stats()
+        return rate_limits
+
     def get_recent_tips(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Retorna tips recentes"""
         recent_tips = sorted(
@@ -896,24 +1174,29 @@ class ProfessionalTipsSystem:
         scan_start = time.time()
         
         # Busca partidas
+        stage_start = time.time()
         live_matches = await self._get_live_matches()
+        self._record_stage_timing("fetch", stage_start)
+        
+        stage_start = time.time()
         suitable_matches = await self._filter_suitable_matches(live_matches)
+        self._record_stage_timing("filter", stage_start)
         
-        # Processa uma partida se disponível
-        tip_generated = False
-        if suitable_matches and self._can_generate_tip():
-            tip = await self._generate_tip_for_match(suitable_matches[0])
-            if tip:
-                await self._handle_generated_tip(tip, suitable_matches[0])
-                tip_generated = True
+        # Processa todas as partidas adequadas em paralelo
+        tips_dispatched = 0
+        if suitable_matches:
+            tips_dispatched = await self._process_matches_for_tips(suitable_matches)
+        tip_generated = tips_dispatched > 0
         
         scan_duration = time.time() - scan_start
+        self._record_stage_timing("total", scan_start)
         
         return {
             "scan_duration_seconds": round(scan_duration, 2),
             "live_matches_found": len(live_matches),
             "suitable_matches": len(suitable_matches),
             "tip_generated": tip_generated,
+            "tips_generated": tips_dispatched,
             "can_generate_more": self._can_generate_tip(),
             "timestamp": get_current_timestamp()
         }
@@ -936,9 +1219,62 @@ class ProfessionalTipsSystem:
         logger.info(f"Limite de tips atualizado: {old_limit} -> {max_tips} por hora")
 
     async def _is_draft_complete(self, match: MatchData) -> bool:
+        """
+        Verifica se o draft está completo, usando o cache por partida
+        
+        - Draft completo: não é reconsultado até o número do game mudar
+        - Draft incompleto: reconsultado após draft_cache_ttl segundos
+        """
+        game_number = self._get_game_number_in_series(match)
+        entry = self.draft_cache.get(match.match_id)
+        
+        if entry and entry.game_number == game_number:
+            if entry.draft_complete:
+                self._apply_cached_compositions(match, entry)
+                return True
+            if entry.age_seconds < self.draft_cache_ttl:
+                logger.debug(f"⏳ Draft incompleto (cache {entry.age_seconds:.0f}s): {match.match_id}")
+                return False
+        
+        draft_complete, composition_data = await self._check_draft_complete(match)
+        
+        self.draft_cache[match.match_id] = DraftCacheEntry(
+            game_number=game_number,
+            draft_complete=draft_complete,
+            checked_at=time.time(),
+            source=composition_data.source if composition_data else "",
+            team1_composition=composition_data.team1_composition if composition_data else None,
+            team2_composition=composition_data.team2_composition if composition_data else None
+        )
+        return draft_complete
+
+    def _apply_cached_compositions(self, match: MatchData, entry: DraftCacheEntry) -> None:
+        """Reaplica composições memorizadas em um novo snapshot da partida"""
+        if not entry.team1_composition or not entry.team2_composition:
+            return
+        
+        if getattr(match, 'team1_composition', None) and getattr(match, 'team2_composition', None):
+            return
+        
+        match.team1_composition = [{'name': champ} for champ in entry.team1_composition]
+        match.team2_composition = [{'name': champ} for champ in entry.team2_composition]
+
+    def _cleanup_draft_cache(self, max_age_seconds: float = 4 * 3600) -> None:
+        """Remove estados de draft de partidas antigas"""
+        stale = [
+            match_id for match_id, entry in self.draft_cache.items()
+            if entry.age_seconds > max_age_seconds
+        ]
+        for match_id in stale:
+            del self.draft_cache[match_id]
+
+    async def _check_draft_complete(self, match: MatchData) -> Tuple[bool, Optional[Any]]:
         """
         VERSÃO MELHORADA: Verifica se o draft está completo usando APIs alternativas
         Resolve problema quando PandaScore não retorna dados de composição
+        
+        Returns:
+            (draft completo, CompositionData das APIs alternativas ou None)
         """
         try:
             # Verifica se tem dados de composição dos times (método original)
@@ -953,7 +1289,7 @@ class ProfessionalTipsSystem:
                 draft_complete = team1_champions == 5 and team2_champions == 5
                 if draft_complete:
                     logger.debug(f"✅ Draft completo via PandaScore: {team1_champions + team2_champions}/10 champions")
-                    return True
+                    return True, None
                 else:
                     logger.debug(f"⏳ Draft incompleto via PandaScore: {team1_champions + team2_champions}/10 champions")
             
@@ -980,7 +1316,7 @@ class ProfessionalTipsSystem:
                         logger.debug(f"   Team 1: {', '.join(composition_data.team1_composition)}")
                         logger.debug(f"   Team 2: {', '.join(composition_data.team2_composition)}")
                     
-                    return True
+                    return True, composition_data
                 else:
                     logger.debug("❌ APIs alternativas não retornaram draft completo")
                     
@@ -995,22 +1331,31 @@ class ProfessionalTipsSystem:
             
             if match.status and match.status.lower() in draft_complete_status:
                 logger.debug(f"✅ Draft presumivelmente completo pelo status: {match.status}")
-                return True
+                return True, None
             
             # Se tem tempo de jogo > 0, draft provavelmente está completo
             if match.get_game_time_minutes() > 0:
                 logger.debug("✅ Draft completo: jogo já iniciado")
-                return True
+                return True, None
             
             # Por segurança, se não conseguiu determinar, assume que não está completo
             logger.debug("❌ Não foi possível determinar se draft está completo - aguardando")
-            return False
+            return False, None
             
         except Exception as e:
             logger.error(f"Erro ao verificar draft completo: {e}")
-            return False
+            return False, None
 
     def _get_game_number_in_series(self, match: MatchData) -> int:
+        """Número do game atual na série (resolvido uma vez por snapshot da partida)"""
+        # TTL: sem dados de série o game é estimado pelo tempo desde begin_at
+        return match.memoize(
+            "game_number_in_series",
+            lambda: self._resolve_game_number_in_series(match),
+            ttl=MATCH_MEMO_TTL_SECONDS
+        )
+
+    def _resolve_game_number_in_series(self, match: MatchData) -> int:
         """
         DETECÇÃO CORRIGIDA DO MAPA ATUAL NA SÉRIE
         
@@ -1155,7 +1500,48 @@ class ProfessionalTipsSystem:
         except Exception as e:
             logger.error(f"Erro ao determinar game number: {e}")
             return 1
+
     def _is_current_game_active(self, match: MatchData) -> bool:
+        """
+        Verifica se o mapa atual está ativo
+        
+        As validações de série/status são memorizadas por snapshot da partida;
+        o bloqueio temporal depende do relógio e é avaliado a cada chamada.
+        """
+        active = match.memoize(
+            "current_game_active",
+            lambda: self._resolve_current_game_active(match),
+            ttl=MATCH_MEMO_TTL_SECONDS
+        )
+        return active and not self._is_temporally_blocked(match)
+
+    def _is_temporally_blocked(self, match: MatchData) -> bool:
+        """🚨 BLOQUEIO TEMPORAL CRÍTICO: >3h com Game baixo = SUSPEITO"""
+        if not (hasattr(match, 'begin_at') and match.begin_at):
+            return False
+        
+        try:
+            import datetime
+            if isinstance(match.begin_at, str):
+                begin_time = datetime.datetime.fromisoformat(match.begin_at.replace('Z', '+00:00'))
+            else:
+                begin_time = match.begin_at
+            
+            time_diff = datetime.datetime.now(datetime.timezone.utc) - begin_time
+            hours_elapsed = time_diff.total_seconds() / 3600
+            current_game = self._get_game_number_in_series(match)
+            
+            # BLOQUEIO RÍGIDO: >3h e Game 1-2 = ALTAMENTE SUSPEITO
+            if hours_elapsed > 3.0 and current_game <= 2:
+                logger.warning(f"❌ BLOQUEIO TEMPORAL CRÍTICO: {hours_elapsed:.1f}h elapsed mas detectando Game {current_game} - REJEITANDO TIP")
+                return True
+                
+        except Exception as e:
+            logger.debug(f"Erro análise temporal: {e}")
+        
+        return False
+
+    def _resolve_current_game_active(self, match: MatchData) -> bool:
         """
         VALIDAÇÃO CRÍTICA: Verifica se o mapa atual ainda está ativo para tips
         
@@ -1198,25 +1584,7 @@ class ProfessionalTipsSystem:
                         logger.warning(f"❌ BLOQUEIO: Game {running_game} está rodando, não Game {current_game}")
                         return False
             
-            # 🚨 BLOQUEIO TEMPORAL CRÍTICO: >3h com Game baixo = SUSPEITO
-            if hasattr(match, 'begin_at') and match.begin_at:
-                try:
-                    import datetime
-                    if isinstance(match.begin_at, str):
-                        begin_time = datetime.datetime.fromisoformat(match.begin_at.replace('Z', '+00:00'))
-                    else:
-                        begin_time = match.begin_at
-                    
-                    time_diff = datetime.datetime.now(datetime.timezone.utc) - begin_time
-                    hours_elapsed = time_diff.total_seconds() / 3600
-                    
-                    # BLOQUEIO RÍGIDO: >3h e Game 1-2 = ALTAMENTE SUSPEITO
-                    if hours_elapsed > 3.0 and current_game <= 2:
-                        logger.warning(f"❌ BLOQUEIO TEMPORAL CRÍTICO: {hours_elapsed:.1f}h elapsed mas detectando Game {current_game} - REJEITANDO TIP")
-                        return False
-                        
-                except Exception as e:
-                    logger.debug(f"Erro análise temporal: {e}")
+            # (Bloqueio temporal >3h fica fora do memo: _is_temporally_blocked)
             
             # 🆘 VALIDAÇÃO DE EMERGÊNCIA: Impede tips para games tardios sem dados válidos
             # Se detectamos Game 4+ mas não temos dados consistentes da série, é suspeito
@@ -1251,7 +1619,7 @@ class ProfessionalTipsSystem:
                     if 'games' in serie_info:
                         games = serie_info['games']
                         if isinstance(games, list):
-                            current_game_number = self._get_game_number_in_series(match)
+                            current_game_number = current_game
                             
                             # Verifica se o game atual existe na lista e está finalizado
                             for game in games:
@@ -1289,6 +1657,14 @@ class ProfessionalTipsSystem:
             return True
 
     def _get_map_identifier(self, match: MatchData) -> str:
+        """Identificador do mapa atual (resolvido uma vez por snapshot da partida)"""
+        return match.memoize(
+            "map_identifier",
+            lambda: self._build_map_identifier(match),
+            ttl=MATCH_MEMO_TTL_SECONDS
+        )
+
+    def _build_map_identifier(self, match: MatchData) -> str:
         """
         Cria identificador único para o mapa individual
         
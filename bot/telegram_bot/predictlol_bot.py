@@ -42,8 +42,13 @@ class PredictLoLTelegramBot:
             # Criar aplicação
             self.app = Application.builder().token(self.token).build()
             
-            # Inicializar serviço de análise
-            self.analysis_service = RealAnalysisService()
+            # Inicializar serviço de análise (sessão persistente durante a vida do bot)
+            # Ratings Elo do Pre-Game Analyzer (quando o sistema pessoal está ativo)
+            pre_game_analyzer = getattr(self.personal_betting, 'pre_game_analyzer', None)
+            self.analysis_service = RealAnalysisService(
+                rating_engine=getattr(pre_game_analyzer, 'ratings', None)
+            )
+            await self.analysis_service.start()
             
             # Registrar handlers
             await self._register_handlers()
@@ -117,6 +122,9 @@ class PredictLoLTelegramBot:
                 await self.app.stop()
                 await self.app.shutdown()
             
+            if self.analysis_service:
+                await self.analysis_service.close()
+            
             self.is_running = False
             logger.info("🛑 Bot parado")
             
@@ -328,8 +336,7 @@ Use /menu para ver todas as opções ou /help para ajuda detalhada.
             await update.message.reply_text(f"🔍 Analisando {team1} vs {team2} com dados reais...")
             
             # Usar serviço de análise real
-            async with self.analysis_service as service:
-                analysis = await service.analyze_match(team1, team2)
+            analysis = await self.analysis_service.analyze_match(team1, team2)
             
             if analysis["success"]:
                 # Análise com dados reais
@@ -791,8 +798,7 @@ Use /menu para ver todas as opções ou /help para ajuda detalhada.
             await update.message.reply_text(f"🔍 Gerando previsão pós-draft para {team1} vs {team2}...")
             
             # Usar serviço de análise real para previsão pós-draft
-            async with self.analysis_service as service:
-                prediction = await service.predict_post_draft(team1, team2)
+            prediction = await self.analysis_service.predict_post_draft(team1, team2)
             
             if prediction["success"]:
                 # Previsão com dados reais
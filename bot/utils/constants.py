@@ -18,10 +18,19 @@ MAX_ODDS = 8.00
 SCAN_INTERVAL_MINUTES = 3
 ODDS_CACHE_TIMEOUT_MINUTES = 5
 MATCH_CACHE_TIMEOUT_MINUTES = 3
+DRAFT_CACHE_TTL_SECONDS = 20  # Reconsulta de draft incompleto
+MATCH_MEMO_TTL_SECONDS = 60  # Resoluções de série/game que dependem do relógio (begin_at)
+
+# Streaming do feed livestats (cadência adaptativa por game em andamento)
+LIVE_STREAM_MIN_POLL_SECONDS = 2
+LIVE_STREAM_MAX_POLL_SECONDS = 10
+LIVE_STREAM_DISCOVERY_SECONDS = 60
 CLEANUP_INTERVAL_HOURS = 24  # Limpeza de dados a cada 24 horas
+MAX_CONCURRENT_MATCH_PIPELINES = 4  # Partidas analisadas em paralelo por scan
 
 # API Timeouts
 API_REQUEST_TIMEOUT_SECONDS = 5
+LIVE_FETCH_TIMEOUT_SECONDS = 8  # Orçamento por fonte ao buscar partidas ao vivo
 TELEGRAM_REQUEST_TIMEOUT_SECONDS = 30
 
 # Ligas e Tiers
@@ -105,6 +114,15 @@ PANDASCORE_RATE_LIMITS = {
     "requests_per_hour": 1000
 }
 
+# Cache de respostas das APIs (LRU + TTL com orçamento de memória)
+API_CACHE_MAX_BYTES = 32 * 1024 * 1024  # 32 MB por cliente
+API_CACHE_MAX_ENTRIES = 2000
+API_CACHE_TTL_CLASSES = {
+    "live": 30,            # getLive, /window, /details
+    "schedule": 5 * 60,    # getSchedule, eventos, partidas
+    "static": 6 * 3600     # ligas, times, torneios
+}
+
 # Configurações do sistema de unidades - AJUSTADAS para desenvolvimento
 UNITS_CONFIG = {
     "very_high_risk": {
@@ -199,6 +217,9 @@ TELEGRAM_CONFIG = {
     "admin_user_ids": TELEGRAM_ADMIN_USER_IDS  # IDs dos admins do Railway
 }
 
+# Modo streaming do livestats no ScheduleManager (desligado por padrão)
+LIVE_STREAM_ENABLED = os.getenv("LIVE_STREAM_ENABLED", "false").lower() in ("1", "true", "yes")
+
 # Template melhorado para tips do Telegram - EXPERIÊNCIA PREMIUM
 TIP_TEMPLATE = {
     "header": "🚀 **TIP PROFISSIONAL LoL** 🚀",
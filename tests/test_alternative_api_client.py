@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Testes da sessão HTTP do AlternativeAPIClient
+
+Verifica:
+- Sessão reaproveitada no mesmo event loop
+- Sessão de loop anterior liberada ao trocar de loop
+- Lock dos dados de champions criado uma vez mesmo sem start_session
+"""
+
+import asyncio
+import sys
+import os
+import threading
+import time
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.systems.alternative_api_client import AlternativeAPIClient
+
+
+class _FakeResponse:
+    """Resposta HTTP mínima (status 200 + JSON)"""
+
+    def __init__(self, payload):
+        self.status = 200
+        self._payload = payload
+
+    async def json(self):
+        return self._payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeDataDragonSession:
+    """Sessão falsa do Data Dragon que conta requisições por URL"""
+
+    closed = False
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url):
+        self.requests.append(url)
+        if url.endswith("versions.json"):
+            return _FakeResponse(["14.1.1"])
+        return _FakeResponse({"data": {"Ahri": {"key": "103"}}})
+
+
+class TestAlternativeAPISession:
+    """Testes do ciclo de vida da sessão por event loop"""
+
+    def test_session_reused_within_loop_and_released_on_loop_change(self):
+        """Novo loop cria outra sessão e a antiga (loop encerrado) é desacoplada"""
+        client = AlternativeAPIClient()
+
+        async def start_twice():
+            await client.start_session()
+            first = client.session
+            await client.start_session()
+            return first
+
+        first = asyncio.run(start_twice())
+        assert client.session is first
+
+        async def start_and_close():
+            await client.start_session()
+            session = client.session
+            await client.close_session()
+            return session
+
+        second = asyncio.run(start_and_close())
+        assert second is not first
+        assert first.closed
+
+    def test_stale_session_closed_on_its_running_loop(self):
+        """Loop de origem ainda ativo em outra thread: close é agendado nele"""
+        client = AlternativeAPIClient()
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(client.start_session(), other_loop).result(5)
+            stale = client.session
+
+            async def restart():
+                await client.start_session()
+                await client.close_session()
+
+            asyncio.run(restart())
+            deadline = time.time() + 5
+            while not stale.closed and time.time() < deadline:
+                time.sleep(0.01)
+            assert stale.closed
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join(5)
+            other_loop.close()
+
+    def test_champion_lock_created_once_without_start_session(self, monkeypatch):
+        """Chamadas concorrentes sem start_session compartilham um único lock"""
+        monkeypatch.setattr(AlternativeAPIClient, "_champion_maps_by_patch", {})
+        monkeypatch.setattr(AlternativeAPIClient, "_latest_ddragon_version", None)
+        monkeypatch.setattr(AlternativeAPIClient, "_ddragon_version_checked_at", 0.0)
+
+        client = AlternativeAPIClient()
+        client.session = _FakeDataDragonSession()
+
+        async def load_concurrently():
+            await asyncio.gather(*(client._load_champion_data() for _ in range(5)))
+            lock = client._champion_lock
+            await client._load_champion_data()
+            return lock
+
+        lock = asyncio.run(load_concurrently())
+        assert lock is not None and lock is client._champion_lock
+
+        # Versão e tabela do patch baixadas uma única vez
+        assert len(client.session.requests) == 2
+        assert client._champion_id_map == {103: "Ahri"}
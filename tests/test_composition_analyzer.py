@@ -12,24 +12,30 @@ Suite completa de testes para verificar:
 
 import asyncio
 import pytest
+import shutil
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
 
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from bot.analyzers.composition_analyzer import CompositionAnalyzer
+from bot.analyzers.composition_analyzer import (
+    CompositionAnalyzer, DATABASE_FILES, DEFAULT_DATA_DIR,
+    benchmark_batch_scoring, benchmark_composition_analysis
+)
+from bot.analyzers.champion_tables import NUMPY_AVAILABLE
 
 
 class TestCompositionAnalyzer:
     """Classe principal de testes para CompositionAnalyzer"""
     
     @pytest.fixture
-    async def analyzer(self):
-        """Fixture que cria uma instância do analisador"""
+    def analyzer(self):
+        """Fixture que cria uma instância do analisador com as databases carregadas"""
         analyzer = CompositionAnalyzer()
-        await asyncio.sleep(1)  # Aguarda inicialização das databases
+        analyzer.load_databases()
         return analyzer
     
     @pytest.fixture
@@ -308,7 +314,7 @@ class TestCompositionAnalyzer:
     async def test_fallback_analysis_activation(self, analyzer):
         """Testa ativação da análise de fallback em caso de erro"""
         # Mock para forçar erro interno
-        with patch.object(analyzer, '_calculate_individual_strength', side_effect=Exception("Erro simulado")):
+        with patch.object(analyzer, 'calculate_individual_strength', side_effect=Exception("Erro simulado")):
             result = await analyzer.analyze_team_composition(
                 team_picks=[{"champion": "Azir", "position": "mid", "pick_order": 1}],
                 enemy_picks=[],
@@ -378,6 +384,198 @@ class TestCompositionAnalyzer:
         summary_weak = analyzer._generate_composition_summary(3.0, picks)
         assert "FRACA" in summary_weak
 
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy não instalado")
+    @pytest.mark.asyncio
+    async def test_compiled_tables_match_dict_lookups(self, analyzer, sample_team_picks, sample_enemy_picks):
+        """Tabelas compiladas produzem os mesmos scores que os lookups em dict"""
+        assert analyzer.tables is not None
+        duplicated = sample_team_picks + [{"champion": "Azir", "position": "mid"}] * 7
+
+        drafts = [
+            (sample_team_picks, sample_enemy_picks),
+            ([{"champion": "Azir", "position": "mid"}], [{"champion": "LeBlanc", "position": "mid"}]),
+            (duplicated, duplicated),  # acima de SMALL_DRAFT_SIZE: caminho NumPy
+        ]
+        compiled_tables = analyzer.tables
+        for team, enemy in drafts:
+            scores = []
+            for tables in (compiled_tables, None):
+                analyzer.tables = tables
+                scores.append([
+                    await analyzer._calculate_individual_strength(team, "14.10"),
+                    await analyzer._calculate_team_synergies(team),
+                    await analyzer._calculate_matchup_advantages(team, enemy),
+                    await analyzer._calculate_game_phase_strength(team),
+                ])
+            compiled, reference = scores
+            assert compiled[:3] == pytest.approx(reference[:3])
+            assert compiled[3] == reference[3]
+        analyzer.tables = compiled_tables
+
+    @pytest.mark.asyncio
+    async def test_sync_core_in_thread_and_process_pools(self, analyzer, sample_team_picks, sample_enemy_picks):
+        """Núcleo síncrono dá o mesmo resultado no loop, em thread e em processo"""
+        expected = analyzer.analyze_composition(sample_team_picks, sample_enemy_picks, "14.10")
+        assert await analyzer.analyze_team_composition(sample_team_picks, sample_enemy_picks, "14.10") == expected
+
+        for executor in (ThreadPoolExecutor(max_workers=2), ProcessPoolExecutor(max_workers=1)):
+            with executor:
+                result = await analyzer.analyze_team_composition_in_executor(
+                    sample_team_picks, sample_enemy_picks, "14.10", executor=executor
+                )
+            assert result == expected
+
+    @pytest.mark.asyncio
+    async def test_load_is_explicit_idempotent_and_snapshotted(self, tmp_path, sample_team_picks, sample_enemy_picks):
+        """Construção fora do loop, carga única e snapshot invalidado por mtime"""
+        for filename in DATABASE_FILES:
+            shutil.copy(os.path.join(DEFAULT_DATA_DIR, filename), tmp_path / filename)
+
+        analyzer = CompositionAnalyzer(data_dir=str(tmp_path))
+        assert not analyzer.loaded and analyzer.champions_db == {}
+
+        with patch.object(analyzer, "_load_json_databases", wraps=analyzer._load_json_databases) as parse:
+            await asyncio.gather(*(analyzer.ensure_loaded() for _ in range(5)))
+            assert parse.call_count == 1
+        assert analyzer.loaded and analyzer.snapshot_path.exists()
+        expected = analyzer.analyze_composition(sample_team_picks, sample_enemy_picks)
+
+        # Segundo processo: snapshot válido, sem parse de JSON
+        warm = CompositionAnalyzer(data_dir=str(tmp_path))
+        with patch.object(warm, "_load_json_databases", side_effect=AssertionError("parse de JSON")):
+            result = await warm.analyze_team_composition(sample_team_picks, sample_enemy_picks)
+        assert result == expected
+        assert warm.champions_db == analyzer.champions_db
+
+        # JSON alterado: snapshot é descartado e recompilado
+        counters_path = tmp_path / "champion_counters.json"
+        os.utime(counters_path, ns=(0, counters_path.stat().st_mtime_ns + 10**9))
+        stale = CompositionAnalyzer(data_dir=str(tmp_path))
+        with patch.object(stale, "_load_json_databases", wraps=stale._load_json_databases) as parse:
+            stale.load_databases()
+            assert parse.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_memo_by_canonical_draft_and_patch(self, analyzer, sample_team_picks, sample_enemy_picks):
+        """Mesmo draft em outra ordem/grafia é hit; patch novo invalida o memo"""
+        first = await analyzer.analyze_team_composition(sample_team_picks, sample_enemy_picks, "14.10")
+
+        reordered = [dict(pick, champion=pick["champion"].upper()) for pick in reversed(sample_team_picks)]
+        with patch.object(analyzer, "_compute_composition", side_effect=AssertionError("recalculado")):
+            again = await analyzer.analyze_team_composition(reordered, list(reversed(sample_enemy_picks)), "14.10")
+        assert again == first
+
+        stats = analyzer.get_memo_stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+        # Outro inimigo é outra entrada
+        await analyzer.analyze_team_composition(sample_team_picks, sample_enemy_picks[:3], "14.10")
+        assert analyzer.get_memo_stats()["entries"] == 2
+
+        # Troca de patch esvazia o memo
+        await analyzer.analyze_team_composition(sample_team_picks, sample_enemy_picks, "14.11")
+        stats = analyzer.get_memo_stats()
+        assert (stats["invalidations"], stats["entries"], stats["patch"]) == (1, 1, "14.11")
+
+    @pytest.mark.asyncio
+    async def test_prediction_system_memo_follows_current_patch(self, analyzer, sample_team_picks, sample_enemy_picks):
+        """PredictionSystem passa o patch do PatchAnalyzer, então troca de patch invalida o memo"""
+        from bot.core_logic.prediction_system import DynamicPredictionSystem
+
+        system = DynamicPredictionSystem(game_analyzer=MagicMock(), units_system=MagicMock())
+        system.composition_analyzer = analyzer
+        drafts = {"team1": sample_team_picks, "team2": sample_enemy_picks}
+
+        with patch.object(system, "_extract_team_composition", side_effect=lambda _, key: drafts[key]):
+            system.patch_analyzer.current_patch = "14.10"
+            await system._analyze_team_compositions(MagicMock(spec=[]))
+            assert analyzer.get_memo_stats()["patch"] == "14.10"
+
+            system.patch_analyzer.current_patch = "14.11"
+            await system._analyze_team_compositions(MagicMock(spec=[]))
+
+        stats = analyzer.get_memo_stats()
+        assert (stats["patch"], stats["invalidations"]) == ("14.11", 1)
+
+    def test_memo_lru_eviction_and_failures_not_cached(self, sample_enemy_picks):
+        """Memo respeita o tamanho máximo e não guarda análises de fallback"""
+        analyzer = CompositionAnalyzer(memo_size=2)
+        analyzer.load_databases()
+        drafts = [[{"champion": name, "position": "mid"}] for name in ("Azir", "Ahri", "Viktor")]
+        for draft in drafts:
+            analyzer.analyze_composition(draft, sample_enemy_picks)
+
+        stats = analyzer.get_memo_stats()
+        assert (stats["entries"], stats["evictions"]) == (2, 1)
+
+        with patch.object(analyzer, "calculate_team_synergies", side_effect=Exception("Erro simulado")):
+            fallback = analyzer.analyze_composition(sample_enemy_picks, drafts[0])
+        assert fallback["composition_summary"] == "ANÁLISE INDISPONÍVEL"
+        assert analyzer.analyze_composition(sample_enemy_picks, drafts[0])["composition_summary"] != fallback["composition_summary"]
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy não instalado")
+    @pytest.mark.asyncio
+    async def test_compiled_tables_benchmark(self):
+        """Benchmark compara os dois caminhos e devolve tempos e speedups"""
+        timings = await benchmark_composition_analysis(repeats=200)
+        for key in ("scoring_dict_ms", "scoring_compiled_ms", "analysis_dict_ms",
+                    "analysis_compiled_ms", "scoring_speedup", "analysis_speedup"):
+            assert timings[key] > 0
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy não instalado")
+    @pytest.mark.asyncio
+    async def test_batch_scores_match_single_draft_scores(self, analyzer, sample_team_picks, sample_enemy_picks):
+        """score_drafts devolve, por draft, os mesmos scores do caminho escalar"""
+        drafts = [
+            sample_team_picks,
+            sample_team_picks[:2],
+            [],
+            [{"champion": "InvalidChampion", "position": "mid"}, {"champion": "Azir", "position": "mid"}],
+        ]
+        enemies = [sample_enemy_picks, sample_enemy_picks, [], [{"champion": "LeBlanc", "position": "mid"}]]
+        scores = analyzer.score_drafts(drafts, enemies)
+        assert len(scores) == len(drafts)
+
+        for index, (draft, enemy) in enumerate(zip(drafts, enemies)):
+            phases = analyzer.calculate_game_phase_strength(draft)
+            row = scores.row(index)
+            assert scores.synergy[index] == pytest.approx(analyzer.calculate_team_synergies(draft))
+            assert scores.counters[index] == pytest.approx(analyzer.calculate_matchup_advantages(draft, enemy))
+            assert scores.meta[index] == pytest.approx(analyzer.calculate_individual_strength(draft, "14.10"))
+            assert (row["early"], row["mid"], row["late"]) == (phases["early"], phases["mid"], phases["late"])
+            assert row["scaling"] == pytest.approx(row["late"] - row["early"], abs=0.011)
+
+        # Ajuste de patch desloca só o meta do campeão afetado
+        buffed = analyzer.score_drafts(drafts[:1], [sample_enemy_picks], patch_adjustments={"azir": 1.0})
+        assert buffed.meta[0] == pytest.approx(min(scores.meta[0] + 1.0 / len(sample_team_picks), 10.0))
+        assert buffed.synergy[0] == scores.synergy[0]
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy não instalado")
+    @pytest.mark.asyncio
+    async def test_best_remaining_picks(self, analyzer, sample_team_picks, sample_enemy_picks):
+        """Ranking do pick em aberto ignora campeões usados/banidos e bate com score_drafts"""
+        team = [pick for pick in sample_team_picks if pick["position"] != "jungle"]
+        ranking = analyzer.best_remaining_picks(
+            team, "jungle", sample_enemy_picks, unavailable=["Sejuani"], limit=50
+        )
+
+        champions = [entry["champion"] for entry in ranking]
+        assert champions and "sejuani" not in champions and "graves" in champions
+        assert not {"azir", "gnar", "jinx", "thresh", "kindred"} & set(champions)
+        assert all("jungle" in analyzer.champions_db[name]["positions"] for name in champions)
+        assert [entry["score"] for entry in ranking] == sorted((entry["score"] for entry in ranking), reverse=True)
+
+        best = ranking[0]
+        draft = team + [{"champion": best["champion"], "position": "jungle"}]
+        single = analyzer.score_drafts([draft], [sample_enemy_picks])
+        assert best["score"] == pytest.approx(float(single.composite()[0]), abs=0.01)
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy não instalado")
+    def test_batch_scoring_benchmark(self):
+        """10k drafts em lote bem mais rápido que analisar um a um"""
+        timings = benchmark_batch_scoring(10_000, loop_sample=500)
+        assert timings["speedup"] > 2
+
 
 # Função para executar testes manualmente
 async def run_manual_tests():
@@ -386,7 +584,7 @@ async def run_manual_tests():
     print("=" * 60)
     
     analyzer = CompositionAnalyzer()
-    await asyncio.sleep(2)  # Aguarda inicialização
+    await analyzer.ensure_loaded()
     
     sample_picks = [
         {"champion": "Azir", "position": "mid", "pick_order": 1},
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Testes do LiveStatsStream contra um feed livestats gravado
+
+Verifica:
+- Descoberta de games em andamento
+- Evento de draft completo e avanço do cursor startingTime
+- Cadência adaptativa quando não há frames novos
+- Fim de game e consumo dos eventos pelo sistema de tips
+- Consultas do stream ignoram o cache do RiotAPIClient
+"""
+
+import asyncio
+import json
+import pytest
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.systems.live_stats_stream import (
+    LiveStatsStream,
+    LiveEventType,
+    RecordedLiveStatsFeed
+)
+from bot.systems.tips_system import ProfessionalTipsSystem
+from bot.systems.schedule_manager import ScheduleManager
+from bot.api_clients.riot_api_client import RiotAPIClient
+
+
+GAME_ID = "110853020184706766"
+
+
+def _participants(champions):
+    return [
+        {"participantId": i + 1, "championId": champ, "role": role}
+        for i, (champ, role) in enumerate(zip(champions, ["top", "jungle", "mid", "bottom", "support"]))
+    ]
+
+
+def _window(frames, draft=True):
+    metadata = {
+        "patchVersion": "14.10.1",
+        "blueTeamMetadata": {"participantMetadata": _participants(
+            ["Gnar", "Graves", "Azir", "Jinx", "Thresh"] if draft else ["Gnar", "Graves"]
+        )},
+        "redTeamMetadata": {"participantMetadata": _participants(
+            ["Jayce", "Kindred", "Viktor", "Aphelios", "Leona"] if draft else ["Jayce"]
+        )}
+    }
+    return {"esportsGameId": GAME_ID, "gameMetadata": metadata, "frames": frames}
+
+
+def _frame(timestamp, state="in_game", gold=2500):
+    return {
+        "rfc460Timestamp": timestamp,
+        "gameState": state,
+        "blueTeam": {"totalGold": gold, "totalKills": 0, "towers": 0, "barons": 0, "inhibitors": 0, "dragons": []},
+        "redTeam": {"totalGold": 2500, "totalKills": 0, "towers": 0, "barons": 0, "inhibitors": 0, "dragons": []}
+    }
+
+
+LIVE_EVENT = {
+    "id": "110853020184706700",
+    "state": "inProgress",
+    "type": "match",
+    "league": {"name": "LCK"},
+    "match": {
+        "teams": [{"name": "T1"}, {"name": "Gen.G"}],
+        "games": [{"id": GAME_ID, "number": 2, "state": "inProgress"}]
+    }
+}
+
+
+@pytest.fixture
+def recorded_feed_path(tmp_path):
+    """Feed gravado: draft parcial, draft completo, frame repetido e fim de game"""
+    records = [
+        {"type": "live", "events": [LIVE_EVENT]},
+        {"type": "window", "game_id": GAME_ID, "response": _window([], draft=False)},
+        {"type": "window", "game_id": GAME_ID, "response": _window([
+            _frame("2024-05-10T10:00:00.000Z"),
+            _frame("2024-05-10T10:00:10.000Z")
+        ])},
+        {"type": "window", "game_id": GAME_ID, "response": _window([
+            _frame("2024-05-10T10:00:10.000Z")
+        ])},
+        {"type": "window", "game_id": GAME_ID, "response": _window([
+            _frame("2024-05-10T10:31:00.000Z", state="finished", gold=60000)
+        ])}
+    ]
+    path = tmp_path / "livestats_feed.jsonl"
+    path.write_text("\n".join(json.dumps(record) for record in records), encoding="utf-8")
+    return path
+
+
+class _FakeResponse:
+    """Resposta HTTP mínima (status 200 + JSON)"""
+
+    def __init__(self, payload):
+        self.status = 200
+        self.headers = {}
+        self._payload = payload
+
+    async def json(self):
+        return self._payload
+
+    async def read(self):
+        return json.dumps(self._payload).encode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeSession:
+    """Sessão aiohttp falsa que serve o feed gravado e conta requisições por endpoint"""
+
+    closed = False
+
+    def __init__(self, records):
+        self._live = [r["events"] for r in records if r["type"] == "live"]
+        self._windows = [r["response"] for r in records if r["type"] == "window"]
+        self.requests = []
+
+    def get(self, url, params=None, headers=None):
+        self.requests.append(url)
+        if url.endswith("/getLive"):
+            payload = {"data": {"schedule": {"events": self._live[0]}}}
+        else:
+            index = sum(1 for u in self.requests if "/window/" in u) - 1
+            payload = self._windows[min(index, len(self._windows) - 1)]
+        return _FakeResponse(payload)
+
+    async def close(self):
+        self.closed = True
+
+
+class TestLiveStatsStream:
+    """Testes do stream de livestats com feed gravado"""
+
+    @pytest.mark.asyncio
+    async def test_draft_complete_and_cursor(self, recorded_feed_path):
+        """Publica DRAFT_COMPLETE uma única vez e avança o cursor pelos frames"""
+        feed = RecordedLiveStatsFeed(recorded_feed_path)
+        stream = LiveStatsStream(feed, min_poll_seconds=1, max_poll_seconds=8, discovery_seconds=1000)
+
+        # 1º ciclo: descobre o game, draft ainda parcial
+        assert await stream.step(now=0) == 0
+        assert GAME_ID in stream.tracked_games
+
+        # 2º ciclo: draft completo + frame in_game
+        await stream.step(now=10)
+        first = stream.event_queue.get_nowait()
+        assert first.event_type == LiveEventType.DRAFT_COMPLETE
+        assert first.match.game_number == 2
+        assert [c["name"] for c in first.match.team1_composition] == ["Gnar", "Graves", "Azir", "Jinx", "Thresh"]
+
+        state_event = stream.event_queue.get_nowait()
+        assert state_event.event_type == LiveEventType.STATE_CHANGE
+        assert state_event.game_state == "in_game"
+
+        # Cursor usado na próxima consulta corresponde ao último frame
+        await stream.step(now=20)
+        assert feed.window_requests[-1]["starting_time"] == "2024-05-10T10:00:10.000Z"
+        assert stream.event_queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_adaptive_cadence_backs_off(self, recorded_feed_path):
+        """Sem frames novos o intervalo de consulta aumenta até o máximo"""
+        feed = RecordedLiveStatsFeed(recorded_feed_path)
+        stream = LiveStatsStream(feed, min_poll_seconds=1, max_poll_seconds=8, discovery_seconds=1000)
+
+        await stream.step(now=0)
+        await stream.step(now=10)
+        game = stream.tracked_games[GAME_ID]
+        assert game.poll_interval == 1
+
+        await stream.step(now=20)  # frame repetido
+        assert game.poll_interval == 1.5
+        assert game.next_poll_at == 21.5
+
+        # Game não vencido não é consultado
+        polls = stream.stats["window_polls"]
+        await stream.step(now=21)
+        assert stream.stats["window_polls"] == polls
+
+    @pytest.mark.asyncio
+    async def test_game_finished_untracks(self, recorded_feed_path):
+        """Frame finished publica GAME_FINISHED e remove o game"""
+        feed = RecordedLiveStatsFeed(recorded_feed_path)
+        stream = LiveStatsStream(feed, min_poll_seconds=1, max_poll_seconds=8, discovery_seconds=1000)
+
+        for now in (0, 10, 20, 30):
+            await stream.step(now=now)
+
+        events = []
+        while not stream.event_queue.empty():
+            events.append(stream.event_queue.get_nowait())
+
+        assert events[-1].event_type == LiveEventType.GAME_FINISHED
+        assert GAME_ID not in stream.tracked_games
+        assert stream.stats["games_finished"] == 1
+
+    @pytest.mark.asyncio
+    async def test_tips_system_consumes_draft_event(self, recorded_feed_path):
+        """Evento de draft completo dispara o pipeline de tips sem scan"""
+        feed = RecordedLiveStatsFeed(recorded_feed_path)
+        stream = LiveStatsStream(feed, min_poll_seconds=1, max_poll_seconds=8, discovery_seconds=1000)
+        tips_system = ProfessionalTipsSystem(MagicMock(), MagicMock(), MagicMock())
+
+        generated = []
+
+        async def fake_generate(match):
+            generated.append(match)
+            return MagicMock(tip_on_team="T1", odds=1.85, units=1.0)
+
+        tips_system._generate_tip_for_match = fake_generate
+
+        await stream.step(now=0)
+        await stream.step(now=10)
+
+        draft_event = stream.event_queue.get_nowait()
+        tips = await tips_system._handle_live_event(draft_event)
+
+        assert tips == 1
+        assert generated and generated[0].match_id == draft_event.match.match_id
+        assert tips_system.draft_cache[draft_event.match.match_id].source == "livestats_stream"
+        assert tips_system.generated_tips
+
+    @pytest.mark.asyncio
+    async def test_game_discovered_mid_match_never_emits_draft(self, tmp_path):
+        """Feed que começa em frame tardio (restart do bot): sem DRAFT_COMPLETE nem tips"""
+        records = [
+            {"type": "live", "events": [LIVE_EVENT]},
+            {"type": "window", "game_id": GAME_ID, "response": _window([
+                _frame("2024-05-10T10:24:00.000Z", gold=41000),
+                _frame("2024-05-10T10:24:10.000Z", gold=41500)
+            ])},
+            {"type": "window", "game_id": GAME_ID, "response": _window([
+                _frame("2024-05-10T10:24:20.000Z", gold=42000)
+            ])}
+        ]
+        path = tmp_path / "late_feed.jsonl"
+        path.write_text("\n".join(json.dumps(record) for record in records), encoding="utf-8")
+
+        feed = RecordedLiveStatsFeed(path)
+        stream = LiveStatsStream(feed, min_poll_seconds=1, max_poll_seconds=8, discovery_seconds=1000)
+        tips_system = ProfessionalTipsSystem(MagicMock(), MagicMock(), MagicMock())
+        tips_system._generate_tip_for_match = MagicMock(side_effect=AssertionError("tip tardia"))
+
+        await stream.step(now=0)
+        await stream.step(now=10)
+
+        events = []
+        while not stream.event_queue.empty():
+            events.append(stream.event_queue.get_nowait())
+
+        game = stream.tracked_games[GAME_ID]
+        assert game.late_join and stream.stats["late_joins"] == 1
+        assert LiveEventType.DRAFT_COMPLETE not in [event.event_type for event in events]
+        assert [event.event_type for event in events] == [LiveEventType.STATE_CHANGE]
+        assert game.poll_interval == 8
+        for event in events:
+            assert await tips_system._handle_live_event(event) == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_bypasses_riot_client_cache(self, recorded_feed_path):
+        """Com o RiotAPIClient real, cada ciclo do stream vai à rede (sem respostas do cache de 30s)"""
+        records = [json.loads(line) for line in recorded_feed_path.read_text(encoding="utf-8").splitlines()]
+        client = RiotAPIClient(api_key="test")
+        session = _FakeSession(records)
+        client.session = session
+        stream = LiveStatsStream(client, min_poll_seconds=1, max_poll_seconds=8, discovery_seconds=5)
+
+        await stream.step(now=0)
+        await stream.step(now=10)
+        await stream.step(now=20)
+
+        # Sem cursor no 1º e 2º poll a URL/params se repetem: ainda assim nada veio do cache
+        assert sum("/window/" in url for url in session.requests) == 3
+        assert sum(url.endswith("/getLive") for url in session.requests) == 3
+        assert client.cache.get_stats()["entries"] == 0
+        assert stream.event_queue.get_nowait().event_type == LiveEventType.DRAFT_COMPLETE
+
+        # Chamadas comuns (fora do stream) continuam usando o cache
+        await client.get_live_matches()
+        await client.get_live_matches()
+        assert sum(url.endswith("/getLive") for url in session.requests) == 4
+
+    def test_schedule_manager_builds_stream_behind_flag(self):
+        """ScheduleManager cria o LiveStatsStream sobre o riot_client só com o flag ligado"""
+        riot_client = MagicMock()
+
+        enabled = ScheduleManager(MagicMock(), MagicMock(), MagicMock(), riot_client, enable_live_stream=True)
+        assert isinstance(enabled.live_stream, LiveStatsStream)
+        assert enabled.live_stream.riot_client is riot_client
+
+        disabled = ScheduleManager(MagicMock(), MagicMock(), MagicMock(), riot_client, enable_live_stream=False)
+        assert disabled.live_stream is None
+
+        provided = LiveStatsStream(riot_client)
+        assert ScheduleManager(
+            MagicMock(), MagicMock(), MagicMock(), riot_client, live_stream=provided, enable_live_stream=True
+        ).live_stream is provided
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Testes do memo de resoluções derivadas do MatchData
+
+Verifica:
+- Invalidação por mudanças internas no raw_data e na série
+- Expiração por TTL de resoluções dependentes do relógio
+- Bloqueio temporal do sistema de tips avaliado fora do memo
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.data_models.match_data import MatchData
+from bot.systems.tips_system import ProfessionalTipsSystem
+
+
+def _match(**raw_data):
+    return MatchData(
+        match_id="123", team1_name="T1", team2_name="Gen.G",
+        league="LCK", status="running", raw_data=raw_data
+    )
+
+
+class TestMatchDataMemo:
+    """Testes do memo por snapshot da partida"""
+
+    def test_memo_tracks_series_state_mutations(self):
+        """Status de game alterado in-place no raw_data ou na série recalcula o valor"""
+        match = _match(games=[{"number": 1, "status": "running"}])
+        match.serie = {"opponent1": {"wins": 0}, "opponent2": {"wins": 0}}
+        compute = MagicMock(side_effect=[1, 2, 3])
+
+        assert match.memoize("value", compute) == 1
+        assert match.memoize("value", compute) == 1
+
+        match.raw_data["games"][0]["status"] = "finished"
+        assert match.memoize("value", compute) == 2
+
+        match.serie["opponent1"]["wins"] = 1
+        assert match.memoize("value", compute) == 3
+        assert compute.call_count == 3
+
+    def test_memo_entry_expires_after_ttl(self):
+        """Entradas com TTL são recalculadas após expirar; sem TTL permanecem"""
+        match = _match()
+        compute = MagicMock(side_effect=[1, 2])
+
+        with patch("bot.data_models.match_data.time.monotonic", return_value=100.0):
+            assert match.memoize("timed", compute, ttl=60) == 1
+            assert match.memoize("fixed", lambda: "x") == "x"
+        with patch("bot.data_models.match_data.time.monotonic", return_value=159.0):
+            assert match.memoize("timed", compute, ttl=60) == 1
+        with patch("bot.data_models.match_data.time.monotonic", return_value=161.0):
+            assert match.memoize("timed", compute, ttl=60) == 2
+            assert match.memoize("fixed", lambda: "y") == "x"
+
+    def test_temporal_block_not_frozen_by_memo(self):
+        """Partida de vida longa passa a ser bloqueada quando cruza 3h, mesmo com memo ativo"""
+        tips_system = ProfessionalTipsSystem(MagicMock(), MagicMock(), MagicMock())
+        match = _match()
+        match.game_number = 1
+        match.begin_at = (datetime.now(timezone.utc) - timedelta(hours=2)).isoformat()
+
+        assert tips_system._is_current_game_active(match) is True
+
+        # Relógio avança sem mudar o snapshot (sem passar pelo __setattr__ que invalida o memo)
+        object.__setattr__(match, "begin_at", (datetime.now(timezone.utc) - timedelta(hours=4)).isoformat())
+        assert "current_game_active" in match._memo
+        assert tips_system._is_current_game_active(match) is False
@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Testes do Personal Bankroll Manager
+
+Verifica:
+- Persistência snapshot + journal e recuperação de linha truncada
+- Índices em memória (id, pendentes, limite diário) e IDs únicos
+- Backend SQLite opcional
+- Agregados incrementais do Betting Tracker
+- Análises vetorizadas (colunas NumPy): estatísticas, breakdowns de padrões
+  e por liga, e benchmark dos breakdowns com 100k apostas
+- Curva de capital (pico, drawdown e gráfico amostrado)
+- Índice de resultados do Pre-Game Analyzer (forma e H2H)
+- Importação em massa de partidas (CSV/JSONL)
+- Persistência write-behind e arquivo gzip das análises pré-jogo
+- Ratings Elo dos times (incremental x replay)
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.personal_betting.bankroll_manager import PersonalBankrollManager
+from bot.personal_betting.bet_columns import NUMPY_AVAILABLE, ODDS_RANGES, benchmark_pattern_breakdowns
+from bot.personal_betting.betting_tracker import BettingTracker
+from bot.personal_betting.equity_curve import EquityCurve
+from bot.personal_betting.match_importer import import_match_history
+from bot.personal_betting.pre_game_analyzer import MatchResult, PreGameAnalyzer
+from bot.personal_betting.rolling_aggregates import StreakSummary
+from bot.personal_betting.sqlite_store import PersonalBettingStore
+from bot.personal_betting.team_ratings import BASE_RATING, TeamRatingEngine, expected_score
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    return str(tmp_path / "bankroll_data.json")
+
+
+@pytest.fixture
+def manager(data_file):
+    manager = PersonalBankrollManager(data_file)
+    manager.setup_bankroll(1000.0)
+    return manager
+
+
+def _place(manager, amount=10.0, team="T1"):
+    return manager.place_bet(team, "Gen.G", "LCK", 1.9, amount, 75.0, 5.0, "teste")
+
+
+class TestPersonalBankroll:
+    """Testes de persistência e índices do bankroll"""
+
+    def test_journal_replay(self, manager, data_file):
+        """Apostas e resoluções sobrevivem a um reload via journal"""
+        bet_id = _place(manager)["bet_id"]
+        _place(manager, 20.0)
+        manager.resolve_bet(bet_id, won=True)
+
+        reloaded = PersonalBankrollManager(data_file)
+
+        assert len(reloaded.bets) == 2
+        assert reloaded.settings.current_bankroll == pytest.approx(manager.settings.current_bankroll)
+        assert reloaded.bets[0].status == "won"
+        assert [bet["amount"] for bet in reloaded.get_pending_bets()] == [20.0]
+
+    def test_truncated_journal_tail_is_ignored(self, manager, data_file):
+        """Linha final incompleta (crash) é descartada sem perder as anteriores"""
+        _place(manager)
+
+        with open(manager.journal.journal_file, "a", encoding="utf-8") as f:
+            f.write('{"seq": 99, "type": "bet_pla')
+
+        reloaded = PersonalBankrollManager(data_file)
+        assert len(reloaded.bets) == 1
+
+        # Novos eventos continuam legíveis após a recuperação
+        _place(reloaded, 15.0)
+        assert len(PersonalBankrollManager(data_file).bets) == 2
+
+    def test_corrupt_middle_journal_line_keeps_later_events(self, manager, data_file):
+        """Linha corrompida no meio é pulada; eventos seguintes não são apagados"""
+        _place(manager)
+        with open(manager.journal.journal_file, "a", encoding="utf-8") as f:
+            f.write('{"seq": 2, "type": "bet_pla\n')
+        manager.journal.last_seq += 1
+        _place(manager, 15.0)
+        size = os.path.getsize(manager.journal.journal_file)
+
+        reloaded = PersonalBankrollManager(data_file)
+        assert [bet.amount for bet in reloaded.bets] == [10.0, 15.0]
+        assert os.path.getsize(reloaded.journal.journal_file) == size
+
+    def test_indexes_and_unique_ids(self, manager):
+        """IDs não colidem no mesmo segundo e o limite diário acompanha pendentes"""
+        daily_limit = manager.get_daily_remaining_limit()
+
+        first = _place(manager)["bet_id"]
+        second = _place(manager)["bet_id"]
+        assert first != second
+
+        assert len(manager.get_pending_bets()) == 2
+        assert manager.get_daily_remaining_limit() == pytest.approx(
+            manager.get_daily_limit() - 20.0
+        )
+
+        manager.resolve_bet(first, won=False)
+        assert [bet["id"] for bet in manager.get_pending_bets()] == [second]
+        assert manager.get_daily_remaining_limit() < daily_limit
+        assert manager.resolve_bet(first, won=True)["success"] is False
+
+    def test_sqlite_backend(self, tmp_path):
+        """Backend SQLite grava por linha e responde consultas por período"""
+        store = PersonalBettingStore(str(tmp_path / "betting.db"))
+        manager = PersonalBankrollManager(str(tmp_path / "unused.json"), store=store)
+        manager.setup_bankroll(500.0)
+
+        bet_id = _place(manager)["bet_id"]
+        _place(manager, 5.0, team="Gen.G")
+        manager.resolve_bet(bet_id, won=True)
+
+        reloaded = PersonalBankrollManager(str(tmp_path / "unused.json"), store=store)
+
+        assert reloaded.settings.current_bankroll == pytest.approx(manager.settings.current_bankroll)
+        assert len(reloaded.get_pending_bets()) == 1
+        assert reloaded.get_performance_stats(30)["total_bets"] == 1
+        assert [bet["team"] for bet in store.get_bets_since("2000-01-01", resolved_only=True)] == ["T1"]
+        assert not os.path.exists(tmp_path / "unused.json")
+        store.close()
+
+    def test_tracker_incremental_metrics(self, manager, tmp_path):
+        """Métricas do tracker acompanham place/resolve sem rescan"""
+        manager.settings.daily_limit_percentage = 100.0
+        tracker = BettingTracker(str(tmp_path / "tracker.json"), bankroll_manager=manager)
+        assert tracker.calculate_performance_metrics(30).total_bets == 0
+
+        outcomes = [True, True, False, True, True, True, False, False]
+        bet_ids = [_place(manager, 10.0)["bet_id"] for _ in outcomes]
+        for bet_id, won in zip(bet_ids, outcomes):
+            manager.resolve_bet(bet_id, won=won)
+        _place(manager, 10.0)
+
+        metrics = tracker.calculate_performance_metrics(30)
+        assert metrics.total_bets == 9
+        assert metrics.pending_bets == 1
+        assert metrics.won_bets == 5
+        assert metrics.best_streak == 3
+        assert metrics.worst_streak == 2
+        assert (metrics.current_streak, metrics.streak_type) == (2, "loss")
+        assert metrics.total_profit == pytest.approx(5 * 9.0 - 3 * 10.0)
+
+    def test_streak_summary_combine(self):
+        """Resumos de trechos combinados equivalem ao trecho inteiro"""
+        statuses = ["won", "won", "lost", "won", "won", "won", "lost"]
+        whole = StreakSummary.from_statuses(statuses)
+
+        for split in range(len(statuses) + 1):
+            combined = StreakSummary.from_statuses(statuses[:split]).combine(
+                StreakSummary.from_statuses(statuses[split:])
+            )
+            assert combined == whole
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy não instalado")
+    def test_columnar_stats_match_python_path(self, manager, tmp_path):
+        """Estatísticas e breakdowns vetorizados iguais ao cálculo em Python"""
+        manager.settings.daily_limit_percentage = 100.0
+        for i, odds in enumerate([1.4, 1.5, 1.9, 2.0, 2.5, 3.0, 3.5, 1.2]):
+            bet_id = manager.place_bet("T1", "Gen.G", "LCK" if i % 2 else "LEC", odds,
+                                       5.0 + i, 75.0, 5.0, "teste")["bet_id"]
+            manager.resolve_bet(bet_id, won=i % 3 != 0)
+        _place(manager, 10.0)  # pendente fica fora dos breakdowns
+        resolved = [bet for bet in manager.bets if bet.status != "pending"]
+
+        def expected(group_of):
+            groups = {}
+            for bet in resolved:
+                stats = groups.setdefault(group_of(bet), {"bets": 0, "wins": 0, "profit": 0.0})
+                stats["bets"] += 1
+                stats["wins"] += bet.status == "won"
+                stats["profit"] += bet.profit
+            return groups
+
+        def assert_groups(actual, expected_groups):
+            assert {key for key, stats in actual.items() if stats["bets"]} == set(expected_groups)
+            for key, stats in expected_groups.items():
+                assert actual[key]["bets"] == stats["bets"]
+                assert actual[key]["wins"] == stats["wins"]
+                assert actual[key]["profit"] == pytest.approx(stats["profit"])
+                assert actual[key]["win_rate"] == pytest.approx(stats["wins"] / stats["bets"] * 100)
+
+        tracker = BettingTracker(str(tmp_path / "tracker.json"), bankroll_manager=manager)
+        patterns = tracker.analyze_betting_patterns(90)
+        assert patterns["total_bets_analyzed"] == 8
+
+        odds_key = lambda bet: next(key for key, upper in ODDS_RANGES if bet.odds <= upper)
+        assert_groups(patterns["odds_range_performance"], expected(odds_key))
+        assert_groups(patterns["league_performance"], expected(lambda bet: bet.league))
+        assert_groups(patterns["weekday_performance"],
+                      expected(lambda bet: datetime.fromisoformat(bet.date).strftime("%A")))
+
+        amounts = sorted(bet.amount for bet in resolved)
+        q1, q3 = amounts[2], amounts[6]
+        size_key = lambda bet: ("Pequenas (≤R$7)" if bet.amount <= q1 else
+                                "Médias (R$7-R$11)" if bet.amount <= q3 else "Grandes (>R$11)")
+        assert_groups(patterns["bet_size_performance"], expected(size_key))
+
+        league_totals = manager.columns.league_breakdown()
+        assert_groups(league_totals, expected(lambda bet: bet.league))
+        assert league_totals["LCK"]["staked"] == pytest.approx(6.0 + 8.0 + 10.0 + 12.0)
+        assert "LCK: 4 apostas" in tracker._generate_league_breakdown()
+
+        columns, manager.columns = manager.columns, None
+        python_stats = manager.get_performance_stats(30)
+        assert "error" in tracker.analyze_betting_patterns(90)
+        manager.columns = columns
+
+        vectorized_stats = manager.get_performance_stats(30)
+        for key in ("total_bets", "won_bets", "total_staked", "total_profit", "roi", "best_bet", "worst_bet"):
+            assert vectorized_stats[key] == pytest.approx(python_stats[key])
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy não instalado")
+    def test_pattern_benchmark_100k(self):
+        """Benchmark recalcula todos os breakdowns de padrões sobre as 100k apostas"""
+        timings = benchmark_pattern_breakdowns(100_000, repeats=3)
+        print(f"\nBreakdowns de 100k apostas: {timings}")
+
+        # Janela do benchmark cobre todo o histórico: só pendentes ficam de fora
+        assert 90_000 < timings["bets_analyzed"] < 100_000
+        for key in ("pattern_breakdown_ms", "league_breakdown_ms", "performance_stats_ms"):
+            assert timings[key] > 0
+        assert timings["total_ms"] == pytest.approx(
+            timings["pattern_breakdown_ms"] + timings["league_breakdown_ms"] + timings["performance_stats_ms"]
+        )
+        assert timings["within_target"] == (timings["total_ms"] < 100.0)
+
+    def test_equity_curve_drawdown(self):
+        """Pico, drawdown máximo e duração calculados incrementalmente"""
+        curve = EquityCurve(100.0, timestamp=0.0)
+        for moment, value in [(1, 120.0), (2, 90.0), (3, 110.0), (5, 125.0), (6, 100.0)]:
+            curve.record(value, moment * 86400.0)
+
+        assert (curve.peak, curve.low) == (125.0, 90.0)
+        assert curve.max_drawdown == pytest.approx(30.0)
+        assert curve.max_drawdown_pct == pytest.approx(25.0)
+        assert curve.max_drawdown_seconds == pytest.approx(4 * 86400.0)
+        assert curve.current_drawdown_pct == pytest.approx(20.0)
+        assert curve.longest_drawdown_seconds(now=20 * 86400.0) == pytest.approx(15 * 86400.0)
+
+        assert curve.downsample(3) == [100.0, 90.0, 100.0]
+        assert curve.downsample(50, since=5 * 86400.0) == [125.0, 100.0]
+
+    def test_equity_curve_follows_manager(self, manager, data_file, tmp_path):
+        """Manager registra cada evento e reconstrói a mesma curva no reload"""
+        manager.settings.daily_limit_percentage = 100.0
+        first = _place(manager, 100.0)["bet_id"]
+        second = _place(manager, 50.0)["bet_id"]
+        manager.resolve_bet(first, won=False)
+        manager.resolve_bet(second, won=True)
+
+        assert list(manager.equity.values) == pytest.approx([1000.0, 900.0, 850.0, 850.0, 945.0])
+        assert manager.equity.max_drawdown == pytest.approx(150.0)
+
+        reloaded = PersonalBankrollManager(data_file)
+        assert list(reloaded.equity.values) == pytest.approx(list(manager.equity.values))
+
+        tracker = BettingTracker(str(tmp_path / "tracker.json"), bankroll_manager=manager)
+        metrics = tracker.calculate_performance_metrics(30)
+        assert (metrics.bankroll_peak, metrics.bankroll_low) == (1000.0, 850.0)
+        assert metrics.max_drawdown_pct == pytest.approx(15.0)
+        assert "Evolução do Bankroll (5 eventos)" in tracker._generate_bankroll_chart(30)
+        assert tracker.get_equity_chart_data(30)["values"][-1] == 945.0
+
+
+class TestPreGameResultsIndex:
+    """Testes do índice de resultados históricos"""
+
+    def test_form_and_head_to_head_from_index(self, tmp_path):
+        """Form e H2H acompanham add_match_result em ordem de data"""
+        from datetime import datetime, timedelta
+
+        analyzer = PreGameAnalyzer(str(tmp_path / "pre_game.json"))
+        now = datetime.now()
+
+        # Inseridos fora de ordem: o índice ordena por data
+        for days_ago, winner in [(2, "G2"), (40, "FNC"), (1, "FNC"), (3, "G2")]:
+            analyzer.add_match_result(MatchResult(
+                date=(now - timedelta(days=days_ago)).isoformat(),
+                team1="G2", team2="FNC", winner=winner, duration_minutes=30 + days_ago,
+                patch="14.1", league="LEC", importance="regular"
+            ))
+
+        assert analyzer.team_stats["G2"].last_5_games == ["W", "W", "L"]
+        assert analyzer.team_stats["G2"].form_trend == "improving"
+        assert analyzer.team_stats["FNC"].form_trend == "declining"
+
+        h2h = analyzer._calculate_head_to_head("FNC", "G2")
+        assert (h2h.team1_wins, h2h.team2_wins, h2h.total_games) == (2, 2, 4)
+        assert h2h.avg_game_duration == pytest.approx(30 + 46 / 4)
+        assert h2h.last_meeting_date == (now - timedelta(days=1)).isoformat()
+        assert h2h.recent_trend == "team2_favored"
+
+        t1_matches = analyzer._get_team_matches_since("T1", now - timedelta(days=30))
+        assert [m.date for m in t1_matches] == sorted(m.date for m in t1_matches)
+        assert len(t1_matches) == 5
+
+    def test_bulk_import_csv_and_jsonl(self, tmp_path):
+        """Importação normaliza aliases, ignora duplicadas/inválidas e grava em lote"""
+        import json
+
+        csv_path = tmp_path / "matches.csv"
+        csv_path.write_text(
+            "date,blue_team,red_team,winner,gamelength,league\n"
+            "2024-03-01T10:00:00,SK Telecom T1,Gen.G Esports,blue,1920,LCK\n"
+            "2024-03-02T10:00:00,Gen.G Esports,SKT,SK Telecom T1,1800,LCK\n"
+            "2024-03-03T10:00:00,G2 Esports,Fnatic,Unknown Team,2000,LEC\n",
+            encoding="utf-8"
+        )
+        jsonl_path = tmp_path / "matches.jsonl"
+        jsonl_path.write_text("\n".join([
+            json.dumps({"date": "2024-03-01T10:00:00", "team1": "T1", "team2": "Gen.G",
+                        "winner": "T1", "duration_minutes": 32, "league": "LCK"}),
+            json.dumps({"date": "2024-03-04T10:00:00Z", "team1": "G2", "team2": "FNC",
+                        "winner": "2", "duration_minutes": 28, "league": "LEC"}),
+            '{"date": "2024-03-05',
+        ]), encoding="utf-8")
+
+        store = PersonalBettingStore(str(tmp_path / "betting.db"))
+        analyzer = PreGameAnalyzer(str(tmp_path / "pre_game.json"), store=store)
+        baseline = len(analyzer.historical_results)
+
+        counts = import_match_history(analyzer, str(csv_path), chunk_size=2)
+        assert (counts["rows"], counts["imported"], counts["invalid"]) == (3, 2, 1)
+
+        counts = import_match_history(analyzer, str(jsonl_path))
+        assert (counts["imported"], counts["duplicates"]) == (1, 1)
+
+        h2h = analyzer._calculate_head_to_head("T1", "Gen.G")
+        assert h2h.team1_wins == baseline + 2
+        assert analyzer._calculate_head_to_head("G2", "FNC").team2_wins == 1
+
+        reloaded = PreGameAnalyzer(str(tmp_path / "pre_game.json"), store=store)
+        assert len(reloaded.historical_results) == baseline + 3
+        store.close()
+
+    def test_duplicate_match_result_ignored(self, tmp_path):
+        """Resultado repetido não entra no histórico em memória nem conta duas vezes no Elo"""
+        store = PersonalBettingStore(str(tmp_path / "betting.db"))
+        analyzer = PreGameAnalyzer(str(tmp_path / "pre_game.json"), store=store)
+        baseline = len(analyzer.historical_results)
+        result = MatchResult(
+            date="2024-03-01T10:00:00", team1="G2", team2="FNC", winner="G2",
+            duration_minutes=30, patch="14.1", league="LEC", importance="regular"
+        )
+
+        analyzer.add_match_result(result)
+        ratings = analyzer.ratings.to_dict()
+        analyzer.add_match_result(MatchResult(**result.__dict__))
+
+        assert len(analyzer.historical_results) == baseline + 1
+        assert analyzer.ratings.to_dict() == ratings
+        assert len(PreGameAnalyzer(str(tmp_path / "pre_game.json"), store=store).historical_results) == baseline + 1
+        analyzer.analysis_writer.close()
+        store.close()
+
+    def test_bulk_import_replays_ratings_once(self, tmp_path):
+        """Histórico anterior aos ratings atuais: um único replay no fim, não um por lote"""
+        from unittest.mock import patch
+
+        csv_path = tmp_path / "matches.csv"
+        rows = [f"2024-03-{day:02d}T10:00:00,G2,FNC,{'G2' if day % 3 else 'FNC'},30,LEC" for day in range(1, 21)]
+        csv_path.write_text("date,team1,team2,winner,duration_minutes,league\n" + "\n".join(rows), encoding="utf-8")
+
+        analyzer = PreGameAnalyzer(str(tmp_path / "pre_game.json"))
+        with patch.object(analyzer.ratings, "replay", wraps=analyzer.ratings.replay) as replay:
+            counts = import_match_history(analyzer, str(csv_path), chunk_size=4)
+
+        assert counts["imported"] == 20
+        assert replay.call_count == 1
+
+        replayed = TeamRatingEngine()
+        replayed.replay(analyzer.historical_results)
+        assert analyzer.ratings.to_dict() == replayed.to_dict()
+        analyzer.analysis_writer.close()
+
+    def test_write_behind_and_archive(self, tmp_path):
+        """Análises gravam em lote e as expiradas vão para o arquivo gzip"""
+        from datetime import datetime, timedelta
+
+        data_file = str(tmp_path / "pre_game.json")
+        analyzer = PreGameAnalyzer(data_file, flush_interval=60)
+        for team in ("Gen.G", "KT", "DRX"):
+            analyzer.analyze_upcoming_match("T1", team, "LCK")
+
+        assert analyzer.analysis_writer.pending == 3
+        assert not os.path.exists(analyzer.analyses_file)
+        assert analyzer.flush_analyses() == 3
+        assert len(PreGameAnalyzer(data_file).analyses) == 3
+
+        # Primeira análise sai da retenção: arquivada e removida do JSONL ativo
+        expired = analyzer.analyses[0]
+        expired.date = datetime.now() - timedelta(days=45)
+        analyzer._archive_expired_analyses()
+        analyzer.flush_analyses()
+
+        assert [a.id for a in analyzer.analyses] == [a.id for a in PreGameAnalyzer(data_file).analyses]
+        assert len(analyzer.analyses) == 2
+        assert [r["team2"] for r in analyzer.analysis_archive.iter_analyses()] == ["Gen.G"]
+        assert analyzer.get_team_analysis_summary("T1", days=60)["predictions_made"] == 3
+
+        # Segmentos além da retenção do arquivo são apagados
+        analyzer.analysis_archive.append([{"id": "old", "date": "2000-01-01T00:00:00",
+                                           "team1": "T1", "team2": "KT"}])
+        assert len(analyzer.analysis_archive.prune()) == 1
+        analyzer.analysis_writer.close()
+
+    def test_write_behind_retries_failed_flush_and_releases_writer(self):
+        """Lote que falhou é regravado pelo timer; writer fechado não fica preso ao atexit"""
+        import gc
+        import time
+        import weakref
+        from bot.personal_betting import analysis_persistence
+
+        written = []
+        attempts = []
+
+        def flaky_sink(dirty, archived, active):
+            attempts.append(len(dirty))
+            if len(attempts) == 1:
+                raise IOError("disco indisponível")
+            written.extend(dirty)
+
+        writer = analysis_persistence.AnalysisWriteBehind(flaky_sink, flush_interval=0.05)
+        assert writer in analysis_persistence._OPEN_WRITERS
+        writer.mark_dirty("a1", {"id": "a1"})
+
+        deadline = time.time() + 5
+        while not written and time.time() < deadline:
+            time.sleep(0.01)
+        assert [record["id"] for record in written] == ["a1"]
+        assert attempts == [1, 1] and writer.pending == 0
+
+        writer.close()
+        assert writer not in analysis_persistence._OPEN_WRITERS
+        ref = weakref.ref(writer)
+        del writer
+        gc.collect()
+        assert ref() is None
+
+    @pytest.mark.asyncio
+    async def test_flush_async_sqlite(self, tmp_path):
+        """flush_async grava no SQLite sem bloquear o event loop"""
+        store = PersonalBettingStore(str(tmp_path / "betting.db"))
+        analyzer = PreGameAnalyzer(str(tmp_path / "pre_game.json"), store=store, flush_interval=60)
+        analyzer.analyze_upcoming_match("G2", "FNC", "LEC")
+
+        assert store.load_pregame_analyses() == []
+        assert await analyzer.flush_analyses_async() == 1
+        assert len(store.load_pregame_analyses()) == 1
+        analyzer.analysis_writer.close()
+        store.close()
+
+    def test_rating_engine_incremental_matches_replay(self, tmp_path):
+        """Ratings incrementais (inclusive fora de ordem) batem com o replay"""
+        from datetime import datetime, timedelta
+
+        analyzer = PreGameAnalyzer(str(tmp_path / "pre_game.json"))
+        now = datetime.now()
+        for days_ago, winner in [(10, "G2"), (8, "G2"), (6, "FNC"), (4, "G2"), (12, "FNC")]:
+            analyzer.add_match_result(MatchResult(
+                date=(now - timedelta(days=days_ago)).isoformat(),
+                team1="G2", team2="FNC", winner=winner, duration_minutes=30,
+                patch="14.1", league="LEC", importance="regular"
+            ))
+
+        replayed = TeamRatingEngine()
+        replayed.replay(analyzer.historical_results)
+        assert analyzer.ratings.to_dict() == replayed.to_dict()
+
+        g2, fnc = analyzer.ratings.get("g2"), analyzer.ratings.get("FNC")
+        assert g2.rating + fnc.rating == pytest.approx(2 * (BASE_RATING + 40.0))
+        assert g2.rating > fnc.rating
+
+        analysis = analyzer.analyze_upcoming_match("G2", "FNC", "LEC")
+        assert analysis.team1_win_probability == pytest.approx(expected_score(g2.rating, fnc.rating))
+        analyzer.analysis_writer.close()
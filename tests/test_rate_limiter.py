@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Testes do TokenBucketRateLimiter (GCRA multi-janela)
+
+Verifica:
+- Nenhum intervalo de `period` segundos passa de `limit` requisições
+- Orçamento combinado de várias janelas
+- pause() respeitando Retry-After
+- Métricas de espera e orçamento
+- Chamadores concorrentes que cabem no orçamento não são serializados
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+import time
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.api_clients.rate_limiter import RateWindow, TokenBucketRateLimiter, parse_retry_after
+
+
+def _start_times(limiter, requests, step=0.0):
+    """Instantes em que cada requisição é liberada (relógio simulado)"""
+    starts = []
+    for i in range(requests):
+        now = i * step
+        starts.append(now + limiter.reserve(now))
+    return starts
+
+
+def _max_in_window(starts, period):
+    """Maior número de requisições em qualquer intervalo [t, t + period)"""
+    return max(
+        sum(1 for other in starts if start <= other < start + period - 1e-9)
+        for start in starts
+    )
+
+
+class TestRateWindow:
+    """Testes da janela GCRA"""
+
+    @pytest.mark.parametrize("limit,burst", [(10, None), (10, 1), (10, 10), (100, 50), (3, 2)])
+    def test_window_never_exceeds_limit(self, limit, burst):
+        """Rajada + recargas nunca passam de `limit` em qualquer intervalo de `period`"""
+        limiter = TokenBucketRateLimiter([(limit, 2.0, burst) if burst else (limit, 2.0)])
+        starts = _start_times(limiter, limit * 5)
+        assert _max_in_window(starts, 2.0) == limit
+
+        # Chegadas espaçadas também respeitam o limite
+        limiter = TokenBucketRateLimiter([(limit, 2.0, burst) if burst else (limit, 2.0)])
+        starts = _start_times(limiter, limit * 5, step=0.013)
+        assert _max_in_window(starts, 2.0) <= limit
+
+    def test_burst_defaults_to_half_limit(self):
+        """Rajada padrão é metade do limite e é liberada sem espera"""
+        window = RateWindow(name="1s", limit=10, period=1.0)
+        assert window.burst == 5
+        assert window.remaining(0.0) == 5
+
+        for _ in range(5):
+            assert window.wait_time(0.0) == 0.0
+            window.reserve(0.0)
+        assert window.remaining(0.0) == 0
+        assert window.wait_time(0.0) == pytest.approx(1.0 / 6)
+
+    def test_invalid_burst_rejected(self):
+        """Rajada fora de 1..limit é erro de configuração"""
+        with pytest.raises(ValueError):
+            RateWindow(name="1s", limit=10, period=1.0, burst=11)
+        with pytest.raises(ValueError):
+            TokenBucketRateLimiter([])
+
+
+class TestTokenBucketRateLimiter:
+    """Testes do limiter multi-janela"""
+
+    def test_multi_window_budget(self):
+        """A janela mais restritiva em cada momento define a espera"""
+        limiter = TokenBucketRateLimiter([(4, 1.0), (6, 10.0)], name="teste")
+        starts = _start_times(limiter, 20)
+
+        assert _max_in_window(starts, 1.0) <= 4
+        assert _max_in_window(starts, 10.0) <= 6
+        # Rajadas: 2 na janela de 1s; a de 10s (rajada 3) limita depois
+        assert starts[:2] == [0.0, 0.0]
+        assert starts[2] > 0
+
+        budget = limiter.get_stats()["budget"]
+        assert set(budget) == {"1s", "10s"}
+        assert budget["10s"]["limit"] == 6
+        assert budget["10s"]["burst"] == 3
+
+    def test_pause_honors_retry_after(self, monkeypatch):
+        """pause() empurra a próxima vaga para depois do Retry-After"""
+        clock = [100.0]
+        limiter = TokenBucketRateLimiter([(10, 1.0)])
+        monkeypatch.setattr(limiter, "_now", lambda: clock[0])
+
+        limiter.pause(parse_retry_after("30"))
+        assert limiter.reserve() == pytest.approx(30.0)
+        assert limiter.get_stats()["paused_seconds"] == pytest.approx(30.0)
+
+        # Pausa menor não encurta a atual
+        limiter.pause(5)
+        assert limiter.stats["pauses"] == 1
+
+        clock[0] = 131.0
+        assert limiter.reserve() == 0.0
+        assert limiter.get_stats()["paused_seconds"] == 0.0
+
+    def test_parse_retry_after_fallback(self):
+        """Header ausente ou inválido usa o padrão"""
+        assert parse_retry_after("2.5") == 2.5
+        assert parse_retry_after(None) == 60.0
+        assert parse_retry_after("amanhã", default=10.0) == 10.0
+
+    def test_wait_metrics(self, monkeypatch):
+        """Esperas e orçamento aparecem em get_stats"""
+        limiter = TokenBucketRateLimiter([(2, 1.0)])
+        monkeypatch.setattr(limiter, "_now", lambda: 0.0)
+
+        waits = [limiter.reserve() for _ in range(3)]
+        assert waits == [0.0, pytest.approx(0.5), pytest.approx(1.0)]
+
+        stats = limiter.get_stats()
+        assert stats["requests"] == 3
+        assert stats["throttled"] == 2
+        assert stats["max_wait_seconds"] == pytest.approx(1.0)
+        assert stats["avg_wait_seconds"] == pytest.approx(0.5)
+        assert stats["next_slot_seconds"] == pytest.approx(1.5)
+        assert stats["budget"]["1s"]["remaining"] == 0
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_out_pause(self):
+        """acquire() aguarda a pausa recebida antes da requisição"""
+        limiter = TokenBucketRateLimiter([(10, 1.0)])
+        limiter.pause(0.1)
+
+        started = time.monotonic()
+        await limiter.acquire()
+        assert time.monotonic() - started >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_concurrent_acquire_not_serialized(self):
+        """Quem cabe na rajada segue sem esperar quem foi limitado"""
+        limiter = TokenBucketRateLimiter([(10, 1.0)])  # rajada 5, recarga a cada 1/6s
+        loop = asyncio.get_running_loop()
+        finished = {}
+
+        async def call(i):
+            await limiter.acquire()
+            finished[i] = loop.time()
+
+        started = loop.time()
+        await asyncio.gather(*(call(i) for i in range(6)))
+
+        within_burst = [finished[i] - started for i in range(5)]
+        assert max(within_burst) < 0.05
+        assert finished[5] - started >= 0.15
+        assert limiter.stats["throttled"] == 1
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Testes do cache stale-while-revalidate do RealAnalysisService
+
+Verifica:
+- Snapshot expirado servido na hora enquanto uma atualização roda em background
+- Chamadores concorrentes não disparam atualizações duplicadas
+- Falha na atualização mantém o snapshot e espera 60s para tentar de novo
+- start()/close() mantêm uma única sessão durante a vida do bot
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+from datetime import datetime
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.services.real_analysis_service import RealAnalysisService
+
+
+class _FakeLoLEsportsClient:
+    """Cliente LoL Esports falso: conta sessões e buscas, responde quando liberado"""
+
+    def __init__(self, teams):
+        self.teams = teams
+        self.session = None
+        self.sessions_opened = 0
+        self.sessions_closed = 0
+        self.fetches = 0
+        self.error = None
+        self.release = asyncio.Event()
+
+    async def start_session(self):
+        if self.session is None:
+            self.session = object()
+            self.sessions_opened += 1
+
+    async def close_session(self):
+        if self.session is not None:
+            self.session = None
+            self.sessions_closed += 1
+
+    async def get_teams(self):
+        self.fetches += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.teams
+
+    async def get_leagues(self):
+        return [{"name": "LCK"}]
+
+
+def _service(teams=None, snapshot=None, age_seconds=0):
+    """Serviço com cliente falso e, opcionalmente, snapshot com idade dada"""
+    service = RealAnalysisService()
+    service.api_client = _FakeLoLEsportsClient(teams or [{"name": "T1", "code": "T1", "version": 2}])
+    if snapshot is not None:
+        service.teams_cache = snapshot
+        service.last_cache_update = datetime.now().timestamp() - age_seconds
+    return service
+
+
+class TestRealAnalysisServiceRefresh:
+    """Testes do snapshot de times e ligas"""
+
+    @pytest.mark.asyncio
+    async def test_stale_snapshot_served_while_refreshing(self):
+        """Snapshot expirado volta na hora; a troca acontece quando a task termina"""
+        service = _service(snapshot={"t1": {"name": "T1", "version": 1}}, age_seconds=7200)
+
+        team = await asyncio.wait_for(service.get_team_info("T1"), timeout=0.5)
+        assert team["version"] == 1
+
+        await asyncio.sleep(0)
+        assert service._refresh_task is not None and not service._refresh_task.done()
+        assert service.api_client.fetches == 1
+
+        service.api_client.release.set()
+        await service._refresh_task
+        assert (await service.get_team_info("T1"))["version"] == 2
+        assert service.api_client.fetches == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_single_refresh(self):
+        """Vários comandos com snapshot expirado disparam uma única atualização"""
+        service = _service(snapshot={"t1": {"name": "T1", "version": 1}}, age_seconds=7200)
+
+        results = await asyncio.gather(*(service.get_team_info("T1") for _ in range(10)))
+        assert all(team["version"] == 1 for team in results)
+
+        service.api_client.release.set()
+        await service._refresh_task
+        assert service.api_client.fetches == 1
+
+    @pytest.mark.asyncio
+    async def test_cold_start_callers_share_first_load(self):
+        """Sem snapshot, chamadores concorrentes aguardam a mesma primeira carga"""
+        service = _service()
+
+        callers = [asyncio.create_task(service.get_available_teams()) for _ in range(5)]
+        await asyncio.sleep(0)
+        service.api_client.release.set()
+        results = await asyncio.gather(*callers)
+
+        assert all("t1" in teams for teams in results)
+        assert service.api_client.fetches == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_snapshot_and_backs_off(self):
+        """Falha mantém o snapshot antigo e só tenta de novo após 60s"""
+        snapshot = {"t1": {"name": "T1", "version": 1}}
+        service = _service(snapshot=snapshot, age_seconds=7200)
+        service.api_client.error = RuntimeError("HTTP 503")
+        service.api_client.release.set()
+        stale_update = service.last_cache_update
+
+        await service.get_team_info("T1")
+        await service._refresh_task
+        assert service.teams_cache is snapshot
+        assert service.last_cache_update == stale_update
+        assert service.refresh_retry_seconds == 60
+
+        # Dentro da janela de 60s nenhuma nova tentativa é feita
+        for _ in range(3):
+            assert (await service.get_team_info("T1"))["version"] == 1
+        assert service._refresh_task.done()
+        assert service.api_client.fetches == 1
+
+        # Passados 60s, a próxima consulta tenta de novo e troca o snapshot
+        service.last_refresh_attempt -= 61
+        service.api_client.error = None
+        await service.get_team_info("T1")
+        await service._refresh_task
+        assert service.api_client.fetches == 2
+        assert (await service.get_team_info("T1"))["version"] == 2
+
+    @pytest.mark.asyncio
+    async def test_start_close_keep_one_session(self):
+        """Comandos com `async with` reutilizam a sessão aberta por start()"""
+        service = _service()
+        client = service.api_client
+        client.release.set()
+
+        await service.start()
+        session = client.session
+        await service._refresh_task
+
+        for _ in range(3):
+            async with service:
+                await service.get_available_teams()
+            assert client.session is session
+
+        assert (client.sessions_opened, client.sessions_closed) == (1, 0)
+
+        await service.close()
+        assert client.session is None
+        assert client.sessions_closed == 1
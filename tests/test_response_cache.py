@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Testes do ResponseCache (LRU + TTL por classe de endpoint)
+
+Verifica:
+- Ordem LRU: leitura renova a entrada
+- Evicção por orçamento de bytes e de entradas
+- TTL por classe de endpoint (live/schedule/static)
+- Contadores de hit/miss/evicção/expiração
+- Tamanho do corpo informado pelo cliente evita reserializar a resposta
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import patch
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.api_clients.response_cache import ResponseCache, classify_endpoint
+
+
+TTL_CLASSES = {"live": 30, "schedule": 300, "static": 21600}
+
+
+def _cache(**kwargs):
+    kwargs.setdefault("ttl_classes", TTL_CLASSES)
+    return ResponseCache("teste", **kwargs)
+
+
+class TestResponseCache:
+    """Testes do cache de respostas das APIs"""
+
+    def test_lru_order(self):
+        """Entrada lida vai para o fim da fila; a menos usada é removida"""
+        cache = _cache(max_entries=3)
+        for key in ("a", "b", "c"):
+            cache.set(key, key, size=10)
+
+        assert cache.get("a") == "a"
+        cache.set("d", "d", size=10)
+
+        assert "b" not in cache
+        assert list(cache._entries) == ["c", "a", "d"]
+        assert cache.stats["evictions"] == 1
+
+    def test_byte_budget_eviction(self):
+        """Ao passar do orçamento de bytes, remove LRU até caber"""
+        cache = _cache(max_bytes=100)
+        cache.set("a", "a", size=40)
+        cache.set("b", "b", size=40)
+        cache.set("c", "c", size=50)
+
+        assert "a" not in cache and "b" in cache and "c" in cache
+        assert cache.current_bytes == 90
+
+        # Resposta maior que o orçamento nem entra
+        cache.set("grande", "x", size=101)
+        assert "grande" not in cache
+        assert cache.stats["rejected"] == 1
+
+        # Sobrescrever a chave devolve os bytes antigos
+        cache.set("b", "b2", size=10)
+        assert cache.current_bytes == 60
+        assert cache.get("b") == "b2"
+
+    def test_ttl_classes(self):
+        """TTL vem da classe do endpoint; live nunca passa do TTL live"""
+        cache = _cache(default_ttl=120)
+
+        assert classify_endpoint("/persisted/gw/getLive") == "live"
+        assert classify_endpoint("/lol/matches/upcoming") == "schedule"
+        assert classify_endpoint("/lol/leagues") == "static"
+        assert classify_endpoint("/summoner/v4") is None
+
+        assert cache.resolve_ttl("/persisted/gw/getLive", 600) == 30
+        assert cache.resolve_ttl("/persisted/gw/getLive", None) == 30
+        assert cache.resolve_ttl("/lol/matches/upcoming", None) == 300
+        assert cache.resolve_ttl("/lol/matches/upcoming", 60) == 60
+        assert cache.resolve_ttl("/lol/leagues", None) == 21600
+        assert cache.resolve_ttl("/summoner/v4", None) == 120
+
+        with patch("bot.api_clients.response_cache.time.time", return_value=1000.0):
+            cache.set("live", "ao vivo", ttl=600, endpoint="/persisted/gw/getLive")
+            cache.set("times", "times", endpoint="/lol/teams")
+        with patch("bot.api_clients.response_cache.time.time", return_value=1031.0):
+            assert cache.get("live") is None
+            assert cache.get("times") == "times"
+        assert cache.stats["expirations"] == 1
+
+    def test_hit_miss_eviction_stats(self):
+        """Contadores e hit rate refletem as consultas"""
+        cache = _cache(max_entries=1)
+        cache.set("a", {"id": 1})
+        cache.get("a")
+        cache.get("a")
+        cache.get("ausente")
+        cache.set("b", {"id": 2})
+
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+        assert stats["hit_rate"] == pytest.approx(66.67)
+        assert stats["entries"] == 1
+        assert stats["bytes"] == len('{"id":2}')
+
+    def test_known_size_skips_serialization(self):
+        """Com o tamanho do corpo informado, set não serializa a resposta"""
+        cache = _cache()
+        with patch("bot.api_clients.response_cache._estimate_size") as estimate:
+            cache.set("a", {"dados": list(range(1000))}, size=4096)
+        estimate.assert_not_called()
+        assert cache.current_bytes == 4096
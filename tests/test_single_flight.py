@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Testes do SingleFlight (coalescência de requisições em andamento)
+
+Verifica:
+- N chamadas idênticas concorrentes geram uma única requisição
+- Exceção da requisição chega a todos os chamadores
+- Cancelar um chamador não cancela a requisição compartilhada
+- Chave liberada ao concluir (nova chamada refaz a requisição)
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.api_clients.single_flight import SingleFlight, get_single_flight_stats
+
+
+class _FakeEndpoint:
+    """Endpoint lento que conta requisições e só responde quando liberado"""
+
+    def __init__(self, result="ok", error=None):
+        self.calls = 0
+        self.result = result
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def fetch(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class TestSingleFlight:
+    """Testes da coalescência por chave"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_coalesce(self):
+        """Dez chamadas iguais: uma requisição, nove coalescidas"""
+        flight = SingleFlight("teste")
+        endpoint = _FakeEndpoint(result={"id": 1})
+
+        callers = [asyncio.create_task(flight.do("GET /matches", endpoint.fetch)) for _ in range(10)]
+        await asyncio.sleep(0)
+        assert flight.in_flight == 1
+
+        endpoint.release.set()
+        results = await asyncio.gather(*callers)
+
+        assert endpoint.calls == 1
+        assert results == [{"id": 1}] * 10
+        stats = flight.get_stats()
+        assert (stats["requests"], stats["fetches"], stats["coalesced"]) == (10, 1, 9)
+        assert stats["coalesce_rate"] == 90.0
+        assert get_single_flight_stats()["teste"]["coalesced"] >= 9
+
+    @pytest.mark.asyncio
+    async def test_different_keys_not_coalesced(self):
+        """Chaves distintas disparam requisições independentes"""
+        flight = SingleFlight("teste")
+        endpoint = _FakeEndpoint()
+        endpoint.release.set()
+
+        await asyncio.gather(flight.do("a", endpoint.fetch), flight.do("b", endpoint.fetch))
+        assert endpoint.calls == 2
+        assert flight.stats["coalesced"] == 0
+
+    @pytest.mark.asyncio
+    async def test_exception_reaches_every_waiter(self):
+        """Falha da requisição compartilhada é propagada a todos"""
+        flight = SingleFlight("teste")
+        endpoint = _FakeEndpoint(error=RuntimeError("HTTP 500"))
+
+        callers = [asyncio.create_task(flight.do("key", endpoint.fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        endpoint.release.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+
+        assert endpoint.calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert flight.stats["errors"] == 1
+        assert flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_request(self):
+        """Cancelar o chamador que iniciou a requisição não afeta os demais"""
+        flight = SingleFlight("teste")
+        endpoint = _FakeEndpoint(result="dados")
+
+        first = asyncio.create_task(flight.do("key", endpoint.fetch))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flight.do("key", endpoint.fetch))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert flight.in_flight == 1
+
+        endpoint.release.set()
+        assert await second == "dados"
+        assert endpoint.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_key_released_after_completion(self):
+        """Depois de concluir, a mesma chave faz nova requisição"""
+        flight = SingleFlight("teste")
+        endpoint = _FakeEndpoint()
+        endpoint.release.set()
+
+        assert await flight.do("key", endpoint.fetch) == "ok"
+        assert flight.in_flight == 0
+
+        assert await flight.do("key", endpoint.fetch) == "ok"
+        assert endpoint.calls == 2
+        assert flight.stats["fetches"] == 2
+
+    def test_cache_hits_count_as_saved_requests(self):
+        """Hits do cache do cliente entram em saved_requests"""
+        flight = SingleFlight("teste")
+        flight.record_cache_hit()
+        stats = flight.get_stats()
+        assert (stats["requests"], stats["cache_hits"], stats["saved_requests"]) == (1, 1, 1)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Testes do pipeline concorrente de tips (_process_matches_for_tips)
+
+Verifica:
+- Odds + predição em paralelo limitadas pelo semáforo
+- Mapa já reservado por outro scan é pulado
+- Tips acima de max_tips_per_hour são descartadas e os mapas liberados
+- Duração das etapas do scan exposta no status de monitoramento
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.data_models.match_data import MatchData
+from bot.systems.tips_system import ProfessionalTipsSystem
+
+
+class _SlowOddsClient:
+    """PandaScore falso: odds lentas, registra o pico de chamadas simultâneas"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.requested = []
+
+    async def get_match_odds(self, match_id):
+        self.requested.append(match_id)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return {"outcomes": [{"name": "A", "odd": 1.8}, {"name": "B", "odd": 2.1}]}
+
+
+def _match(i):
+    return MatchData(
+        match_id=f"m{i}", team1_name=f"Team {i}A", team2_name=f"Team {i}B",
+        league="LCK", status="running", raw_data={}
+    )
+
+
+def _tips_system(odds_client, max_concurrent=2, max_tips_per_hour=3):
+    prediction_system = MagicMock()
+    prediction_system.generate_professional_tip = AsyncMock(
+        return_value=MagicMock(is_valid=True, tip=MagicMock(tip_on_team="A", odds=1.8, units=1.0))
+    )
+    system = ProfessionalTipsSystem(odds_client, MagicMock(), prediction_system,
+                                    max_concurrent_matches=max_concurrent)
+    system.max_tips_per_hour = max_tips_per_hour
+    system._is_real_match_data = lambda match: True
+    system._is_current_game_active = lambda match: True
+    return system
+
+
+class TestTipsPipeline:
+    """Testes do scan concorrente de partidas"""
+
+    @pytest.mark.asyncio
+    async def test_process_matches_concurrency_claims_and_budget(self):
+        """Seis partidas: uma já reservada, duas em paralelo, três tips no orçamento"""
+        odds_client = _SlowOddsClient()
+        system = _tips_system(odds_client)
+        matches = [_match(i) for i in range(6)]
+
+        # Mapa da primeira partida já reservado por outro scan
+        claimed_elsewhere = system._get_map_identifier(matches[0])
+        assert system._claim_map(claimed_elsewhere)
+        assert not system._claim_map(claimed_elsewhere)
+
+        dispatched = await system._process_matches_for_tips(matches)
+
+        # Semáforo limita o pipeline, mas as partidas rodam em paralelo
+        assert odds_client.peak == 2
+        assert "m0" not in odds_client.requested
+        assert sorted(odds_client.requested) == ["m1", "m2", "m3", "m4", "m5"]
+
+        # Orçamento de 3 tips/hora: as duas excedentes liberam o mapa
+        assert dispatched == 3
+        assert set(system.generated_tips) == {"m1", "m2", "m3"}
+        map_ids = [system._get_map_identifier(match) for match in matches]
+        assert system.processed_maps == set(map_ids[:4])
+        assert not system._can_generate_tip()
+
+        status = system.get_monitoring_status()
+        timings = status["pipeline"]["stage_timings_seconds"]
+        assert set(timings) == {"claim", "pipeline", "dispatch"}
+        assert timings["pipeline"] > 0
+        assert status["pipeline"]["max_concurrent_matches"] == 2
+        assert status["rate_limiting"]["recent_tips"] == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_tip_releases_map(self):
+        """Tip rejeitada pela predição libera o mapa para o próximo scan"""
+        system = _tips_system(_SlowOddsClient(delay=0))
+        system.prediction_system.generate_professional_tip.return_value = MagicMock(
+            is_valid=False, tip=None, rejection_reason="EV baixo"
+        )
+        match = _match(1)
+
+        assert await system._process_matches_for_tips([match]) == 0
+        assert system._get_map_identifier(match) not in system.processed_maps
+
+    @pytest.mark.asyncio
+    async def test_scan_skipped_when_budget_exhausted(self):
+        """Sem orçamento de tips nenhuma partida é reservada ou consultada"""
+        odds_client = _SlowOddsClient(delay=0)
+        system = _tips_system(odds_client, max_tips_per_hour=0)
+
+        assert await system._process_matches_for_tips([_match(1), _match(2)]) == 0
+        assert odds_client.requested == []
+        assert system.processed_maps == set()